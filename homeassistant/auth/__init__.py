@@ -3,6 +3,7 @@ import asyncio
 from collections import OrderedDict
 from datetime import timedelta
 import logging
+import time
 from typing import Any, Dict, List, Optional, Tuple, cast
 
 import jwt
@@ -20,6 +21,10 @@ from .providers import AuthProvider, LoginFlow, auth_provider_from_config
 EVENT_USER_ADDED = "user_added"
 EVENT_USER_REMOVED = "user_removed"
 
+# Validated access tokens are remembered for a short time, up to their expiry
+ACCESS_TOKEN_CACHE_SIZE = 256
+ACCESS_TOKEN_CACHE_TIME = 60
+
 _LOGGER = logging.getLogger(__name__)
 _MfaModuleDict = Dict[str, MultiFactorAuthModule]
 _ProviderKey = Tuple[str, Optional[str]]
@@ -146,6 +151,9 @@ class AuthManager:
         self._providers = providers
         self._mfa_modules = mfa_modules
         self.login_flow = AuthManagerFlowManager(hass, self)
+        # Access token -> (refresh token, time the validation expires)
+        self._access_token_cache: "OrderedDict[str, Tuple[models.RefreshToken, float]]"
+        self._access_token_cache = OrderedDict()
 
     @property
     def auth_providers(self) -> List[AuthProvider]:
@@ -452,6 +460,18 @@ class AuthManager:
         self, token: str
     ) -> Optional[models.RefreshToken]:
         """Return refresh token if an access token is valid."""
+        cached = self._access_token_cache.get(token)
+        if cached is not None:
+            refresh_token, expires_at = cached
+            if (
+                time.time() < expires_at
+                and refresh_token.user.is_active
+                and await self._store.async_get_refresh_token(refresh_token.id)
+                is refresh_token
+            ):
+                return refresh_token
+            self._access_token_cache.pop(token, None)
+
         try:
             unverif_claims = jwt.decode(token, verify=False)
         except jwt.InvalidTokenError:
@@ -469,13 +489,22 @@ class AuthManager:
             issuer = refresh_token.id
 
         try:
-            jwt.decode(token, jwt_key, leeway=10, issuer=issuer, algorithms=["HS256"])
+            claims = jwt.decode(
+                token, jwt_key, leeway=10, issuer=issuer, algorithms=["HS256"]
+            )
         except jwt.InvalidTokenError:
             return None
 
         if refresh_token is None or not refresh_token.user.is_active:
             return None
 
+        self._access_token_cache[token] = (
+            refresh_token,
+            min(time.time() + ACCESS_TOKEN_CACHE_TIME, claims.get("exp", 0)),
+        )
+        if len(self._access_token_cache) > ACCESS_TOKEN_CACHE_SIZE:
+            self._access_token_cache.popitem(last=False)
+
         return refresh_token
 
     @callback
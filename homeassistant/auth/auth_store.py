@@ -2,6 +2,7 @@
 import asyncio
 from collections import OrderedDict
 from datetime import timedelta
+import hashlib
 import hmac
 from logging import getLogger
 from typing import Any, Dict, List, Optional
@@ -37,6 +38,9 @@ class AuthStore:
         self._users: Optional[Dict[str, models.User]] = None
         self._groups: Optional[Dict[str, models.Group]] = None
         self._perm_lookup: Optional[PermissionLookup] = None
+        # Refresh tokens of all users by id and by hash of the token
+        self._refresh_tokens: Dict[str, models.RefreshToken] = {}
+        self._refresh_token_hashes: Dict[bytes, models.RefreshToken] = {}
         self._store = hass.helpers.storage.Store(
             STORAGE_VERSION, STORAGE_KEY, private=True
         )
@@ -141,6 +145,8 @@ class AuthStore:
             assert self._users is not None
 
         self._users.pop(user.id)
+        for refresh_token in user.refresh_tokens.values():
+            self._async_unindex_refresh_token(refresh_token)
         self._async_schedule_save()
 
     async def async_update_user(
@@ -223,6 +229,7 @@ class AuthStore:
 
         refresh_token = models.RefreshToken(**kwargs)
         user.refresh_tokens[refresh_token.id] = refresh_token
+        self._async_index_refresh_token(refresh_token)
 
         self._async_schedule_save()
         return refresh_token
@@ -235,10 +242,12 @@ class AuthStore:
             await self._async_load()
             assert self._users is not None
 
-        for user in self._users.values():
-            if user.refresh_tokens.pop(refresh_token.id, None):
-                self._async_schedule_save()
-                break
+        indexed = self._refresh_tokens.get(refresh_token.id)
+        if indexed is None:
+            return
+        indexed.user.refresh_tokens.pop(indexed.id, None)
+        self._async_unindex_refresh_token(indexed)
+        self._async_schedule_save()
 
     async def async_get_refresh_token(
         self, token_id: str
@@ -248,12 +257,7 @@ class AuthStore:
             await self._async_load()
             assert self._users is not None
 
-        for user in self._users.values():
-            refresh_token = user.refresh_tokens.get(token_id)
-            if refresh_token is not None:
-                return refresh_token
-
-        return None
+        return self._refresh_tokens.get(token_id)
 
     async def async_get_refresh_token_by_token(
         self, token: str
@@ -263,14 +267,23 @@ class AuthStore:
             await self._async_load()
             assert self._users is not None
 
-        found = None
+        refresh_token = self._refresh_token_hashes.get(_hash_token(token))
+        if refresh_token is None or not hmac.compare_digest(refresh_token.token, token):
+            return None
 
-        for user in self._users.values():
-            for refresh_token in user.refresh_tokens.values():
-                if hmac.compare_digest(refresh_token.token, token):
-                    found = refresh_token
+        return refresh_token
+
+    @callback
+    def _async_index_refresh_token(self, refresh_token: models.RefreshToken) -> None:
+        """Add a refresh token to the indexes."""
+        self._refresh_tokens[refresh_token.id] = refresh_token
+        self._refresh_token_hashes[_hash_token(refresh_token.token)] = refresh_token
 
-        return found
+    @callback
+    def _async_unindex_refresh_token(self, refresh_token: models.RefreshToken) -> None:
+        """Remove a refresh token from the indexes."""
+        self._refresh_tokens.pop(refresh_token.id, None)
+        self._refresh_token_hashes.pop(_hash_token(refresh_token.token), None)
 
     @callback
     def async_log_refresh_token_usage(
@@ -471,6 +484,7 @@ class AuthStore:
                 last_used_ip=rt_dict.get("last_used_ip"),
             )
             users[rt_dict["user_id"]].refresh_tokens[token.id] = token
+            self._async_index_refresh_token(token)
 
         self._groups = groups
         self._users = users
@@ -568,6 +582,11 @@ class AuthStore:
         self._groups = groups
 
 
+def _hash_token(token: str) -> bytes:
+    """Hash a refresh token to look it up without comparing the secret."""
+    return hashlib.sha256(token.encode()).digest()
+
+
 def _system_admin_group() -> models.Group:
     """Create system admin group."""
     return models.Group(
@@ -21,10 +21,12 @@ from homeassistant.const import (
     REQUIRED_NEXT_PYTHON_VER,
 )
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_per_platform
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.setup import (
     DATA_SETUP,
     DATA_SETUP_STARTED,
+    DATA_SETUP_TIME,
     async_set_domains_to_be_loaded,
     async_setup_component,
 )
@@ -472,6 +474,11 @@ async def _async_set_up_integrations(
 
     _LOGGER.info("Domains to be set up: %s", domains_to_setup)
 
+    # Import the integrations in the background while the setup runs
+    for itg in integration_cache.values():
+        itg.async_preload()
+    hass.async_create_task(_async_preload_platforms(hass, config, domains_to_setup))
+
     logging_domains = domains_to_setup & LOGGING_INTEGRATIONS
 
     # Load logging as soon as possible
@@ -551,3 +558,53 @@ async def _async_set_up_integrations(
             await hass.async_block_till_done()
     except asyncio.TimeoutError:
         _LOGGER.warning("Setup timed out for bootstrap - moving forward")
+
+    _async_log_startup_times(hass)
+
+
+async def _async_preload_platforms(
+    hass: core.HomeAssistant, config: Dict[str, Any], domains: Set[str]
+) -> None:
+    """Import the platforms that are set up from the configuration."""
+    platforms: Dict[str, Set[str]] = {}
+    for domain in domains:
+        for platform_name, _ in config_per_platform(config, domain):
+            if isinstance(platform_name, str):
+                platforms.setdefault(platform_name, set()).add(domain)
+
+    for itg, platform_domains in zip(
+        await asyncio.gather(
+            *(
+                loader.async_get_integration(hass, platform_name)
+                for platform_name in platforms
+            ),
+            return_exceptions=True,
+        ),
+        platforms.values(),
+    ):
+        if isinstance(itg, loader.Integration):
+            itg.async_preload(platform_domains)
+
+
+@core.callback
+def _async_log_startup_times(hass: core.HomeAssistant) -> None:
+    """Log how long importing and setting up each integration took."""
+    import_times: Dict[str, float] = {}
+    for name, duration in hass.data.get(loader.DATA_IMPORT_TIMES, {}).items():
+        domain = name.partition(".")[0]
+        import_times[domain] = import_times.get(domain, 0) + duration
+    setup_times = hass.data.get(DATA_SETUP_TIME, {})
+
+    domains = sorted(
+        import_times.keys() | setup_times.keys(),
+        key=lambda domain: import_times.get(domain, 0) + setup_times.get(domain, 0),
+        reverse=True,
+    )
+    _LOGGER.info(
+        "Integration startup times (import, setup): %s",
+        ", ".join(
+            f"{domain} ({import_times.get(domain, 0):.2f}s, "
+            f"{setup_times.get(domain, 0):.2f}s)"
+            for domain in domains
+        ),
+    )
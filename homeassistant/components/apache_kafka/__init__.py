@@ -10,12 +10,12 @@ from homeassistant.const import (
     CONF_IP_ADDRESS,
     CONF_PORT,
     EVENT_HOMEASSISTANT_STOP,
-    EVENT_STATE_CHANGED,
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
 )
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import FILTER_SCHEMA
+from homeassistant.helpers.event import async_track_filtered_state_change_event
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -89,11 +89,7 @@ class KafkaManager:
     def _encode_event(self, event):
         """Translate events into a binary JSON payload."""
         state = event.data.get("new_state")
-        if (
-            state is None
-            or state.state in (STATE_UNKNOWN, "", STATE_UNAVAILABLE)
-            or not self._entities_filter(state.entity_id)
-        ):
+        if state is None or state.state in (STATE_UNKNOWN, "", STATE_UNAVAILABLE):
             return
 
         return json.dumps(obj=state.as_dict(), default=self._encoder.encode).encode(
@@ -102,7 +98,9 @@ class KafkaManager:
 
     async def start(self):
         """Start the Kafka manager."""
-        self._hass.bus.async_listen(EVENT_STATE_CHANGED, self.write)
+        async_track_filtered_state_change_event(
+            self._hass, self._entities_filter, self.write
+        )
         await self._producer.start()
 
     async def shutdown(self):
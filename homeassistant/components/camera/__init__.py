@@ -4,6 +4,7 @@ import base64
 import collections
 from contextlib import suppress
 from datetime import timedelta
+from functools import partial
 import hashlib
 import logging
 from random import SystemRandom
@@ -51,6 +52,7 @@ from homeassistant.helpers.network import get_url
 from homeassistant.loader import bind_hass
 
 from .const import DATA_CAMERA_PREFS, DOMAIN
+from .frame_broker import FrameBroker
 from .prefs import CameraPreferences
 
 # mypy: allow-untyped-calls, allow-untyped-defs
@@ -153,7 +155,7 @@ async def async_get_image(hass, entity_id, timeout=10):
 
     with suppress(asyncio.CancelledError, asyncio.TimeoutError):
         async with async_timeout.timeout(timeout):
-            image = await camera.async_camera_image()
+            image = await camera.frame_broker.async_get_frame(0)
 
             if image:
                 return Image(camera.content_type, image)
@@ -220,6 +222,16 @@ async def async_get_still_stream(request, image_cb, content_type, interval):
     return response
 
 
+@callback
+@bind_hass
+def async_get_frame_stats(hass):
+    """Return the image requests and fetches of the cameras by entity id."""
+    return {
+        entity.entity_id: entity.frame_broker.as_dict()
+        for entity in hass.data[DOMAIN].entities
+    }
+
+
 def _get_camera_from_entity_id(hass, entity_id):
     """Get camera component from entity_id."""
     component = hass.data.get(DOMAIN)
@@ -330,6 +342,7 @@ class Camera(Entity):
         self.stream_options = {}
         self.content_type = DEFAULT_CONTENT_TYPE
         self.access_tokens: collections.deque = collections.deque([], 2)
+        self.frame_broker = FrameBroker(self)
         self.async_update_token()
 
     @property
@@ -387,7 +400,10 @@ class Camera(Entity):
     async def handle_async_still_stream(self, request, interval):
         """Generate an HTTP MJPEG stream from camera images."""
         return await async_get_still_stream(
-            request, self.async_camera_image, self.content_type, interval
+            request,
+            partial(self.frame_broker.async_get_frame, interval),
+            self.content_type,
+            interval,
         )
 
     async def handle_async_mjpeg_stream(self, request):
@@ -513,7 +529,7 @@ class CameraImageView(CameraView):
         """Serve camera image."""
         with suppress(asyncio.CancelledError, asyncio.TimeoutError):
             async with async_timeout.timeout(10):
-                image = await camera.async_camera_image()
+                image = await camera.frame_broker.async_get_frame(0)
 
             if image:
                 return web.Response(body=image, content_type=camera.content_type)
@@ -656,7 +672,7 @@ async def async_handle_snapshot_service(camera, service):
         _LOGGER.error("Can't write %s, no access to path!", snapshot_file)
         return
 
-    image = await camera.async_camera_image()
+    image = await camera.frame_broker.async_get_frame(0)
 
     def _write_image(to_file, image_data):
         """Executor helper to write image."""
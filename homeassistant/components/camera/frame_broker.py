@@ -0,0 +1,51 @@
+"""Share the images of a camera between its clients."""
+import asyncio
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    from . import Camera
+
+
+class FrameBroker:
+    """Fetch images of a camera once for all clients asking at the same time.
+
+    The latest image is kept and handed out again while it is younger than
+    the maximum age a client accepts.
+    """
+
+    def __init__(self, camera: "Camera") -> None:
+        """Initialize the frame broker."""
+        self._camera = camera
+        self._frame: Optional[bytes] = None
+        self._frame_time = 0.0
+        self._fetch: Optional[asyncio.Future] = None
+        self.fetches = 0
+        self.requests = 0
+
+    async def async_get_frame(self, max_age: float) -> Optional[bytes]:
+        """Return an image not older than max_age seconds."""
+        self.requests += 1
+        loop = self._camera.hass.loop
+        if self._frame is not None and loop.time() - self._frame_time <= max_age:
+            return self._frame
+
+        if self._fetch is None:
+            self._fetch = self._camera.hass.async_create_task(self._async_fetch())
+        # Clients giving up must not cancel the fetch of the other clients
+        return await asyncio.shield(self._fetch)
+
+    async def _async_fetch(self) -> Optional[bytes]:
+        """Fetch a new image from the camera."""
+        self.fetches += 1
+        try:
+            frame = await self._camera.async_camera_image()
+        finally:
+            self._fetch = None
+        if frame:
+            self._frame = frame
+            self._frame_time = self._camera.hass.loop.time()
+        return frame
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return the fetch statistics."""
+        return {"fetches": self.fetches, "requests": self.requests}
@@ -1,11 +1,10 @@
 """Provide the functionality to group entities."""
 import asyncio
 import logging
-from typing import Any, Iterable, List, Optional, cast
+from typing import Any, Dict, Iterable, List, Optional, Tuple, cast
 
 import voluptuous as vol
 
-from homeassistant import core as ha
 from homeassistant.const import (
     ATTR_ASSUMED_STATE,
     ATTR_ENTITY_ID,
@@ -42,8 +41,10 @@ from homeassistant.loader import bind_hass
 
 DOMAIN = "group"
 GROUP_ORDER = "group_order"
+GROUP_EXPAND_CACHE = "group_expand_cache"
 
 ENTITY_ID_FORMAT = DOMAIN + ".{}"
+GROUP_PREFIX = DOMAIN + "."
 
 CONF_ENTITIES = "entities"
 CONF_ALL = "all"
@@ -126,7 +127,8 @@ def expand_entity_ids(hass: HomeAssistantType, entity_ids: Iterable[Any]) -> Lis
 
     Async friendly.
     """
-    found_ids: List[str] = []
+    # Dict as ordered set to drop duplicates in linear time
+    found_ids: Dict[str, None] = {}
     for entity_id in entity_ids:
         if not isinstance(entity_id, str) or entity_id in (
             ENTITY_MATCH_NONE,
@@ -136,30 +138,72 @@ def expand_entity_ids(hass: HomeAssistantType, entity_ids: Iterable[Any]) -> Lis
 
         entity_id = entity_id.lower()
 
-        try:
-            # If entity_id points at a group, expand it
-            domain, _ = ha.split_entity_id(entity_id)
-
-            if domain == DOMAIN:
-                child_entities = get_entity_ids(hass, entity_id)
-                if entity_id in child_entities:
-                    child_entities = list(child_entities)
-                    child_entities.remove(entity_id)
-                found_ids.extend(
-                    ent_id
-                    for ent_id in expand_entity_ids(hass, child_entities)
-                    if ent_id not in found_ids
-                )
+        # If entity_id points at a group, expand it
+        if entity_id.startswith(GROUP_PREFIX):
+            found_ids.update(dict.fromkeys(_expand_group(hass, entity_id)))
+        else:
+            found_ids[entity_id] = None
 
-            else:
-                if entity_id not in found_ids:
-                    found_ids.append(entity_id)
+    return list(found_ids)
+
+
+def _expand_group(hass: HomeAssistantType, group_id: str) -> Tuple[str, ...]:
+    """Return the members of a group with nested groups expanded.
+
+    Expansions are cached together with the members of every group they
+    went through, and are only reused while all of those groups list equal
+    members. Groups without members are not cached.
+    """
+    cache = hass.data.setdefault(GROUP_EXPAND_CACHE, {})
+    cached = cache.get(group_id)
+    if cached is not None:
+        chain, expanded = cached
+        if all(
+            _group_members(hass, chain_id) == members
+            for chain_id, members in chain.items()
+        ):
+            return cast(Tuple[str, ...], expanded)
+
+    chain = {}
+    found_ids: Dict[str, None] = {}
+    _expand_group_members(hass, group_id, chain, found_ids)
+    expanded = tuple(found_ids)
+    if chain[group_id]:
+        cache[group_id] = (chain, expanded)
+    return expanded
+
+
+def _expand_group_members(
+    hass: HomeAssistantType,
+    group_id: str,
+    chain: Dict[str, Tuple[Any, ...]],
+    found_ids: Dict[str, None],
+) -> None:
+    """Add the members of a group and its nested groups to found_ids.
+
+    Groups already in chain are skipped, so groups containing themselves
+    are only expanded once.
+    """
+    members = chain[group_id] = _group_members(hass, group_id)
+    for entity_id in members:
+        if not isinstance(entity_id, str) or entity_id in (
+            ENTITY_MATCH_NONE,
+            ENTITY_MATCH_ALL,
+        ):
+            continue
+
+        entity_id = entity_id.lower()
+
+        if not entity_id.startswith(GROUP_PREFIX):
+            found_ids[entity_id] = None
+        elif entity_id not in chain:
+            _expand_group_members(hass, entity_id, chain, found_ids)
 
-        except AttributeError:
-            # Raised by split_entity_id if entity_id is not a string
-            pass
 
-    return found_ids
+def _group_members(hass: HomeAssistantType, group_id: str) -> Tuple[Any, ...]:
+    """Return the entity ids a group state lists as members."""
+    # Group entities keep their members in a tuple, which is returned as is
+    return tuple(get_entity_ids(hass, group_id))
 
 
 @bind_hass
@@ -568,6 +612,7 @@ class Group(Entity):
         if self._async_unsub_state_changed:
             self._async_unsub_state_changed()
             self._async_unsub_state_changed = None
+        self.hass.data.get(GROUP_EXPAND_CACHE, {}).pop(self.entity_id, None)
 
     async def _async_state_changed_listener(self, event):
         """Respond to a member state changing.
@@ -1,11 +1,12 @@
 """Provide pre-made queries on top of the recorder component."""
 from collections import defaultdict
 from datetime import timedelta
+from functools import partial
 from itertools import groupby
 import json
 import logging
 import time
-from typing import Optional, cast
+from typing import Optional
 
 from aiohttp import web
 from sqlalchemy import and_, bindparam, func
@@ -15,6 +16,7 @@ import voluptuous as vol
 from homeassistant.components import recorder
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder.models import (
+    StateAttributes,
     States,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
@@ -25,18 +27,22 @@ from homeassistant.const import (
     CONF_ENTITIES,
     CONF_EXCLUDE,
     CONF_INCLUDE,
+    EVENT_STATE_CHANGED,
     HTTP_BAD_REQUEST,
 )
 from homeassistant.core import Context, State, split_entity_id
 import homeassistant.helpers.config_validation as cv
 import homeassistant.util.dt as dt_util
 
+from .cache import RecentHistory, state_from_cached_row
+
 # mypy: allow-untyped-defs, no-check-untyped-defs
 
 _LOGGER = logging.getLogger(__name__)
 
 DOMAIN = "history"
 CONF_ORDER = "use_include_order"
+CONF_CACHE_HOURS = "cache_hours"
 
 STATE_KEY = "state"
 LAST_CHANGED_KEY = "last_changed"
@@ -57,6 +63,9 @@ _FILTER_SCHEMA = vol.Schema(
             CONF_EXCLUDE, default=_FILTER_SCHEMA_INNER({})
         ): _FILTER_SCHEMA_INNER,
         vol.Optional(CONF_ORDER, default=False): cv.boolean,
+        vol.Optional(CONF_CACHE_HOURS, default=0): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
     }
 )
 
@@ -84,9 +93,20 @@ QUERY_STATES = [
     States.attributes,
     States.last_changed,
     States.last_updated,
+    StateAttributes.shared_attrs,
 ]
 
 HISTORY_BAKERY = "history_bakery"
+# Number of rows fetched at once when streaming states
+STREAM_BATCH_SIZE = 1000
+DATA_RECENT_HISTORY = "history_recent"
+
+
+def _query_states(session):
+    """Query the states columns joined with their shared attributes."""
+    return session.query(*QUERY_STATES).outerjoin(
+        StateAttributes, States.attributes_id == StateAttributes.attributes_id
+    )
 
 
 def get_significant_states(hass, *args, **kwargs):
@@ -115,10 +135,106 @@ def _get_significant_states(
     """
     timer_start = time.perf_counter()
 
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
+    recent_history = hass.data.get(DATA_RECENT_HISTORY)
+    if recent_history is not None and recent_history.covers(start_time):
+        return _get_significant_states_from_memory(
+            recent_history,
+            timer_start,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+        )
+
+    states = execute(
+        _significant_states_query(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            significant_changes_only,
+        )
+    )
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_significant_states took %fs", elapsed)
+
+    return _sorted_states_to_json(
+        hass,
+        session,
+        states,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        minimal_response,
+    )
+
+
+def _stream_significant_states(
+    hass,
+    session,
+    start_time,
+    end_time=None,
+    filters=None,
+    include_start_time_state=True,
+    significant_changes_only=True,
+    minimal_response=False,
+):
+    """Yield the significant states of all entities, one entity at a time.
+
+    Rows are fetched from the database in batches while the states are
+    yielded, entities are sorted by entity_id.
+    """
+    recent_history = hass.data.get(DATA_RECENT_HISTORY)
+    if recent_history is not None and recent_history.covers(start_time):
+        # The states are in memory already
+        yield from _get_significant_states(
+            hass,
+            session,
+            start_time,
+            end_time,
+            None,
+            filters,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+        ).values()
+        return
+
+    query = _significant_states_query(
+        hass, session, start_time, end_time, None, filters, significant_changes_only
+    ).with_post_criteria(lambda q: q.yield_per(STREAM_BATCH_SIZE))
+
+    start_time_states = []
+    if include_start_time_state:
+        start_time_states = _get_start_time_states(
+            hass, session, start_time, None, filters
+        )
+
+    yield from _iter_states_to_json(
+        query, start_time_states, minimal_response, LazyState
     )
 
+
+def _significant_states_query(
+    hass,
+    session,
+    start_time,
+    end_time,
+    entity_ids,
+    filters,
+    significant_changes_only,
+):
+    """Return the query for the significant states sorted by entity."""
+    baked_query = hass.data[HISTORY_BAKERY](_query_states)
+
     if significant_changes_only:
         baked_query += lambda q: q.filter(
             (
@@ -138,34 +254,15 @@ def _get_significant_states(
 
     baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
 
-    states = execute(
-        baked_query(session).params(
-            start_time=start_time, end_time=end_time, entity_ids=entity_ids
-        )
-    )
-
-    if _LOGGER.isEnabledFor(logging.DEBUG):
-        elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("get_significant_states took %fs", elapsed)
-
-    return _sorted_states_to_json(
-        hass,
-        session,
-        states,
-        start_time,
-        entity_ids,
-        filters,
-        include_start_time_state,
-        minimal_response,
+    return baked_query(session).params(
+        start_time=start_time, end_time=end_time, entity_ids=entity_ids
     )
 
 
 def state_changes_during_period(hass, start_time, end_time=None, entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
     with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
-        )
+        baked_query = hass.data[HISTORY_BAKERY](_query_states)
 
         baked_query += lambda q: q.filter(
             (States.last_changed == States.last_updated)
@@ -178,7 +275,9 @@ def state_changes_during_period(hass, start_time, end_time=None, entity_id=None)
             )
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
@@ -199,13 +298,13 @@ def get_last_state_changes(hass, number_of_states, entity_id):
     start_time = dt_util.utcnow()
 
     with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
-        )
+        baked_query = hass.data[HISTORY_BAKERY](_query_states)
         baked_query += lambda q: q.filter(States.last_changed == States.last_updated)
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(
@@ -266,7 +365,7 @@ def _get_states_with_session(
     # We have more than one entity to look at (most commonly we want
     # all entities,) so we need to do a search on all states since the
     # last recorder run started.
-    query = session.query(*QUERY_STATES)
+    query = _query_states(session)
 
     most_recent_states_by_date = session.query(
         States.entity_id.label("max_entity_id"),
@@ -310,9 +409,7 @@ def _get_states_with_session(
 def _get_single_entity_states_with_session(hass, session, utc_point_in_time, entity_id):
     # Use an entirely different (and extremely fast) query if we only
     # have a single entity id
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
-    )
+    baked_query = hass.data[HISTORY_BAKERY](_query_states)
     baked_query += lambda q: q.filter(
         States.last_updated < bindparam("utc_point_in_time"),
         States.entity_id == bindparam("entity_id"),
@@ -348,72 +445,181 @@ def _sorted_states_to_json(
     each list of states, otherwise our graphs won't start on the Y
     axis correctly.
     """
+    start_time_states = []
+    if include_start_time_state:
+        start_time_states = _get_start_time_states(
+            hass, session, start_time, entity_ids, filters
+        )
+
+    return _states_to_json(
+        states, start_time_states, entity_ids, minimal_response, LazyState
+    )
+
+
+def _get_start_time_states(hass, session, start_time, entity_ids, filters):
+    """Return the states at start_time as synthetic data points."""
+    timer_start = time.perf_counter()
+    run = recorder.run_information_from_instance(hass, start_time)
+    start_time_states = _get_states_with_session(
+        hass, session, start_time, entity_ids, run=run, filters=filters
+    )
+    for state in start_time_states:
+        state.last_changed = start_time
+        state.last_updated = start_time
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug(
+            "getting %d first datapoints took %fs", len(start_time_states), elapsed
+        )
+
+    return start_time_states
+
+
+def _states_to_json(states, start_time_states, entity_ids, minimal_response, to_state):
+    """Group states sorted by entity_id and last_updated per entity.
+
+    The rows in states are converted with to_state, except the ones that
+    minimal_response reduces to their state and last_changed.
+    """
     result = defaultdict(list)
     # Set all entity IDs to empty lists in result set to maintain the order
     if entity_ids is not None:
         for ent_id in entity_ids:
             result[ent_id] = []
 
-    # Get the states at the start time
-    timer_start = time.perf_counter()
-    if include_start_time_state:
-        run = recorder.run_information_from_instance(hass, start_time)
-        for state in _get_states_with_session(
-            hass, session, start_time, entity_ids, run=run, filters=filters
+    for state in start_time_states:
+        result[state.entity_id].append(state)
+
+    # Append all changes to it
+    for ent_id, group in groupby(states, lambda state: state.entity_id):
+        _entity_states_to_json(
+            ent_id, group, result[ent_id], minimal_response, to_state
+        )
+
+    # Filter out the empty lists if some states had 0 results.
+    return {key: val for key, val in result.items() if val}
+
+
+def _iter_states_to_json(states, start_time_states, minimal_response, to_state):
+    """Yield the states of one entity at a time, like _states_to_json.
+
+    Entities are yielded sorted by entity_id, so only the changes of a
+    single entity are held in memory.
+    """
+    start_time_states = sorted(start_time_states, key=lambda state: state.entity_id)
+    start_idx = 0
+
+    for ent_id, group in groupby(states, lambda state: state.entity_id):
+        # Entities without changes only have their start time state
+        while (
+            start_idx < len(start_time_states)
+            and start_time_states[start_idx].entity_id < ent_id
         ):
-            state.last_changed = start_time
-            state.last_updated = start_time
-            result[state.entity_id].append(state)
+            yield [start_time_states[start_idx]]
+            start_idx += 1
 
-    if _LOGGER.isEnabledFor(logging.DEBUG):
-        elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("getting %d first datapoints took %fs", len(result), elapsed)
+        ent_results = []
+        if (
+            start_idx < len(start_time_states)
+            and start_time_states[start_idx].entity_id == ent_id
+        ):
+            ent_results.append(start_time_states[start_idx])
+            start_idx += 1
+
+        _entity_states_to_json(ent_id, group, ent_results, minimal_response, to_state)
+        yield ent_results
+
+    for state in start_time_states[start_idx:]:
+        yield [state]
+
+
+def _entity_states_to_json(ent_id, group, ent_results, minimal_response, to_state):
+    """Append the states of a single entity to ent_results."""
+    domain = split_entity_id(ent_id)[0]
+    if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
+        ent_results.extend(to_state(db_state) for db_state in group)
+
+    # With minimal response we only provide a native
+    # State for the first and last response. All the states
+    # in-between only provide the "state" and the
+    # "last_changed".
+    if not ent_results:
+        ent_results.append(to_state(next(group)))
+
+    prev_state = ent_results[-1]
+    initial_state_count = len(ent_results)
 
     # Called in a tight loop so cache the function
     # here
     _process_timestamp_to_utc_isoformat = process_timestamp_to_utc_isoformat
 
-    # Append all changes to it
-    for ent_id, group in groupby(states, lambda state: state.entity_id):
-        domain = split_entity_id(ent_id)[0]
-        ent_results = result[ent_id]
-        if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
-            ent_results.extend(LazyState(db_state) for db_state in group)
-
-        # With minimal response we only provide a native
-        # State for the first and last response. All the states
-        # in-between only provide the "state" and the
-        # "last_changed".
-        if not ent_results:
-            ent_results.append(LazyState(next(group)))
-
-        prev_state = ent_results[-1]
-        initial_state_count = len(ent_results)
-
-        for db_state in group:
-            # With minimal response we do not care about attribute
-            # changes so we can filter out duplicate states
-            if db_state.state == prev_state.state:
-                continue
-
-            ent_results.append(
-                {
-                    STATE_KEY: db_state.state,
-                    LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
-                        db_state.last_changed
-                    ),
-                }
-            )
-            prev_state = db_state
+    for db_state in group:
+        # With minimal response we do not care about attribute
+        # changes so we can filter out duplicate states
+        if db_state.state == prev_state.state:
+            continue
+
+        ent_results.append(
+            {
+                STATE_KEY: db_state.state,
+                LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
+                    db_state.last_changed
+                ),
+            }
+        )
+        prev_state = db_state
 
-        if prev_state and len(ent_results) != initial_state_count:
-            # There was at least one state change
-            # replace the last minimal state with
-            # a full state
-            ent_results[-1] = LazyState(prev_state)
+    if prev_state and len(ent_results) != initial_state_count:
+        # There was at least one state change
+        # replace the last minimal state with
+        # a full state
+        ent_results[-1] = to_state(prev_state)
 
-    # Filter out the empty lists if some states had 0 results.
-    return {key: val for key, val in result.items() if val}
+
+def _get_significant_states_from_memory(
+    recent_history,
+    timer_start,
+    start_time,
+    end_time,
+    entity_ids,
+    filters,
+    include_start_time_state,
+    significant_changes_only,
+    minimal_response,
+):
+    """Return the significant states like _get_significant_states from memory."""
+    if entity_ids is not None:
+        query_entity_ids = entity_ids
+    else:
+        query_entity_ids = sorted(
+            entity_id
+            for entity_id in recent_history.entity_ids()
+            if split_entity_id(entity_id)[0] not in IGNORE_DOMAINS
+            and (filters is None or filters.entity_matches(entity_id))
+        )
+
+    start_time_states = []
+    states = []
+    for entity_id in sorted(query_entity_ids):
+        initial_state, changes = recent_history.get_state_changes(
+            entity_id,
+            start_time,
+            end_time,
+            not significant_changes_only
+            or split_entity_id(entity_id)[0] in SIGNIFICANT_DOMAINS,
+        )
+        if include_start_time_state and initial_state is not None:
+            start_time_states.append(initial_state)
+        states.extend(changes)
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_significant_states from memory took %fs", elapsed)
+
+    return _states_to_json(
+        states, start_time_states, entity_ids, minimal_response, state_from_cached_row
+    )
 
 
 def get_state(hass, utc_point_in_time, entity_id, run=None):
@@ -432,6 +638,15 @@ async def async_setup(hass, config):
 
     use_include_order = conf.get(CONF_ORDER)
 
+    cache_hours = conf.get(CONF_CACHE_HOURS)
+    if cache_hours:
+        instance = hass.data[recorder.DATA_INSTANCE]
+        if EVENT_STATE_CHANGED not in instance.exclude_t:
+            recent_history = hass.data[DATA_RECENT_HISTORY] = RecentHistory(
+                hass, timedelta(hours=cache_hours), instance.entity_filter
+            )
+            recent_history.async_setup()
+
     hass.http.register_view(HistoryPeriodView(filters, use_include_order))
     hass.components.frontend.async_register_built_in_panel(
         "history", "history", "hass:poll-box"
@@ -454,7 +669,7 @@ class HistoryPeriodView(HomeAssistantView):
 
     async def get(
         self, request: web.Request, datetime: Optional[str] = None
-    ) -> web.Response:
+    ) -> web.StreamResponse:
         """Return history over a period of time."""
         datetime_ = None
         if datetime:
@@ -495,10 +710,17 @@ class HistoryPeriodView(HomeAssistantView):
 
         hass = request.app["hass"]
 
-        return cast(
-            web.Response,
-            await hass.async_add_executor_job(
-                self._sorted_significant_states_json,
+        # Without a requested or configured order, the states of each
+        # entity are sent as soon as they are fetched.
+        if entity_ids is None and not self.use_include_order:
+            states_factory = self._streamed_significant_states
+        else:
+            states_factory = self._sorted_significant_states
+
+        return await self.json_stream(
+            request,
+            partial(
+                states_factory,
                 hass,
                 start_time,
                 end_time,
@@ -509,7 +731,7 @@ class HistoryPeriodView(HomeAssistantView):
             ),
         )
 
-    def _sorted_significant_states_json(
+    def _streamed_significant_states(
         self,
         hass,
         start_time,
@@ -519,7 +741,39 @@ class HistoryPeriodView(HomeAssistantView):
         significant_changes_only,
         minimal_response,
     ):
-        """Fetch significant stats from the database as json."""
+        """Fetch significant states from the database, one entity at a time."""
+        timer_start = time.perf_counter()
+        state_count = 0
+
+        with session_scope(hass=hass) as session:
+            for state_list in _stream_significant_states(
+                hass,
+                session,
+                start_time,
+                end_time,
+                self.filters,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+            ):
+                state_count += len(state_list)
+                yield state_list
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - timer_start
+            _LOGGER.debug("Streamed %d states in %fs", state_count, elapsed)
+
+    def _sorted_significant_states(
+        self,
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+    ):
+        """Fetch significant states from the database in the expected order."""
         timer_start = time.perf_counter()
 
         with session_scope(hass=hass) as session:
@@ -553,7 +807,7 @@ class HistoryPeriodView(HomeAssistantView):
             sorted_result.extend(result)
             result = sorted_result
 
-        return self.json(result)
+        return result
 
 
 def sqlalchemy_filter_from_include_exclude_conf(conf):
@@ -624,6 +878,33 @@ class Filters:
         ):
             baked_query += lambda q: q.filter(self.entity_filter())
 
+    def entity_matches(self, entity_id):
+        """Return if an entity passes the filter, like entity_filter in sql."""
+        domain = split_entity_id(entity_id)[0]
+        matches = True
+        if self.excluded_domains and not self.included_domains:
+            matches = domain not in self.excluded_domains
+            if self.included_entities:
+                matches = matches and entity_id in self.included_entities
+        elif not self.excluded_domains and self.included_domains:
+            matches = (
+                domain in self.included_domains or entity_id in self.included_entities
+            )
+        elif self.excluded_domains and self.included_domains:
+            matches = domain not in self.excluded_domains
+            if self.included_entities:
+                matches = matches and (
+                    domain in self.included_domains
+                    or entity_id in self.included_entities
+                )
+            else:
+                matches = matches and domain in self.included_domains
+        elif self.included_entities:
+            matches = entity_id in self.included_entities
+        if self.excluded_entities:
+            matches = matches and entity_id not in self.excluded_entities
+        return matches
+
     def entity_filter(self):
         """Generate the entity filter query."""
         entity_filter = None
@@ -695,7 +976,9 @@ class LazyState(State):
         """State attributes."""
         if not self._attributes:
             try:
-                self._attributes = json.loads(self._row.attributes)
+                self._attributes = json.loads(
+                    self._row.shared_attrs or self._row.attributes
+                )
             except ValueError:
                 # When json.loads fails
                 _LOGGER.exception("Error converting row to state: %s", self)
@@ -0,0 +1,225 @@
+"""Keep recent state changes in memory to answer history requests."""
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from datetime import datetime, timedelta
+import sys
+import threading
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from homeassistant.core import Context, Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import (
+    async_track_filtered_state_change_event,
+    async_track_time_interval,
+)
+import homeassistant.util.dt as dt_util
+
+EPOCH = dt_util.utc_from_timestamp(0)
+ONE_MICROSECOND = timedelta(microseconds=1)
+TRIM_INTERVAL = timedelta(minutes=10)
+
+# Like the states read from the database, cached states have no context
+EMPTY_CONTEXT = Context(id=None)
+
+CachedRow = namedtuple(
+    "CachedRow", ["entity_id", "state", "attributes", "last_changed", "last_updated"]
+)
+
+
+def _to_microseconds(value: datetime) -> int:
+    """Convert a datetime to microseconds since the epoch."""
+    return (value - EPOCH) // ONE_MICROSECOND
+
+
+def _from_microseconds(value: int) -> datetime:
+    """Convert microseconds since the epoch to a UTC datetime."""
+    return EPOCH + timedelta(microseconds=value)
+
+
+def state_from_cached_row(row: CachedRow) -> State:
+    """Create a state from a cached row."""
+    return State(
+        row.entity_id,
+        row.state,
+        row.attributes,
+        row.last_changed,
+        row.last_updated,
+        context=EMPTY_CONTEXT,
+        validate_entity_id=False,
+    )
+
+
+class _EntityHistory:
+    """State changes of a single entity, stored column by column.
+
+    Timestamps are kept as microseconds in arrays, states are interned and
+    consecutive changes with equal attributes share the same mapping.
+    A state of None marks the removal of the entity.
+    """
+
+    __slots__ = ("last_updated", "last_changed", "states", "attributes")
+
+    def __init__(self) -> None:
+        """Initialize an empty history."""
+        self.last_updated = array("q")
+        self.last_changed = array("q")
+        self.states: List[Optional[str]] = []
+        self.attributes: List[Optional[Mapping]] = []
+
+    def append(self, state: Optional[State], time_fired: datetime) -> None:
+        """Append a state change."""
+        if state is None:
+            removed_at = _to_microseconds(time_fired)
+            self.last_updated.append(removed_at)
+            self.last_changed.append(removed_at)
+            self.states.append(None)
+            self.attributes.append(None)
+            return
+
+        attributes = state.attributes
+        if self.attributes and self.attributes[-1] == attributes:
+            attributes = self.attributes[-1]
+        self.last_updated.append(_to_microseconds(state.last_updated))
+        self.last_changed.append(_to_microseconds(state.last_changed))
+        self.states.append(sys.intern(state.state))
+        self.attributes.append(attributes)
+
+    def trim(self, cutoff: int) -> None:
+        """Drop the changes before cutoff except the state at cutoff."""
+        idx = bisect_left(self.last_updated, cutoff) - 1
+        if idx <= 0:
+            return
+        del self.last_updated[:idx]
+        del self.last_changed[:idx]
+        del self.states[:idx]
+        del self.attributes[:idx]
+
+
+class RecentHistory:
+    """Keep the state changes inside a time window in memory."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        window: timedelta,
+        entity_filter: Callable[[str], bool],
+    ) -> None:
+        """Initialize the recent history."""
+        self.hass = hass
+        self.window = window
+        self._entity_filter = entity_filter
+        self._entities: Dict[str, _EntityHistory] = {}
+        # Changes are added in the event loop and read from executor threads
+        self._lock = threading.Lock()
+        self._started: Optional[datetime] = None
+
+    @callback
+    def async_setup(self) -> None:
+        """Start recording state changes."""
+        self._started = dt_util.utcnow()
+        with self._lock:
+            for state in self.hass.states.async_all():
+                if self._entity_filter(state.entity_id):
+                    self._entity_history(state.entity_id).append(state, self._started)
+
+        async_track_filtered_state_change_event(
+            self.hass, self._entity_filter, self._async_state_changed
+        )
+        async_track_time_interval(self.hass, self._async_trim, TRIM_INTERVAL)
+
+    def covers(self, start_time: datetime) -> bool:
+        """Return if all changes after start_time are in memory."""
+        if self._started is None:
+            return False
+        return start_time >= max(self._started, dt_util.utcnow() - self.window)
+
+    def entity_ids(self) -> List[str]:
+        """Return the ids of the entities with recorded changes."""
+        with self._lock:
+            return list(self._entities)
+
+    def get_state_changes(
+        self,
+        entity_id: str,
+        start_time: datetime,
+        end_time: Optional[datetime],
+        all_changes: bool,
+    ) -> Tuple[Optional[State], List[CachedRow]]:
+        """Return the state at start_time and the changes until end_time.
+
+        Unless all_changes is set, only changes of the state itself are
+        returned, not the changes of just the attributes.
+        """
+        start = _to_microseconds(start_time)
+        with self._lock:
+            history = self._entities.get(entity_id)
+            if history is None:
+                return None, []
+            first = bisect_left(history.last_updated, start) - 1
+            low = bisect_right(history.last_updated, start)
+            if end_time is None:
+                high = len(history.last_updated)
+            else:
+                high = bisect_left(history.last_updated, _to_microseconds(end_time))
+            if first >= 0:
+                start_state = history.states[first]
+                start_attributes = history.attributes[first]
+            else:
+                start_state = None
+            last_updated = history.last_updated[low:high]
+            last_changed = history.last_changed[low:high]
+            states = history.states[low:high]
+            attributes = history.attributes[low:high]
+
+        initial_state = None
+        if start_state is not None:
+            initial_state = State(
+                entity_id,
+                start_state,
+                start_attributes,
+                start_time,
+                start_time,
+                context=EMPTY_CONTEXT,
+                validate_entity_id=False,
+            )
+
+        rows = [
+            CachedRow(
+                entity_id,
+                state,
+                attrs,
+                _from_microseconds(changed),
+                _from_microseconds(updated),
+            )
+            for updated, changed, state, attrs in zip(
+                last_updated, last_changed, states, attributes
+            )
+            if state is not None and (all_changes or changed == updated)
+        ]
+        return initial_state, rows
+
+    def _entity_history(self, entity_id: str) -> _EntityHistory:
+        """Return the history of an entity, creating it when missing."""
+        history = self._entities.get(entity_id)
+        if history is None:
+            history = self._entities[entity_id] = _EntityHistory()
+        return history
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Record a state change."""
+        with self._lock:
+            self._entity_history(event.data["entity_id"]).append(
+                event.data.get("new_state"), event.time_fired
+            )
+
+    @callback
+    def _async_trim(self, now: datetime) -> None:
+        """Drop the changes that fell out of the window."""
+        cutoff = _to_microseconds(dt_util.utcnow() - self.window)
+        with self._lock:
+            for entity_id, history in list(self._entities.items()):
+                history.trim(cutoff)
+                # Forget entities that were removed before the window
+                if history.states[-1] is None and history.last_updated[-1] < cutoff:
+                    del self._entities[entity_id]
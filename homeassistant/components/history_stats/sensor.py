@@ -1,4 +1,5 @@
 """Component to make instant statistics about your history."""
+from collections import deque
 import datetime
 import logging
 import math
@@ -120,6 +121,9 @@ class HistoryStatsSensor(Entity):
         self._unit_of_measurement = UNITS[sensor_type]
 
         self._period = (datetime.datetime.now(), datetime.datetime.now())
+        # Changes of the tracked entity, added to the window on update
+        self._pending_changes = deque()
+        self._window = None
         self.value = None
         self.count = None
 
@@ -135,10 +139,24 @@ class HistoryStatsSensor(Entity):
                 """Force the component to refresh."""
                 self.async_schedule_update_ha_state(True)
 
+            @callback
+            def state_changed(event):
+                """Queue the change for the window and refresh."""
+                new_state = event.data.get("new_state")
+                if new_state is None:
+                    change = (event.time_fired.timestamp(), False)
+                else:
+                    change = (
+                        new_state.last_changed.timestamp(),
+                        new_state.state == self._entity_state,
+                    )
+                self._pending_changes.append(change)
+                force_refresh()
+
             force_refresh()
             self.async_on_remove(
                 async_track_state_change_event(
-                    self.hass, [self._entity_id], force_refresh
+                    self.hass, [self._entity_id], state_changed
                 )
             )
 
@@ -225,44 +243,52 @@ class HistoryStatsSensor(Entity):
             # Don't compute anything as the value cannot have changed
             return
 
-        # Get history between start and end
+        window = self._window
+        if window is None or start_timestamp < window.start:
+            window = self._load_window(start, start_timestamp)
+            if window is None:
+                self._pending_changes.clear()
+                return
+            self._window = window
+        else:
+            # The period moved forward, changes before its start are dropped
+            window.move_start(start_timestamp)
+
+        # Changes the loaded history already contains are ignored
+        while self._pending_changes:
+            window.add(*self._pending_changes.popleft())
+
+        elapsed, count = window.totals(min(end_timestamp, now_timestamp))
+
+        # Save value in hours
+        self.value = elapsed / 3600
+
+        # Save counter
+        self.count = count
+
+    def _load_window(self, start, start_timestamp):
+        """Load the changes since the start of the period from the database.
+
+        Changes after the end of the period are loaded as well, the window
+        follows the period when it moves forward.
+        """
         history_list = history.state_changes_during_period(
-            self.hass, start, end, str(self._entity_id)
+            self.hass, start, entity_id=str(self._entity_id)
         )
 
         if self._entity_id not in history_list.keys():
-            return
+            return None
 
         # Get the first state
         last_state = history.get_state(self.hass, start, self._entity_id)
-        last_state = last_state is not None and last_state == self._entity_state
-        last_time = start_timestamp
-        elapsed = 0
-        count = 0
+        window = HistoryStatsWindow(
+            start_timestamp, last_state is not None and last_state == self._entity_state
+        )
 
-        # Make calculations
         for item in history_list.get(self._entity_id):
-            current_state = item.state == self._entity_state
-            current_time = item.last_changed.timestamp()
+            window.add(item.last_changed.timestamp(), item.state == self._entity_state)
 
-            if last_state:
-                elapsed += current_time - last_time
-            if current_state and not last_state:
-                count += 1
-
-            last_state = current_state
-            last_time = current_time
-
-        # Count time elapsed between last history state and end of measure
-        if last_state:
-            measure_end = min(end_timestamp, now_timestamp)
-            elapsed += measure_end - last_time
-
-        # Save value in hours
-        self.value = elapsed / 3600
-
-        # Save counter
-        self.count = count
+        return window
 
     def update_period(self):
         """Parse the templates and store a datetime tuple in _period."""
@@ -323,6 +349,84 @@ class HistoryStatsSensor(Entity):
         self._period = start, end
 
 
+class HistoryStatsWindow:
+    """Time spent in a state and switches to it since a start timestamp.
+
+    Changes are added as they happen and dropped again when the start moves
+    past them, so the totals are kept up to date without a recount.
+    """
+
+    def __init__(self, start, start_state):
+        """Initialize the window with whether the state matched at start."""
+        self.start = start
+        self.start_state = start_state
+        self.changes = deque()
+        # Totals between the start and the last change
+        self.elapsed = 0.0
+        self.count = 0
+
+    @property
+    def last_change(self):
+        """Return the time and state of the last change, or of the start."""
+        if self.changes:
+            return self.changes[-1]
+        return self.start, self.start_state
+
+    def add(self, timestamp, state):
+        """Add a change, changes not after the last change are ignored."""
+        last_time, last_state = self.last_change
+        if timestamp <= last_time:
+            return
+        if last_state:
+            self.elapsed += timestamp - last_time
+        if state and not last_state:
+            self.count += 1
+        self.changes.append((timestamp, state))
+
+    def move_start(self, start):
+        """Move the start forward, dropping the changes before it."""
+        changes = self.changes
+        while changes and changes[0][0] <= start:
+            timestamp, state = changes.popleft()
+            if self.start_state:
+                self.elapsed -= timestamp - self.start
+            if state and not self.start_state:
+                self.count -= 1
+            self.start, self.start_state = timestamp, state
+
+        if not changes:
+            self.elapsed = 0.0
+            self.count = 0
+        elif self.start_state:
+            self.elapsed -= start - self.start
+        self.start = start
+
+    def totals(self, end):
+        """Return the seconds spent in the state and the switches until end."""
+        changes = self.changes
+        if changes and changes[-1][0] >= end:
+            # The period ended before the last change, count up to its end
+            last_time, last_state = self.start, self.start_state
+            elapsed = 0.0
+            count = 0
+            for timestamp, state in changes:
+                if timestamp >= end:
+                    break
+                if last_state:
+                    elapsed += timestamp - last_time
+                if state and not last_state:
+                    count += 1
+                last_time, last_state = timestamp, state
+        else:
+            last_time, last_state = self.last_change
+            elapsed = self.elapsed
+            count = self.count
+
+        if last_state and end > last_time:
+            elapsed += end - last_time
+        return elapsed, count
+
+
 class HistoryStatsHelper:
     """Static methods to make the HistoryStatsSensor code lighter."""
 
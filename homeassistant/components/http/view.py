@@ -1,8 +1,8 @@
 """Support for views."""
 import asyncio
-import json
 import logging
-from typing import Any, Callable, List, Optional
+import threading
+from typing import Any, Callable, Iterable, List, Optional
 
 from aiohttp import web
 from aiohttp.typedefs import LooseHeaders
@@ -16,12 +16,17 @@ import voluptuous as vol
 from homeassistant import exceptions
 from homeassistant.const import CONTENT_TYPE_JSON, HTTP_OK, HTTP_SERVICE_UNAVAILABLE
 from homeassistant.core import Context, is_callback
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import json_dumps
 
 from .const import KEY_AUTHENTICATED, KEY_HASS
 
 _LOGGER = logging.getLogger(__name__)
 
+# Encoded items are sent in chunks of about this many characters
+JSON_STREAM_CHUNK_SIZE = 64 * 1024
+# Number of chunks the producer may get ahead of the client
+JSON_STREAM_QUEUE_SIZE = 4
+
 
 class HomeAssistantView:
     """Base view for all views."""
@@ -49,7 +54,7 @@ class HomeAssistantView:
     ) -> web.Response:
         """Return a JSON response."""
         try:
-            msg = json.dumps(result, cls=JSONEncoder, allow_nan=False).encode("UTF-8")
+            msg = json_dumps(result, allow_nan=False).encode("UTF-8")
         except (ValueError, TypeError) as err:
             _LOGGER.error("Unable to serialize to JSON: %s\n%s", err, result)
             raise HTTPInternalServerError from err
@@ -62,6 +67,103 @@ class HomeAssistantView:
         response.enable_compression()
         return response
 
+    @staticmethod
+    async def json_stream(
+        request: web.Request,
+        items_factory: Callable[[], Iterable[Any]],
+        status_code: int = HTTP_OK,
+        headers: Optional[LooseHeaders] = None,
+    ) -> web.StreamResponse:
+        """Stream the items returned by items_factory as a JSON array.
+
+        items_factory is called in the executor and may iterate a database
+        cursor. Items are encoded and sent in chunks as they are produced,
+        so the whole array is never held in memory.
+        """
+        hass = request.app[KEY_HASS]
+        queue: asyncio.Queue = asyncio.Queue()
+        # Bounds the chunks that are queued but not yet sent to the client
+        free_slots = threading.Semaphore(JSON_STREAM_QUEUE_SIZE)
+        cancelled = threading.Event()
+
+        def put(chunk: Any) -> None:
+            """Hand a chunk to the event loop without waiting for it."""
+            hass.loop.call_soon_threadsafe(queue.put_nowait, chunk)
+
+        def send(chunk: bytes) -> bool:
+            """Queue a chunk, waiting while the client is behind.
+
+            Return False when the response was aborted.
+            """
+            free_slots.acquire()
+            if cancelled.is_set():
+                return False
+            put(chunk)
+            return True
+
+        def produce() -> None:
+            """Encode the items to chunks of a JSON array."""
+            items: Iterable[Any] = ()
+            try:
+                items = items_factory()
+                parts = ["["]
+                size = 0
+                separator = ""
+                for item in items:
+                    if cancelled.is_set():
+                        return
+                    encoded = json_dumps(item, allow_nan=False)
+                    parts.append(separator)
+                    parts.append(encoded)
+                    size += len(encoded)
+                    # Send the first item right away to get the response going
+                    if not separator or size >= JSON_STREAM_CHUNK_SIZE:
+                        if not send("".join(parts).encode("UTF-8")):
+                            return
+                        parts = []
+                        size = 0
+                    separator = ","
+                parts.append("]")
+                send("".join(parts).encode("UTF-8"))
+            except Exception as err:  # pylint: disable=broad-except
+                put(err)
+            finally:
+                # Generators release their database cursor when closed
+                close = getattr(items, "close", None)
+                if close is not None:
+                    close()
+                put(None)
+
+        producer = hass.async_add_executor_job(produce)
+        response = None
+        try:
+            while True:
+                chunk = await queue.get()
+                if chunk is None:
+                    break
+                if isinstance(chunk, Exception):
+                    _LOGGER.error("Unable to stream JSON: %s", chunk)
+                    if response is None:
+                        raise HTTPInternalServerError from chunk
+                    # Headers are sent, breaking the connection is all we can do
+                    raise chunk
+                if response is None:
+                    response = web.StreamResponse(status=status_code, headers=headers)
+                    response.content_type = CONTENT_TYPE_JSON
+                    response.enable_compression()
+                    await response.prepare(request)
+                await response.write(chunk)
+                free_slots.release()
+        finally:
+            # Stop the producer if the client went away or the task was cancelled
+            cancelled.set()
+            free_slots.release()
+
+        await producer
+        assert response is not None
+        await response.write_eof()
+        return response
+
     def json_message(
         self,
         message: str,
@@ -1,12 +1,12 @@
 """Event parser and human readable log generator."""
 from datetime import timedelta
+from functools import partial
 from itertools import groupby
 import json
 import logging
 import re
 
 import sqlalchemy
-from sqlalchemy.orm import aliased
 import voluptuous as vol
 
 from homeassistant.components import sun
@@ -15,6 +15,7 @@ from homeassistant.components.history import sqlalchemy_filter_from_include_excl
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder.models import (
     Events,
+    StateAttributes,
     States,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
@@ -67,7 +68,6 @@ DOMAIN = "logbook"
 GROUP_BY_MINUTES = 15
 
 EMPTY_JSON_OBJECT = "{}"
-UNIT_OF_MEASUREMENT_JSON = '"unit_of_measurement":'
 
 CONFIG_SCHEMA = vol.Schema(
     {DOMAIN: INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA}, extra=vol.ALLOW_EXTRA
@@ -214,20 +214,18 @@ class LogbookView(HomeAssistantView):
 
         hass = request.app["hass"]
 
-        def json_events():
-            """Fetch events and generate JSON."""
-            return self.json(
-                _get_events(
-                    hass,
-                    start_day,
-                    end_day,
-                    entity_id,
-                    self.filters,
-                    self.entities_filter,
-                )
-            )
-
-        return await hass.async_add_executor_job(json_events)
+        return await self.json_stream(
+            request,
+            partial(
+                _iter_events,
+                hass,
+                start_day,
+                end_day,
+                entity_id,
+                self.filters,
+                self.entities_filter,
+            ),
+        )
 
 
 def humanify(hass, events, entity_attr_cache, context_lookup):
@@ -393,6 +391,15 @@ def _get_events(
     hass, start_day, end_day, entity_id=None, filters=None, entities_filter=None
 ):
     """Get events for a period of time."""
+    return list(
+        _iter_events(hass, start_day, end_day, entity_id, filters, entities_filter)
+    )
+
+
+def _iter_events(
+    hass, start_day, end_day, entity_id=None, filters=None, entities_filter=None
+):
+    """Yield events for a period of time while they are fetched."""
     entity_attr_cache = EntityAttributeCache(hass)
     context_lookup = {None: None}
 
@@ -413,8 +420,6 @@ def _get_events(
             entity_ids = None
             apply_sql_entities_filter = True
 
-        old_state = aliased(States, name="old_state")
-
         query = (
             session.query(
                 Events.event_type,
@@ -426,31 +431,31 @@ def _get_events(
                 States.entity_id,
                 States.domain,
                 States.attributes,
+                StateAttributes.shared_attrs,
             )
             .order_by(Events.time_fired)
             .outerjoin(States, (Events.event_id == States.event_id))
-            .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+            .outerjoin(
+                StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+            )
             # The below filter, removes state change events that do not have
             # and old_state, new_state, or the old and
             # new state.
             #
-            .filter(
-                (Events.event_type != EVENT_STATE_CHANGED)
-                | (
-                    (States.state_id.isnot(None))
-                    & (old_state.state_id.isnot(None))
-                    & (States.state.isnot(None))
-                    & (States.state != old_state.state)
-                )
-            )
-            #
             # Prefilter out continuous domains that have
             # ATTR_UNIT_OF_MEASUREMENT as its much faster in sql.
             #
+            # Both are computed by the recorder when it inserts the state.
+            #
             .filter(
                 (Events.event_type != EVENT_STATE_CHANGED)
-                | sqlalchemy.not_(States.domain.in_(CONTINUOUS_DOMAINS))
-                | sqlalchemy.not_(States.attributes.contains(UNIT_OF_MEASUREMENT_JSON))
+                | (
+                    States.state_changed.is_(True)
+                    & (
+                        sqlalchemy.not_(States.domain.in_(CONTINUOUS_DOMAINS))
+                        | States.has_unit_of_measurement.isnot(True)
+                    )
+                )
             )
             .filter(
                 Events.event_type.in_(ALL_EVENT_TYPES + list(hass.data.get(DOMAIN, {})))
@@ -479,8 +484,8 @@ def _get_events(
                     entity_filter | (Events.event_type != EVENT_STATE_CHANGED)
                 )
 
-        return list(
-            humanify(hass, yield_events(query), entity_attr_cache, context_lookup)
+        yield from humanify(
+            hass, yield_events(query), entity_attr_cache, context_lookup
         )
 
 
@@ -712,13 +717,11 @@ class LazyEventPartialState:
     def attributes(self):
         """State attributes."""
         if not self._attributes:
-            if (
-                self._row.attributes is None
-                or self._row.attributes == EMPTY_JSON_OBJECT
-            ):
+            attributes = self._row.shared_attrs or self._row.attributes
+            if attributes is None or attributes == EMPTY_JSON_OBJECT:
                 self._attributes = {}
             else:
-                self._attributes = json.loads(self._row.attributes)
+                self._attributes = json.loads(attributes)
         return self._attributes
 
     @property
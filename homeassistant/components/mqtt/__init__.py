@@ -1,15 +1,17 @@
 """Support for MQTT message handling."""
 import asyncio
+from collections import deque
 from functools import partial, wraps
 import inspect
-from itertools import groupby
+from itertools import count
 import json
 import logging
-from operator import attrgetter
+from operator import itemgetter
 import os
 import ssl
+import threading
 import time
-from typing import Any, Callable, List, Optional, Union
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple, Union
 
 import attr
 import certifi
@@ -100,6 +102,7 @@ CONF_CLIENT_KEY = "client_key"
 CONF_CLIENT_CERT = "client_cert"
 CONF_TLS_INSECURE = "tls_insecure"
 CONF_TLS_VERSION = "tls_version"
+CONF_COALESCE_RETAINED = "coalesce_retained"
 
 CONF_COMMAND_TOPIC = "command_topic"
 CONF_TOPIC = "topic"
@@ -124,6 +127,7 @@ DEFAULT_PORT = 1883
 DEFAULT_KEEPALIVE = 60
 DEFAULT_PROTOCOL = PROTOCOL_311
 DEFAULT_TLS_PROTOCOL = "auto"
+DEFAULT_COALESCE_RETAINED = False
 
 ATTR_PAYLOAD_TEMPLATE = "payload_template"
 
@@ -208,6 +212,9 @@ CONFIG_SCHEMA = vol.Schema(
                         CONF_BIRTH_MESSAGE, default=DEFAULT_BIRTH
                     ): MQTT_WILL_BIRTH_SCHEMA,
                     vol.Optional(CONF_DISCOVERY, default=DEFAULT_DISCOVERY): cv.boolean,
+                    vol.Optional(
+                        CONF_COALESCE_RETAINED, default=DEFAULT_COALESCE_RETAINED
+                    ): cv.boolean,
                     # discovery_prefix must be a valid publish topic because if no
                     # state topic is specified, it will be created with the given prefix.
                     vol.Optional(
@@ -479,6 +486,7 @@ async def async_setup(hass: HomeAssistantType, config: ConfigType) -> bool:
     websocket_api.async_register_command(hass, websocket_subscribe)
     websocket_api.async_register_command(hass, websocket_remove_device)
     websocket_api.async_register_command(hass, websocket_mqtt_info)
+    websocket_api.async_register_command(hass, websocket_mqtt_ingest_stats)
 
     if conf is None:
         # If we have a config entry, setup is done by that config entry.
@@ -621,6 +629,145 @@ class Subscription:
     encoding: str = attr.ib(default="utf-8")
 
 
+@attr.s(slots=True)
+class MessageIngestStats:
+    """Statistics about batches of messages handed over from the paho thread."""
+
+    batches: int = attr.ib(default=0)
+    messages: int = attr.ib(default=0)
+    coalesced: int = attr.ib(default=0)
+    last_batch_size: int = attr.ib(default=0)
+    max_batch_size: int = attr.ib(default=0)
+    last_drain_latency: float = attr.ib(default=0.0)
+    max_drain_latency: float = attr.ib(default=0.0)
+
+    def record(self, batch_size: int, coalesced: int, drain_latency: float) -> None:
+        """Record a drained batch."""
+        self.batches += 1
+        self.messages += batch_size
+        self.coalesced += coalesced
+        self.last_batch_size = batch_size
+        self.max_batch_size = max(self.max_batch_size, batch_size)
+        self.last_drain_latency = drain_latency
+        self.max_drain_latency = max(self.max_drain_latency, drain_latency)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the statistics as a dictionary."""
+        return attr.asdict(self)
+
+
+class _SubscriptionNode:
+    """Node of the subscription trie, one per topic level."""
+
+    __slots__ = ("children", "subscriptions")
+
+    def __init__(self) -> None:
+        """Initialize an empty node."""
+        self.children: Dict[str, "_SubscriptionNode"] = {}
+        # Subscriptions with this node as topic filter, keyed by insertion order
+        self.subscriptions: List[Tuple[int, Subscription]] = []
+
+
+class SubscriptionTrie:
+    """Index of subscriptions by topic filter, supporting + and # wildcards.
+
+    Matching a topic costs time proportional to the topic depth and the
+    number of matching subscriptions instead of the number of subscriptions.
+    Matches are returned in the order the subscriptions were added.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the trie."""
+        self._root = _SubscriptionNode()
+        self._sequence = count()
+
+    def add(self, subscription: Subscription) -> None:
+        """Add a subscription to the trie."""
+        node = self._root
+        for level in subscription.topic.split("/"):
+            child = node.children.get(level)
+            if child is None:
+                child = node.children[level] = _SubscriptionNode()
+            node = child
+        node.subscriptions.append((next(self._sequence), subscription))
+
+    def remove(self, subscription: Subscription) -> bool:
+        """Remove a subscription from the trie and prune empty nodes.
+
+        Return if other subscriptions remain on the same topic filter.
+        Raise ValueError if the subscription is not in the trie.
+        """
+        path = []
+        node = self._root
+        for level in subscription.topic.split("/"):
+            if level not in node.children:
+                raise ValueError(f"{subscription} not in trie")
+            path.append((node, level))
+            node = node.children[level]
+
+        for idx, (_, other) in enumerate(node.subscriptions):
+            if other == subscription:
+                del node.subscriptions[idx]
+                break
+        else:
+            raise ValueError(f"{subscription} not in trie")
+
+        if node.subscriptions:
+            return True
+
+        for parent, level in reversed(path):
+            child = parent.children[level]
+            if child.children or child.subscriptions:
+                break
+            del parent.children[level]
+
+        return False
+
+    def topics(self) -> Iterator[Tuple[str, List[Subscription]]]:
+        """Iterate over all topic filters with their subscriptions."""
+        nodes = [self._root]
+        while nodes:
+            node = nodes.pop()
+            nodes.extend(node.children.values())
+            if node.subscriptions:
+                subscriptions = [sub for _, sub in node.subscriptions]
+                yield subscriptions[0].topic, subscriptions
+
+    def match(self, topic: str) -> List[Subscription]:
+        """Return all subscriptions whose topic filter matches topic.
+
+        Wildcards at the first level do not match topics starting with $.
+        """
+        matches: List[Tuple[int, Subscription]] = []
+        wildcards = not topic.startswith("$")
+        nodes = [self._root]
+
+        for idx, level in enumerate(topic.split("/")):
+            next_nodes = []
+            for node in nodes:
+                children = node.children
+                if level in children:
+                    next_nodes.append(children[level])
+                if wildcards or idx:
+                    if "+" in children:
+                        next_nodes.append(children["+"])
+                    if "#" in children:
+                        matches.extend(children["#"].subscriptions)
+            if not next_nodes:
+                break
+            nodes = next_nodes
+        else:
+            for node in nodes:
+                matches.extend(node.subscriptions)
+                # A trailing # also matches the parent level
+                if "#" in node.children:
+                    matches.extend(node.children["#"].subscriptions)
+
+        if len(matches) > 1:
+            matches.sort(key=itemgetter(0))
+        return [subscription for _, subscription in matches]
+
+
 class MQTT:
     """Home Assistant MQTT client."""
 
@@ -638,7 +785,7 @@ class MQTT:
         self.hass = hass
         self.config_entry = config_entry
         self.conf = conf
-        self.subscriptions: List[Subscription] = []
+        self._subscription_trie = SubscriptionTrie()
         self.connected = False
         self._ha_started = asyncio.Event()
         self._last_subscribe = time.time()
@@ -647,6 +794,12 @@ class MQTT:
 
         self._pending_operations = {}
 
+        # Messages received on the paho thread waiting to be handled in the loop
+        self._pending_messages: Deque[Tuple[float, Any]] = deque()
+        self._pending_messages_lock = threading.Lock()
+        self._drain_scheduled = False
+        self.ingest_stats = MessageIngestStats()
+
         if self.hass.state == CoreState.running:
             self._ha_started.set()
         else:
@@ -825,7 +978,7 @@ class MQTT:
             raise HomeAssistantError("Topic needs to be a string!")
 
         subscription = Subscription(topic, msg_callback, qos, encoding)
-        self.subscriptions.append(subscription)
+        self._subscription_trie.add(subscription)
 
         # Only subscribe if currently connected.
         if self.connected:
@@ -835,11 +988,12 @@ class MQTT:
         @callback
         def async_remove() -> None:
             """Remove subscription."""
-            if subscription not in self.subscriptions:
-                raise HomeAssistantError("Can't remove subscription twice")
-            self.subscriptions.remove(subscription)
+            try:
+                topic_in_use = self._subscription_trie.remove(subscription)
+            except ValueError as err:
+                raise HomeAssistantError("Can't remove subscription twice") from err
 
-            if any(other.topic == topic for other in self.subscriptions):
+            if topic_in_use:
                 # Other subscriptions on topic remaining - don't unsubscribe.
                 return
 
@@ -899,9 +1053,8 @@ class MQTT:
             result_code,
         )
 
-        # Group subscriptions to only re-subscribe once for each topic.
-        keyfunc = attrgetter("topic")
-        for topic, subs in groupby(sorted(self.subscriptions, key=keyfunc), keyfunc):
+        # Subscriptions are grouped by topic to only re-subscribe once for each topic.
+        for topic, subs in list(self._subscription_trie.topics()):
             # Re-subscribe with the highest requested qos
             max_qos = max(subscription.qos for subscription in subs)
             self.hass.add_job(self._async_perform_subscription, topic, max_qos)
@@ -925,8 +1078,45 @@ class MQTT:
             self.hass.loop.create_task(publish_birth_message(birth_message))
 
     def _mqtt_on_message(self, _mqttc, _userdata, msg) -> None:
-        """Message received callback."""
-        self.hass.add_job(self._mqtt_handle_message, msg)
+        """Message received callback.
+
+        Messages are buffered and handed to the event loop in batches, only
+        waking up the loop for the first message of each batch.
+        """
+        with self._pending_messages_lock:
+            self._pending_messages.append((time.monotonic(), msg))
+            if self._drain_scheduled:
+                return
+            self._drain_scheduled = True
+        self.hass.loop.call_soon_threadsafe(self._mqtt_drain_messages)
+
+    @callback
+    def _mqtt_drain_messages(self) -> None:
+        """Handle all messages received since the last drain."""
+        with self._pending_messages_lock:
+            pending = self._pending_messages
+            self._pending_messages = deque()
+            self._drain_scheduled = False
+
+        if not pending:
+            return
+
+        batch_size = len(pending)
+        drain_latency = time.monotonic() - pending[0][0]
+        messages = [msg for _, msg in pending]
+
+        if self.conf.get(CONF_COALESCE_RETAINED, DEFAULT_COALESCE_RETAINED):
+            messages = _coalesce_retained(messages)
+
+        self.ingest_stats.record(batch_size, batch_size - len(messages), drain_latency)
+        _LOGGER.debug(
+            "Handling batch of %s messages received %.3fs ago",
+            batch_size,
+            drain_latency,
+        )
+
+        for msg in messages:
+            self._mqtt_handle_message(msg)
 
     @callback
     def _mqtt_handle_message(self, msg) -> None:
@@ -938,10 +1128,7 @@ class MQTT:
         )
         timestamp = dt_util.utcnow()
 
-        for subscription in self.subscriptions:
-            if not _match_topic(subscription.topic, msg.topic):
-                continue
-
+        for subscription in self._subscription_trie.match(msg.topic):
             payload: SubscribePayloadType = msg.payload
             if subscription.encoding is not None:
                 try:
@@ -1036,18 +1223,18 @@ def _raise_on_error(result_code: int) -> None:
         )
 
 
-def _match_topic(subscription: str, topic: str) -> bool:
-    """Test if topic matches subscription."""
-    # pylint: disable=import-outside-toplevel
-    from paho.mqtt.matcher import MQTTMatcher
-
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
-    try:
-        next(matcher.iter_match(topic))
-        return True
-    except StopIteration:
-        return False
+def _coalesce_retained(messages: List[Any]) -> List[Any]:
+    """Drop retained messages superseded by a later retained message on the same topic."""
+    seen_topics = set()
+    coalesced = []
+    for msg in reversed(messages):
+        if msg.retain:
+            if msg.topic in seen_topics:
+                continue
+            seen_topics.add(msg.topic)
+        coalesced.append(msg)
+    coalesced.reverse()
+    return coalesced
 
 
 class MqttAttributes(Entity):
@@ -1391,6 +1578,13 @@ async def websocket_mqtt_info(hass, connection, msg):
     connection.send_result(msg["id"], mqtt_info)
 
 
+@websocket_api.websocket_command({vol.Required("type"): "mqtt/ingest_stats"})
+@callback
+def websocket_mqtt_ingest_stats(hass, connection, msg):
+    """Get the statistics of received MQTT messages."""
+    connection.send_result(msg["id"], hass.data[DATA_MQTT].ingest_stats.as_dict())
+
+
 @websocket_api.websocket_command(
     {vol.Required("type"): "mqtt/device/remove", vol.Required("device_id"): str}
 )
@@ -1,15 +1,15 @@
 """Support for recording details."""
 import asyncio
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 import concurrent.futures
 from datetime import datetime
 import logging
 import queue
 import threading
 import time
-from typing import Any, Callable, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
-from sqlalchemy import create_engine, event as sqlalchemy_event, exc, select
+from sqlalchemy import create_engine, event as sqlalchemy_event, exc, func, select
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.pool import StaticPool
 import voluptuous as vol
@@ -36,7 +36,7 @@ import homeassistant.util.dt as dt_util
 
 from . import migration, purge
 from .const import DATA_INSTANCE, DOMAIN, SQLITE_URL_PREFIX
-from .models import Base, Events, RecorderRuns, States
+from .models import Base, Events, RecorderRuns, StateAttributes, States
 from .util import session_scope, validate_or_move_away_sqlite_database
 
 _LOGGER = logging.getLogger(__name__)
@@ -58,6 +58,7 @@ DEFAULT_DB_FILE = "home-assistant_v2.db"
 DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
 KEEPALIVE_TIME = 30
+STATE_ATTRIBUTES_ID_CACHE_SIZE = 2048
 
 CONF_AUTO_PURGE = "auto_purge"
 CONF_DB_URL = "db_url"
@@ -67,6 +68,14 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_BULK_INSERT = "bulk_insert"
+CONF_PURGE_BATCH_SIZE = "purge_batch_size"
+
+DEFAULT_PURGE_BATCH_SIZE = 1000
+
+# Dialects where rows can be inserted with client assigned primary keys
+# without leaving an auto increment sequence behind.
+BULK_INSERT_DIALECTS = ("sqlite", "mysql")
 
 EXCLUDE_SCHEMA = INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER.extend(
     {vol.Optional(CONF_EVENT_TYPES): vol.All(cv.ensure_list, [cv.string])}
@@ -89,10 +98,14 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(CONF_PURGE_INTERVAL, default=1): vol.All(
                         vol.Coerce(int), vol.Range(min=0)
                     ),
+                    vol.Optional(
+                        CONF_PURGE_BATCH_SIZE, default=DEFAULT_PURGE_BATCH_SIZE
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
                     vol.Optional(CONF_DB_URL): cv.string,
                     vol.Optional(CONF_COMMIT_INTERVAL, default=1): vol.All(
                         vol.Coerce(int), vol.Range(min=0)
                     ),
+                    vol.Optional(CONF_BULK_INSERT, default=False): cv.boolean,
                     vol.Optional(
                         CONF_DB_MAX_RETRIES, default=DEFAULT_DB_MAX_RETRIES
                     ): cv.positive_int,
@@ -153,9 +166,11 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     entity_filter = convert_include_exclude_filter(conf)
     auto_purge = conf[CONF_AUTO_PURGE]
     keep_days = conf[CONF_PURGE_KEEP_DAYS]
+    purge_batch_size = conf[CONF_PURGE_BATCH_SIZE]
     commit_interval = conf[CONF_COMMIT_INTERVAL]
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
+    bulk_insert = conf[CONF_BULK_INSERT]
 
     db_url = conf.get(CONF_DB_URL)
     if not db_url:
@@ -172,6 +187,8 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         db_retry_wait=db_retry_wait,
         entity_filter=entity_filter,
         exclude_t=exclude_t,
+        bulk_insert=bulk_insert,
+        purge_batch_size=purge_batch_size,
     )
     instance.async_initialize()
     instance.start()
@@ -204,6 +221,8 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         entity_filter: Callable[[str], bool],
         exclude_t: List[str],
+        bulk_insert: bool = False,
+        purge_batch_size: int = DEFAULT_PURGE_BATCH_SIZE,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -223,10 +242,25 @@ class Recorder(threading.Thread):
 
         self.entity_filter = entity_filter
         self.exclude_t = exclude_t
+        self.bulk_insert = bulk_insert
+        self.purge_batch_size = purge_batch_size
+        self.purge_stats = purge.PurgeStats()
 
         self._timechanges_seen = 0
         self._keepalive_count = 0
         self._old_state_ids = {}
+        self._pending_events: List[Dict[str, Any]] = []
+        self._pending_states: List[Dict[str, Any]] = []
+        # old state ids before the pending batch changed them
+        self._pending_old_state_ids: Dict[str, Optional[int]] = {}
+        self._pending_attributes: List[Dict[str, Any]] = []
+        # attributes ids looked up or created since the last commit
+        self._pending_attributes_ids: Dict[str, int] = {}
+        # committed attributes ids by serialized attributes, least recent first
+        self._attributes_ids: Dict[str, int] = OrderedDict()
+        self._next_event_id = 0
+        self._next_state_id = 0
+        self._next_attributes_id = 0
         self.event_session = None
         self.get_session = None
         self._completed_database_setup = False
@@ -255,6 +289,7 @@ class Recorder(threading.Thread):
                 self._setup_connection()
                 migration.migrate_schema(self)
                 self._setup_run()
+                self._setup_bulk_insert()
                 connected = True
                 _LOGGER.debug("Connected to recorder database")
             except Exception as err:  # pylint: disable=broad-except
@@ -341,6 +376,9 @@ class Recorder(threading.Thread):
                 self._close_connection()
                 return
             if isinstance(event, PurgeTask):
+                # Pending states may reference attributes the purge removes
+                # when they are no longer used by any stored state
+                self._commit_event_session_or_retry()
                 # Schedule a new purge task if this one didn't finish
                 if not purge.purge_old_data(self, event.keep_days, event.repack):
                     self.queue.put(PurgeTask(event.keep_days, event.repack))
@@ -364,45 +402,203 @@ class Recorder(threading.Thread):
                 if not self.entity_filter(entity_id):
                     continue
 
-            try:
+            if self.bulk_insert:
+                self._buffer_event(event)
+            else:
+                self._add_event(event)
+
+            # If they do not have a commit interval
+            # than we commit right away
+            if not self.commit_interval:
+                self._commit_event_session_or_retry()
+
+    def _add_event(self, event):
+        """Add an event and its state to the session, flushing each row."""
+        dbevent = None
+        try:
+            if event.event_type == EVENT_STATE_CHANGED:
+                # The state is stored in the states table
+                dbevent = Events.from_event(event, event_data="{}")
+            else:
                 dbevent = Events.from_event(event)
-                if event.event_type == EVENT_STATE_CHANGED:
-                    dbevent.event_data = "{}"
-                self.event_session.add(dbevent)
+            self.event_session.add(dbevent)
+            self.event_session.flush()
+        except (TypeError, ValueError):
+            _LOGGER.warning("Event is not JSON serializable: %s", event)
+        except Exception as err:  # pylint: disable=broad-except
+            # Must catch the exception to prevent the loop from collapsing
+            _LOGGER.exception("Error adding event: %s", err)
+
+        if dbevent and event.event_type == EVENT_STATE_CHANGED:
+            try:
+                dbstate = States.from_event(event)
+                dbstate.attributes_id = self._get_attributes_id(
+                    StateAttributes.shared_attrs_from_event(event)
+                )
+                has_new_state = event.data.get("new_state")
+                dbstate.old_state_id = self._old_state_ids.get(dbstate.entity_id)
+                if dbstate.old_state_id is None:
+                    dbstate.state_changed = False
+                if not has_new_state:
+                    dbstate.state = None
+                dbstate.event_id = dbevent.event_id
+                self.event_session.add(dbstate)
                 self.event_session.flush()
+                if has_new_state:
+                    self._old_state_ids[dbstate.entity_id] = dbstate.state_id
+                elif dbstate.entity_id in self._old_state_ids:
+                    del self._old_state_ids[dbstate.entity_id]
             except (TypeError, ValueError):
-                _LOGGER.warning("Event is not JSON serializable: %s", event)
+                _LOGGER.warning(
+                    "State is not JSON serializable: %s",
+                    event.data.get("new_state"),
+                )
             except Exception as err:  # pylint: disable=broad-except
                 # Must catch the exception to prevent the loop from collapsing
-                _LOGGER.exception("Error adding event: %s", err)
-
-            if dbevent and event.event_type == EVENT_STATE_CHANGED:
-                try:
-                    dbstate = States.from_event(event)
-                    has_new_state = event.data.get("new_state")
-                    dbstate.old_state_id = self._old_state_ids.get(dbstate.entity_id)
-                    if not has_new_state:
-                        dbstate.state = None
-                    dbstate.event_id = dbevent.event_id
-                    self.event_session.add(dbstate)
-                    self.event_session.flush()
-                    if has_new_state:
-                        self._old_state_ids[dbstate.entity_id] = dbstate.state_id
-                    elif dbstate.entity_id in self._old_state_ids:
-                        del self._old_state_ids[dbstate.entity_id]
-                except (TypeError, ValueError):
-                    _LOGGER.warning(
-                        "State is not JSON serializable: %s",
-                        event.data.get("new_state"),
-                    )
-                except Exception as err:  # pylint: disable=broad-except
-                    # Must catch the exception to prevent the loop from collapsing
-                    _LOGGER.exception("Error adding state change: %s", err)
+                _LOGGER.exception("Error adding state change: %s", err)
 
-            # If they do not have a commit interval
-            # than we commit right away
-            if not self.commit_interval:
-                self._commit_event_session_or_retry()
+    def _buffer_event(self, event):
+        """Buffer an event and its state to be bulk inserted on commit.
+
+        Primary keys are assigned here so that the state rows can reference
+        their event and old state without a round trip to the database.
+        """
+        try:
+            if event.event_type == EVENT_STATE_CHANGED:
+                dbevent = Events.row_from_event(event, event_data="{}")
+            else:
+                dbevent = Events.row_from_event(event)
+        except (TypeError, ValueError):
+            _LOGGER.warning("Event is not JSON serializable: %s", event)
+            return
+
+        dbevent["event_id"] = self._next_event_id
+        self._next_event_id += 1
+        self._pending_events.append(dbevent)
+
+        if event.event_type != EVENT_STATE_CHANGED:
+            return
+
+        try:
+            dbstate = States.row_from_event(event)
+            shared_attrs = StateAttributes.shared_attrs_from_event(event)
+        except (TypeError, ValueError):
+            _LOGGER.warning(
+                "State is not JSON serializable: %s", event.data.get("new_state")
+            )
+            return
+
+        try:
+            dbstate["attributes_id"] = self._get_attributes_id(shared_attrs)
+        except Exception as err:  # pylint: disable=broad-except
+            # Must catch the exception to prevent the loop from collapsing
+            _LOGGER.exception("Error adding state change: %s", err)
+            return
+
+        entity_id = dbstate["entity_id"]
+        dbstate["state_id"] = self._next_state_id
+        self._next_state_id += 1
+        dbstate["event_id"] = dbevent["event_id"]
+        dbstate["old_state_id"] = self._old_state_ids.get(entity_id)
+        if dbstate["old_state_id"] is None:
+            dbstate["state_changed"] = False
+        self._pending_old_state_ids.setdefault(entity_id, dbstate["old_state_id"])
+        if event.data.get("new_state"):
+            self._old_state_ids[entity_id] = dbstate["state_id"]
+        else:
+            dbstate["state"] = None
+            self._old_state_ids.pop(entity_id, None)
+        self._pending_states.append(dbstate)
+
+    def _get_attributes_id(self, shared_attrs):
+        """Return the id of the stored attributes, adding them when new."""
+        attributes_id = self._pending_attributes_ids.get(shared_attrs)
+        if attributes_id is not None:
+            return attributes_id
+
+        attributes_id = self._attributes_ids.get(shared_attrs)
+        if attributes_id is not None:
+            self._attributes_ids.move_to_end(shared_attrs)
+            return attributes_id
+
+        attributes_hash = StateAttributes.hash_shared_attrs(shared_attrs)
+        row = (
+            self.event_session.query(StateAttributes.attributes_id)
+            .filter(
+                (StateAttributes.hash == attributes_hash)
+                & (StateAttributes.shared_attrs == shared_attrs)
+            )
+            .first()
+        )
+        if row is not None:
+            attributes_id = row[0]
+        elif self.bulk_insert:
+            attributes_id = self._next_attributes_id
+            self._next_attributes_id += 1
+            self._pending_attributes.append(
+                {
+                    "attributes_id": attributes_id,
+                    "hash": attributes_hash,
+                    "shared_attrs": shared_attrs,
+                }
+            )
+        else:
+            dbattributes = StateAttributes(
+                hash=attributes_hash, shared_attrs=shared_attrs
+            )
+            self.event_session.add(dbattributes)
+            self.event_session.flush()
+            attributes_id = dbattributes.attributes_id
+
+        self._pending_attributes_ids[shared_attrs] = attributes_id
+        return attributes_id
+
+    def _write_pending_rows(self):
+        """Bulk insert the buffered events and states."""
+        if self._pending_attributes:
+            self.event_session.execute(
+                StateAttributes.__table__.insert(), self._pending_attributes
+            )
+        if self._pending_events:
+            self.event_session.execute(Events.__table__.insert(), self._pending_events)
+        if self._pending_states:
+            self.event_session.execute(States.__table__.insert(), self._pending_states)
+
+    def _clear_pending_rows(self):
+        """Clear the buffered events and states after they were written."""
+        for shared_attrs, attributes_id in self._pending_attributes_ids.items():
+            self._attributes_ids[shared_attrs] = attributes_id
+        while len(self._attributes_ids) > STATE_ATTRIBUTES_ID_CACHE_SIZE:
+            self._attributes_ids.popitem(last=False)
+        self._pending_attributes = []
+        self._pending_attributes_ids = {}
+        self._pending_events = []
+        self._pending_states = []
+        self._pending_old_state_ids = {}
+
+    def _drop_pending_rows(self):
+        """Drop the buffered events and states that could not be written.
+
+        The old state ids are restored so that later states do not
+        reference rows that never made it into the database.
+        """
+        for entity_id, old_state_id in self._pending_old_state_ids.items():
+            if old_state_id is None:
+                self._old_state_ids.pop(entity_id, None)
+            else:
+                self._old_state_ids[entity_id] = old_state_id
+        self._pending_attributes_ids = {}
+        self._clear_pending_rows()
+
+    def evict_attributes_ids(self, attributes_ids):
+        """Drop deleted attributes from the attributes id cache."""
+        deleted_ids = set(attributes_ids)
+        for shared_attrs in [
+            shared_attrs
+            for shared_attrs, attributes_id in self._attributes_ids.items()
+            if attributes_id in deleted_ids
+        ]:
+            del self._attributes_ids[shared_attrs]
 
     def _send_keep_alive(self):
         try:
@@ -446,12 +642,14 @@ class Recorder(threading.Thread):
             except Exception as err:  # pylint: disable=broad-except
                 # Must catch the exception to prevent the loop from collapsing
                 _LOGGER.exception("Error saving events: %s", err)
+                self._drop_pending_rows()
                 return
 
         _LOGGER.error(
             "Error in database update. Could not save " "after %d tries. Giving up",
             tries,
         )
+        self._drop_pending_rows()
         self._reopen_event_session()
 
     def _reopen_event_session(self):
@@ -475,10 +673,15 @@ class Recorder(threading.Thread):
 
     def _commit_event_session(self):
         try:
+            self._write_pending_rows()
             self.event_session.commit()
+            self._clear_pending_rows()
         except Exception as err:
             _LOGGER.error("Error executing query: %s", err)
             self.event_session.rollback()
+            if not self.bulk_insert:
+                # The attributes flushed since the last commit are gone
+                self._pending_attributes_ids = {}
             raise
 
     @callback
@@ -583,6 +786,30 @@ class Recorder(threading.Thread):
             session.flush()
             session.expunge(self.run_info)
 
+    def _setup_bulk_insert(self):
+        """Prepare primary key allocation for bulk inserts."""
+        if not self.bulk_insert:
+            return
+
+        if self.engine.dialect.name not in BULK_INSERT_DIALECTS:
+            _LOGGER.warning(
+                "Bulk insert is not supported for %s databases, disabling it",
+                self.engine.dialect.name,
+            )
+            self.bulk_insert = False
+            return
+
+        with session_scope(session=self.get_session()) as session:
+            self._next_event_id = (
+                session.query(func.max(Events.event_id)).scalar() or 0
+            ) + 1
+            self._next_state_id = (
+                session.query(func.max(States.state_id)).scalar() or 0
+            ) + 1
+            self._next_attributes_id = (
+                session.query(func.max(StateAttributes.attributes_id)).scalar() or 0
+            ) + 1
+
     def _close_run(self):
         """Save end time for current run."""
         if self.event_session is not None:
@@ -11,6 +11,8 @@ from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+BACKFILL_BATCH_SIZE = 10000
+
 
 def migrate_schema(instance):
     """Check if the schema needs to be upgraded."""
@@ -205,6 +207,60 @@ def _add_columns(engine, table_name, columns_def):
             )
 
 
+def _backfill_logbook_columns(engine):
+    """Compute the columns the logbook filters on for existing states.
+
+    MySQL can't update a table from a subquery on the same table, so the
+    values are selected in batches and written back by primary key.
+    """
+    _LOGGER.warning(
+        "Computing logbook columns of existing states. Note: this can take "
+        "several minutes on large databases and slow computers. Please "
+        "be patient!"
+    )
+    select = text(
+        "SELECT states.state_id, "
+        "old_state.state IS NOT NULL AND states.state IS NOT NULL "
+        "AND states.state != old_state.state, "
+        "COALESCE(state_attributes.shared_attrs, states.attributes, '') "
+        "LIKE :unit_pattern "
+        "FROM states "
+        "LEFT JOIN states AS old_state "
+        "ON states.old_state_id = old_state.state_id "
+        "LEFT JOIN state_attributes "
+        "ON states.attributes_id = state_attributes.attributes_id "
+        "WHERE states.state_id > :last_state_id "
+        "ORDER BY states.state_id LIMIT :batch_size"
+    )
+    update = text(
+        "UPDATE states SET state_changed = :state_changed, "
+        "has_unit_of_measurement = :has_unit_of_measurement "
+        "WHERE state_id = :state_id"
+    )
+    last_state_id = 0
+    while True:
+        rows = engine.execute(
+            select,
+            unit_pattern='%"unit_of_measurement":%',
+            last_state_id=last_state_id,
+            batch_size=BACKFILL_BATCH_SIZE,
+        ).fetchall()
+        if not rows:
+            break
+        engine.execute(
+            update,
+            [
+                {
+                    "state_id": state_id,
+                    "state_changed": bool(state_changed),
+                    "has_unit_of_measurement": bool(has_unit_of_measurement),
+                }
+                for state_id, state_changed, has_unit_of_measurement in rows
+            ],
+        )
+        last_state_id = rows[-1][0]
+
+
 def _apply_update(engine, new_version, old_version):
     """Perform operations to bring schema up to date."""
     if new_version == 1:
@@ -277,6 +333,20 @@ def _apply_update(engine, new_version, old_version):
         _drop_index(engine, "states", "ix_states_entity_id")
         _create_index(engine, "events", "ix_events_event_type_time_fired")
         _drop_index(engine, "events", "ix_events_event_type")
+    elif new_version == 10:
+        # Attributes are now stored once per distinct set in the
+        # state_attributes table, which is created with the other tables.
+        # Existing states keep their attributes column, it is only
+        # used as fallback when reading them.
+        _add_columns(engine, "states", ["attributes_id INTEGER"])
+        _create_index(engine, "states", "ix_states_attributes_id")
+    elif new_version == 11:
+        _add_columns(
+            engine,
+            "states",
+            ["state_changed BOOLEAN", "has_unit_of_measurement BOOLEAN"],
+        )
+        _backfill_logbook_columns(engine)
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
@@ -1,8 +1,10 @@
 """Models for SQLAlchemy."""
 import json
 import logging
+import zlib
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     DateTime,
@@ -14,8 +16,10 @@ from sqlalchemy import (
     distinct,
 )
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
 from sqlalchemy.orm.session import Session
 
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
 from homeassistant.core import Context, Event, EventOrigin, State, split_entity_id
 from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
@@ -24,7 +28,7 @@ import homeassistant.util.dt as dt_util
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 9
+SCHEMA_VERSION = 11
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,10 +36,17 @@ DB_TIMEZONE = "+00:00"
 
 TABLE_EVENTS = "events"
 TABLE_STATES = "states"
+TABLE_STATE_ATTRIBUTES = "state_attributes"
 TABLE_RECORDER_RUNS = "recorder_runs"
 TABLE_SCHEMA_CHANGES = "schema_changes"
 
-ALL_TABLES = [TABLE_EVENTS, TABLE_STATES, TABLE_RECORDER_RUNS, TABLE_SCHEMA_CHANGES]
+ALL_TABLES = [
+    TABLE_EVENTS,
+    TABLE_STATES,
+    TABLE_STATE_ATTRIBUTES,
+    TABLE_RECORDER_RUNS,
+    TABLE_SCHEMA_CHANGES,
+]
 
 
 class Events(Base):  # type: ignore
@@ -59,17 +70,27 @@ class Events(Base):  # type: ignore
     )
 
     @staticmethod
-    def from_event(event):
+    def from_event(event, event_data=None):
         """Create an event database object from a native event."""
-        return Events(
-            event_type=event.event_type,
-            event_data=json.dumps(event.data, cls=JSONEncoder),
-            origin=str(event.origin),
-            time_fired=event.time_fired,
-            context_id=event.context.id,
-            context_user_id=event.context.user_id,
-            context_parent_id=event.context.parent_id,
-        )
+        return Events(**Events.row_from_event(event, event_data))
+
+    @staticmethod
+    def row_from_event(event, event_data=None):
+        """Create a dict of column values from a native event.
+
+        Pass event_data to store it instead of the serialized event data.
+        """
+        if event_data is None:
+            event_data = json.dumps(event.data, cls=JSONEncoder)
+        return {
+            "event_type": event.event_type,
+            "event_data": event_data,
+            "origin": str(event.origin),
+            "time_fired": event.time_fired,
+            "context_id": event.context.id,
+            "context_user_id": event.context.user_id,
+            "context_parent_id": event.context.parent_id,
+        }
 
     def to_native(self, validate_entity_id=True):
         """Convert to a natve HA Event."""
@@ -106,6 +127,16 @@ class States(Base):  # type: ignore
     last_updated = Column(DateTime(timezone=True), default=dt_util.utcnow, index=True)
     created = Column(DateTime(timezone=True), default=dt_util.utcnow)
     old_state_id = Column(Integer)
+    attributes_id = Column(
+        Integer, ForeignKey("state_attributes.attributes_id"), index=True
+    )
+    # Computed on insert so the logbook can filter states without
+    # joining the old state or searching the attributes
+    state_changed = Column(Boolean)
+    has_unit_of_measurement = Column(Boolean)
+    # States recorded before schema version 10 keep their attributes
+    # in the attributes column instead.
+    state_attributes = relationship("StateAttributes", lazy="joined")
 
     __table_args__ = (
         # Used for fetching the state of entities at a specific time
@@ -115,27 +146,43 @@ class States(Base):  # type: ignore
 
     @staticmethod
     def from_event(event):
-        """Create object from a state_changed event."""
+        """Create object from a state_changed event.
+
+        The attributes are stored separately, see StateAttributes.
+        """
+        return States(**States.row_from_event(event))
+
+    @staticmethod
+    def row_from_event(event):
+        """Create a dict of column values from a state_changed event.
+
+        The attributes are stored separately, see StateAttributes.
+        """
         entity_id = event.data["entity_id"]
         state = event.data.get("new_state")
 
-        dbstate = States(entity_id=entity_id)
-
         # State got deleted
         if state is None:
-            dbstate.state = ""
-            dbstate.domain = split_entity_id(entity_id)[0]
-            dbstate.attributes = "{}"
-            dbstate.last_changed = event.time_fired
-            dbstate.last_updated = event.time_fired
-        else:
-            dbstate.domain = state.domain
-            dbstate.state = state.state
-            dbstate.attributes = json.dumps(dict(state.attributes), cls=JSONEncoder)
-            dbstate.last_changed = state.last_changed
-            dbstate.last_updated = state.last_updated
-
-        return dbstate
+            return {
+                "entity_id": entity_id,
+                "state": "",
+                "domain": split_entity_id(entity_id)[0],
+                "last_changed": event.time_fired,
+                "last_updated": event.time_fired,
+                "state_changed": False,
+                "has_unit_of_measurement": False,
+            }
+
+        old_state = event.data.get("old_state")
+        return {
+            "entity_id": entity_id,
+            "domain": state.domain,
+            "state": state.state,
+            "last_changed": state.last_changed,
+            "last_updated": state.last_updated,
+            "state_changed": old_state is not None and old_state.state != state.state,
+            "has_unit_of_measurement": ATTR_UNIT_OF_MEASUREMENT in state.attributes,
+        }
 
     def to_native(self, validate_entity_id=True):
         """Convert to an HA state object."""
@@ -143,7 +190,7 @@ class States(Base):  # type: ignore
             return State(
                 self.entity_id,
                 self.state,
-                json.loads(self.attributes),
+                json.loads(self.shared_attrs),
                 process_timestamp(self.last_changed),
                 process_timestamp(self.last_updated),
                 # Join the events table on event_id to get the context instead
@@ -156,6 +203,45 @@ class States(Base):  # type: ignore
             _LOGGER.exception("Error converting row to state: %s", self)
             return None
 
+    @property
+    def shared_attrs(self):
+        """Return the attributes JSON of this state."""
+        if self.state_attributes is not None:
+            return self.state_attributes.shared_attrs
+        return self.attributes
+
+
+class StateAttributes(Base):  # type: ignore
+    """State attributes shared by all states that have the same attributes."""
+
+    __tablename__ = TABLE_STATE_ATTRIBUTES
+    attributes_id = Column(Integer, primary_key=True)
+    hash = Column(BigInteger, index=True)
+    shared_attrs = Column(Text)
+
+    @staticmethod
+    def from_event(event):
+        """Create object from a state_changed event."""
+        shared_attrs = StateAttributes.shared_attrs_from_event(event)
+        return StateAttributes(
+            hash=StateAttributes.hash_shared_attrs(shared_attrs),
+            shared_attrs=shared_attrs,
+        )
+
+    @staticmethod
+    def shared_attrs_from_event(event):
+        """Serialize the attributes of the new state of a state_changed event."""
+        state = event.data.get("new_state")
+        # State got deleted
+        if state is None:
+            return "{}"
+        return json.dumps(dict(state.attributes), cls=JSONEncoder)
+
+    @staticmethod
+    def hash_shared_attrs(shared_attrs):
+        """Return the hash used to look up serialized attributes."""
+        return zlib.crc32(shared_attrs.encode("utf-8"))
+
 
 class RecorderRuns(Base):  # type: ignore
     """Representation of recorder run."""
@@ -3,65 +3,69 @@ from datetime import timedelta
 import logging
 import time
 
+import attr
+from sqlalchemy import distinct, func
 from sqlalchemy.exc import OperationalError, SQLAlchemyError
 
 import homeassistant.util.dt as dt_util
 
-from .models import Events, RecorderRuns, States
-from .util import execute, session_scope
+from .models import Events, RecorderRuns, StateAttributes, States
+from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# SQLite limits the number of bound parameters in a query to 999
+MAX_IDS_PER_QUERY = 900
+
+
+@attr.s(slots=True)
+class PurgeStats:
+    """Statistics about a purge that spans several passes."""
+
+    batches: int = attr.ib(default=0)
+    states: int = attr.ib(default=0)
+    state_attributes: int = attr.ib(default=0)
+    events: int = attr.ib(default=0)
+    duration: float = attr.ib(default=0.0)
+    max_batch_duration: float = attr.ib(default=0.0)
+
+    def record_batch(self, duration: float) -> None:
+        """Record the duration of a batch."""
+        self.batches += 1
+        self.duration += duration
+        self.max_batch_duration = max(self.max_batch_duration, duration)
+
 
 def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
     """Purge events and states older than purge_days ago.
 
-    Cleans up an timeframe of an hour, based on the oldest record.
+    Deletes at most instance.purge_batch_size rows of a table per pass,
+    oldest primary keys first. Returns False when rows are left so the
+    recorder can handle queued events before the next pass.
     """
     purge_before = dt_util.utcnow() - timedelta(days=purge_days)
+    batch_size = instance.purge_batch_size
+    stats = instance.purge_stats
     _LOGGER.debug("Purging states and events before target %s", purge_before)
 
     try:
         with session_scope(session=instance.get_session()) as session:
-            # Purge a max of 1 hour, based on the oldest states or events record
-            batch_purge_before = purge_before
-
-            query = session.query(States).order_by(States.last_updated.asc()).limit(1)
-            states = execute(query, to_native=True, validate_entity_ids=False)
-            if states:
-                batch_purge_before = min(
-                    batch_purge_before,
-                    states[0].last_updated + timedelta(hours=1),
-                )
-
-            query = session.query(Events).order_by(Events.time_fired.asc()).limit(1)
-            events = execute(query, to_native=True)
-            if events:
-                batch_purge_before = min(
-                    batch_purge_before,
-                    events[0].time_fired + timedelta(hours=1),
-                )
-
-            _LOGGER.debug("Purging states and events before %s", batch_purge_before)
-
-            deleted_rows = (
-                session.query(States)
-                .filter(States.last_updated < batch_purge_before)
-                .delete(synchronize_session=False)
+            start = time.monotonic()
+            deleted_rows, deleted_attributes_ids = _purge_states(
+                session, purge_before, batch_size
             )
-            _LOGGER.debug("Deleted %s states", deleted_rows)
-
-            deleted_rows = (
-                session.query(Events)
-                .filter(Events.time_fired < batch_purge_before)
-                .delete(synchronize_session=False)
-            )
-            _LOGGER.debug("Deleted %s events", deleted_rows)
+            stats.states += deleted_rows
+            stats.state_attributes += len(deleted_attributes_ids)
+            if deleted_attributes_ids:
+                instance.evict_attributes_ids(deleted_attributes_ids)
+            if deleted_rows == batch_size:
+                _record_batch(stats, start)
+                return False
 
-            # If states or events purging isn't processing the purge_before yet,
-            # return false, as we are not done yet.
-            if batch_purge_before != purge_before:
-                _LOGGER.debug("Purging hasn't fully completed yet")
+            deleted_events = _purge_events(session, purge_before, batch_size)
+            stats.events += deleted_events
+            if deleted_events == batch_size:
+                _record_batch(stats, start)
                 return False
 
             # Recorder runs is small, no need to batch run it
@@ -71,6 +75,7 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
                 .delete(synchronize_session=False)
             )
             _LOGGER.debug("Deleted %s recorder_runs", deleted_rows)
+            _record_batch(stats, start)
 
         if repack:
             # Execute sqlite or postgresql vacuum command to free up space on disk
@@ -80,7 +85,26 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
             # Optimize mysql / mariadb tables to free up space on disk
             elif instance.engine.driver in ("mysqldb", "pymysql"):
                 _LOGGER.debug("Optimizing SQL DB to free space")
-                instance.engine.execute("OPTIMIZE TABLE states, events, recorder_runs")
+                instance.engine.execute(
+                    "OPTIMIZE TABLE states, state_attributes, events, recorder_runs"
+                )
+
+        # Only report purges that deleted something
+        log = (
+            _LOGGER.info
+            if stats.states or stats.state_attributes or stats.events
+            else _LOGGER.debug
+        )
+        log(
+            "Purged %s states, %s state attributes and %s events in %s batches "
+            "taking %.3fs (longest batch %.3fs)",
+            stats.states,
+            stats.state_attributes,
+            stats.events,
+            stats.batches,
+            stats.duration,
+            stats.max_batch_duration,
+        )
 
     except OperationalError as err:
         # Retry when one of the following MySQL errors occurred:
@@ -99,4 +123,102 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
         _LOGGER.warning("Error purging history: %s", err)
     except SQLAlchemyError as err:
         _LOGGER.warning("Error purging history: %s", err)
+
+    instance.purge_stats = PurgeStats()
     return True
+
+
+def _record_batch(stats, start):
+    """Record and report the progress of a finished batch."""
+    duration = time.monotonic() - start
+    stats.record_batch(duration)
+    _LOGGER.debug(
+        "Purge batch %s took %.3fs, purged %s states and %s events so far",
+        stats.batches,
+        duration,
+        stats.states,
+        stats.events,
+    )
+
+
+def _purge_states(session, purge_before, batch_size):
+    """Delete the oldest batch of states and their unused attributes."""
+    batch = (
+        session.query(States.state_id)
+        .filter(States.last_updated < purge_before)
+        .order_by(States.state_id)
+        .limit(batch_size)
+        .subquery()
+    )
+    max_state_id = session.query(func.max(batch.c.state_id)).scalar()
+    if max_state_id is None:
+        return 0, []
+
+    # The batch holds exactly the old states up to its highest primary key,
+    # so the deletes can use a range instead of listing every id.
+    batch_filter = (States.state_id <= max_state_id) & (
+        States.last_updated < purge_before
+    )
+    attributes_ids = {
+        attributes_id
+        for attributes_id, in session.query(distinct(States.attributes_id)).filter(
+            batch_filter & States.attributes_id.isnot(None)
+        )
+    }
+
+    deleted_rows = (
+        session.query(States).filter(batch_filter).delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s states", deleted_rows)
+
+    deleted_attributes_ids = _purge_unused_attributes(session, list(attributes_ids))
+    _LOGGER.debug("Deleted %s state attributes", len(deleted_attributes_ids))
+    return deleted_rows, deleted_attributes_ids
+
+
+def _purge_events(session, purge_before, batch_size):
+    """Delete the oldest batch of events.
+
+    Only called once all old states are gone, as they refer to their event.
+    """
+    batch = (
+        session.query(Events.event_id)
+        .filter(Events.time_fired < purge_before)
+        .order_by(Events.event_id)
+        .limit(batch_size)
+        .subquery()
+    )
+    max_event_id = session.query(func.max(batch.c.event_id)).scalar()
+    if max_event_id is None:
+        return 0
+
+    deleted_rows = (
+        session.query(Events)
+        .filter((Events.event_id <= max_event_id) & (Events.time_fired < purge_before))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s events", deleted_rows)
+    return deleted_rows
+
+
+def _purge_unused_attributes(session, attributes_ids):
+    """Delete the attributes no state refers to anymore and return their ids."""
+    deleted_ids = []
+    for idx in range(0, len(attributes_ids), MAX_IDS_PER_QUERY):
+        chunk = attributes_ids[idx : idx + MAX_IDS_PER_QUERY]
+        used_ids = {
+            attributes_id
+            for attributes_id, in session.query(distinct(States.attributes_id)).filter(
+                States.attributes_id.in_(chunk)
+            )
+        }
+        unused_ids = [
+            attributes_id for attributes_id in chunk if attributes_id not in used_ids
+        ]
+        if not unused_ids:
+            continue
+        session.query(StateAttributes).filter(
+            StateAttributes.attributes_id.in_(unused_ids)
+        ).delete(synchronize_session=False)
+        deleted_ids.extend(unused_ids)
+    return deleted_ids
@@ -117,7 +117,7 @@ class _TemplateAttribute:
     def async_template_startup(self) -> None:
         """Call from containing entity when added to hass."""
         result_info = async_track_template_result(
-            self._entity.hass, self.template, self._handle_result
+            self._entity.hass, self.template, self._handle_result, memoize=True
         )
 
         self.async_update = result_info.async_refresh
@@ -28,6 +28,7 @@ from typing import (
     Mapping,
     Optional,
     Set,
+    Tuple,
     TypeVar,
     Union,
     cast,
@@ -72,6 +73,7 @@ from homeassistant.exceptions import (
 from homeassistant.util import location, network
 from homeassistant.util.async_ import fire_coroutine_threadsafe, run_callback_threadsafe
 import homeassistant.util.dt as dt_util
+from homeassistant.util.read_only_dict import freeze
 from homeassistant.util.thread import fix_threading_exception_logging
 from homeassistant.util.timeout import TimeoutManager
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM, METRIC_SYSTEM, UnitSystem
@@ -148,6 +150,51 @@ def is_callback(func: Callable[..., Any]) -> bool:
     return getattr(func, "_hass_callback", False) is True
 
 
+class HassJobType(enum.Enum):
+    """Represent a job type."""
+
+    Coroutinefunction = 1
+    Callback = 2
+    Executor = 3
+
+
+class HassJob:
+    """Represent a job to be run later.
+
+    We check the callable type in advance
+    so we can avoid checking it every time
+    we run the job.
+    """
+
+    __slots__ = ("job_type", "target")
+
+    def __init__(self, target: Callable):
+        """Create a job object."""
+        if asyncio.iscoroutine(target):
+            raise ValueError("Coroutine not allowed to be passed to HassJob")
+
+        self.target = target
+        self.job_type = _get_callable_job_type(target)
+
+    def __repr__(self) -> str:
+        """Return the job."""
+        return f"<Job {self.job_type} {self.target}>"
+
+
+def _get_callable_job_type(target: Callable) -> HassJobType:
+    """Determine the job type from the callable."""
+    # Check for partials to properly determine if coroutine function
+    check_target = target
+    while isinstance(check_target, functools.partial):
+        check_target = check_target.func
+
+    if asyncio.iscoroutinefunction(check_target):
+        return HassJobType.Coroutinefunction
+    if is_callback(check_target):
+        return HassJobType.Callback
+    return HassJobType.Executor
+
+
 class CoreState(enum.Enum):
     """Represent the current state of Home Assistant."""
 
@@ -327,6 +374,33 @@ class HomeAssistant:
 
         return task
 
+    @callback
+    def async_add_hass_job(
+        self, hassjob: HassJob, *args: Any
+    ) -> Optional[asyncio.Future]:
+        """Add a HassJob from within the event loop.
+
+        This method must be run in the event loop.
+
+        hassjob: HassJob to call.
+        args: parameters for method to call.
+        """
+        if hassjob.job_type == HassJobType.Coroutinefunction:
+            task = self.loop.create_task(hassjob.target(*args))
+        elif hassjob.job_type == HassJobType.Callback:
+            self.loop.call_soon(hassjob.target, *args)
+            return None
+        else:
+            task = self.loop.run_in_executor(  # type: ignore
+                None, hassjob.target, *args
+            )
+
+        # If a task is scheduled
+        if self._track_task:
+            self._pending_tasks.append(task)
+
+        return task
+
     @callback
     def async_create_task(self, target: Coroutine) -> asyncio.tasks.Task:
         """Create a task from within the eventloop.
@@ -385,6 +459,20 @@ class HomeAssistant:
         else:
             self.async_add_job(target, *args)
 
+    @callback
+    def async_run_hass_job(self, hassjob: HassJob, *args: Any) -> None:
+        """Run a HassJob from within the event loop.
+
+        This method must be run in the event loop.
+
+        hassjob: HassJob
+        args: parameters for method to call.
+        """
+        if hassjob.job_type == HassJobType.Callback:
+            hassjob.target(*args)
+        else:
+            self.async_add_hass_job(hassjob, *args)
+
     def block_till_done(self) -> None:
         """Block until all pending work is done."""
         asyncio.run_coroutine_threadsafe(
@@ -586,7 +674,11 @@ class EventBus:
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
-        self._listeners: Dict[str, List[Callable]] = {}
+        self._listeners: Dict[str, List[HassJob]] = {}
+        # Jobs to run when an event type is fired, including the MATCH_ALL
+        # listeners. Rebuilt on the first fire after its listeners changed.
+        self._jobs: Dict[str, Tuple[HassJob, ...]] = {}
+        self._match_all_jobs: Optional[Tuple[HassJob, ...]] = None
         self._hass = hass
 
     @callback
@@ -626,23 +718,55 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        listeners = self._listeners.get(event_type, [])
-
-        # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
-        match_all_listeners = self._listeners.get(MATCH_ALL)
-        if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
-            listeners = match_all_listeners + listeners
+        jobs = self._jobs.get(event_type)
+        if jobs is None:
+            jobs = self._async_jobs(event_type)
 
         event = Event(event_type, event_data, origin, None, context)
 
         if event_type != EVENT_TIME_CHANGED:
             _LOGGER.debug("Bus:Handling %s", event)
 
-        if not listeners:
+        if not jobs:
             return
 
-        for func in listeners:
-            self._hass.async_add_job(func, event)
+        for job in jobs:
+            self._hass.async_add_hass_job(job, event)
+
+    @callback
+    def _async_jobs(self, event_type: str) -> Tuple[HassJob, ...]:
+        """Return the jobs to run when event_type is fired.
+
+        This method must be run in the event loop.
+        """
+        # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
+        if event_type == EVENT_HOMEASSISTANT_CLOSE:
+            match_all_jobs: Tuple[HassJob, ...] = ()
+        else:
+            if self._match_all_jobs is None:
+                self._match_all_jobs = tuple(self._listeners.get(MATCH_ALL, ()))
+            match_all_jobs = self._match_all_jobs
+
+        listeners = self._listeners.get(event_type)
+        if listeners is None:
+            # Only cache event types with listeners to not keep
+            # an entry for every event type that was ever fired
+            return match_all_jobs
+
+        jobs = self._jobs[event_type] = match_all_jobs + tuple(listeners)
+        return jobs
+
+    @callback
+    def _async_listeners_changed(self, event_type: str) -> None:
+        """Drop the cached jobs of an event type after its listeners changed.
+
+        This method must be run in the event loop.
+        """
+        if event_type == MATCH_ALL:
+            self._jobs.clear()
+            self._match_all_jobs = None
+        else:
+            self._jobs.pop(event_type, None)
 
     def listen(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
@@ -667,16 +791,25 @@ class EventBus:
         To listen to all events specify the constant ``MATCH_ALL``
         as event_type.
 
+        This method must be run in the event loop.
+        """
+        return self._async_listen_job(event_type, HassJob(listener))
+
+    @callback
+    def _async_listen_job(self, event_type: str, hassjob: HassJob) -> CALLBACK_TYPE:
+        """Listen for events of a specific type with a job.
+
         This method must be run in the event loop.
         """
         if event_type in self._listeners:
-            self._listeners[event_type].append(listener)
+            self._listeners[event_type].append(hassjob)
         else:
-            self._listeners[event_type] = [listener]
+            self._listeners[event_type] = [hassjob]
+        self._async_listeners_changed(event_type)
 
         def remove_listener() -> None:
             """Remove the listener."""
-            self._async_remove_listener(event_type, listener)
+            self._async_remove_listener(event_type, hassjob)
 
         return remove_listener
 
@@ -721,27 +854,29 @@ class EventBus:
             # multiple times as well.
             # This will make sure the second time it does nothing.
             setattr(onetime_listener, "run", True)
-            self._async_remove_listener(event_type, onetime_listener)
+            self._async_remove_listener(event_type, job)
             self._hass.async_run_job(listener, event)
 
-        return self.async_listen(event_type, onetime_listener)
+        job = HassJob(onetime_listener)
+        return self._async_listen_job(event_type, job)
 
     @callback
-    def _async_remove_listener(self, event_type: str, listener: Callable) -> None:
+    def _async_remove_listener(self, event_type: str, hassjob: HassJob) -> None:
         """Remove a listener of a specific event_type.
 
         This method must be run in the event loop.
         """
         try:
-            self._listeners[event_type].remove(listener)
+            self._listeners[event_type].remove(hassjob)
 
             # delete event_type list if empty
             if not self._listeners[event_type]:
                 self._listeners.pop(event_type)
+            self._async_listeners_changed(event_type)
         except (KeyError, ValueError):
             # KeyError is key event_type listener did not exist
             # ValueError if listener did not exist within event_type
-            _LOGGER.warning("Unable to remove unknown listener %s", listener)
+            _LOGGER.warning("Unable to remove unknown listener %s", hassjob.target)
 
 
 class State:
@@ -793,7 +928,7 @@ class State:
 
         self.entity_id = entity_id.lower()
         self.state = state
-        self.attributes = MappingProxyType(attributes or {})
+        self.attributes = freeze(attributes)
         self.last_updated = last_updated or dt_util.utcnow()
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
@@ -888,6 +1023,9 @@ class StateMachine:
     def __init__(self, bus: EventBus, loop: asyncio.events.AbstractEventLoop) -> None:
         """Initialize state machine."""
         self._states: Dict[str, State] = {}
+        # States by domain, each domain ordered by entity id once it is read
+        self._domain_index: Dict[str, Dict[str, State]] = {}
+        self._unsorted_domains: Set[str] = set()
         self._bus = bus
         self._loop = loop
 
@@ -904,31 +1042,81 @@ class StateMachine:
     ) -> List[str]:
         """List of entity ids that are being tracked.
 
+        The entity ids of each domain in domain_filter are sorted.
+
         This method must be run in the event loop.
         """
         if domain_filter is None:
-            return list(self._states.keys())
+            return list(self._states)
+
+        entity_ids: List[str] = []
+        for domain_index in self._async_domain_indexes(domain_filter):
+            entity_ids.extend(domain_index)
+        return entity_ids
+
+    @callback
+    def async_entity_ids_count(
+        self, domain_filter: Optional[Union[str, Iterable]] = None
+    ) -> int:
+        """Count the entity ids that are being tracked.
+
+        This method must be run in the event loop.
+        """
+        if domain_filter is None:
+            return len(self._states)
 
         if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
+            domain_filter = (domain_filter,)
 
-        return [
-            state.entity_id
-            for state in self._states.values()
-            if state.domain in domain_filter
-        ]
+        return sum(
+            len(self._domain_index.get(domain, ()))
+            for domain in {domain.lower() for domain in domain_filter}
+        )
 
-    def all(self) -> List[State]:
+    def all(self, domain_filter: Optional[Union[str, Iterable]] = None) -> List[State]:
         """Create a list of all states."""
-        return run_callback_threadsafe(self._loop, self.async_all).result()
+        return run_callback_threadsafe(
+            self._loop, self.async_all, domain_filter
+        ).result()
 
     @callback
-    def async_all(self) -> List[State]:
+    def async_all(
+        self, domain_filter: Optional[Union[str, Iterable]] = None
+    ) -> List[State]:
         """Create a list of all states.
 
+        The states of each domain in domain_filter are sorted by entity id.
+
         This method must be run in the event loop.
         """
-        return list(self._states.values())
+        if domain_filter is None:
+            return list(self._states.values())
+
+        states: List[State] = []
+        for domain_index in self._async_domain_indexes(domain_filter):
+            states.extend(domain_index.values())
+        return states
+
+    @callback
+    def _async_domain_indexes(
+        self, domain_filter: Union[str, Iterable]
+    ) -> List[Dict[str, State]]:
+        """Return the sorted indexes of the domains in domain_filter."""
+        if isinstance(domain_filter, str):
+            domain_filter = (domain_filter,)
+
+        indexes = []
+        for domain in dict.fromkeys(domain.lower() for domain in domain_filter):
+            domain_index = self._domain_index.get(domain)
+            if domain_index is None:
+                continue
+            if domain in self._unsorted_domains:
+                self._unsorted_domains.remove(domain)
+                domain_index = self._domain_index[domain] = dict(
+                    sorted(domain_index.items())
+                )
+            indexes.append(domain_index)
+        return indexes
 
     def get(self, entity_id: str) -> Optional[State]:
         """Retrieve state of entity_id or None if not found.
@@ -968,6 +1156,12 @@ class StateMachine:
         if old_state is None:
             return False
 
+        domain_index = self._domain_index[old_state.domain]
+        del domain_index[entity_id]
+        if not domain_index:
+            del self._domain_index[old_state.domain]
+            self._unsorted_domains.discard(old_state.domain)
+
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": None},
@@ -1029,8 +1223,12 @@ class StateMachine:
             last_changed = None
         else:
             same_state = old_state.state == new_state and not force_update
-            same_attr = old_state.attributes == MappingProxyType(attributes)
+            old_attributes = old_state.attributes
+            same_attr = old_attributes is attributes or old_attributes == attributes
             last_changed = old_state.last_changed if same_state else None
+            if same_attr:
+                # Share the read only attributes instead of copying them again
+                attributes = old_attributes
 
         if same_state and same_attr:
             return
@@ -1040,6 +1238,14 @@ class StateMachine:
 
         state = State(entity_id, new_state, attributes, last_changed, None, context)
         self._states[entity_id] = state
+        domain_index = self._domain_index.get(state.domain)
+        if domain_index is None:
+            self._domain_index[state.domain] = {entity_id: state}
+        else:
+            # Replacing a state keeps its position, only new entities unsort
+            if old_state is None:
+                self._unsorted_domains.add(state.domain)
+            domain_index[entity_id] = state
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": state},
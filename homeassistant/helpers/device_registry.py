@@ -32,6 +32,8 @@ CONNECTION_NETWORK_MAC = "mac"
 CONNECTION_UPNP = "upnp"
 CONNECTION_ZIGBEE = "zigbee"
 
+IDX_AREA = "area_id"
+IDX_CONFIG_ENTRIES = "config_entries"
 IDX_CONNECTIONS = "connections"
 IDX_IDENTIFIERS = "identifiers"
 REGISTERED_DEVICE = "registered"
@@ -103,7 +105,7 @@ class DeviceRegistry:
 
     devices: Dict[str, DeviceEntry]
     deleted_devices: Dict[str, DeletedDeviceEntry]
-    _devices_index: Dict[str, Dict[str, Dict[str, str]]]
+    _devices_index: Dict[str, Dict[str, Dict[Any, Any]]]
 
     def __init__(self, hass: HomeAssistantType) -> None:
         """Initialize the device registry."""
@@ -187,7 +189,12 @@ class DeviceRegistry:
     def _clear_index(self):
         """Clear the index."""
         self._devices_index = {
-            REGISTERED_DEVICE: {IDX_IDENTIFIERS: {}, IDX_CONNECTIONS: {}},
+            REGISTERED_DEVICE: {
+                IDX_IDENTIFIERS: {},
+                IDX_CONNECTIONS: {},
+                IDX_AREA: {},
+                IDX_CONFIG_ENTRIES: {},
+            },
             DELETED_DEVICE: {IDX_IDENTIFIERS: {}, IDX_CONNECTIONS: {}},
         }
 
@@ -495,8 +502,12 @@ class DeviceRegistry:
     @callback
     def async_clear_config_entry(self, config_entry_id: str) -> None:
         """Clear config entry from registry entries."""
-        for device in list(self.devices.values()):
-            self._async_update_device(device.id, remove_config_entry_id=config_entry_id)
+        for device_id in list(
+            self._devices_index[REGISTERED_DEVICE][IDX_CONFIG_ENTRIES].get(
+                config_entry_id, ()
+            )
+        ):
+            self._async_update_device(device_id, remove_config_entry_id=config_entry_id)
         for deleted_device in list(self.deleted_devices.values()):
             config_entries = deleted_device.config_entries
             if config_entry_id not in config_entries:
@@ -516,9 +527,10 @@ class DeviceRegistry:
     @callback
     def async_clear_area_id(self, area_id: str) -> None:
         """Clear area id from registry entries."""
-        for dev_id, device in self.devices.items():
-            if area_id == device.area_id:
-                self._async_update_device(dev_id, area_id=None)
+        for dev_id in list(
+            self._devices_index[REGISTERED_DEVICE][IDX_AREA].get(area_id, ())
+        ):
+            self._async_update_device(dev_id, area_id=None)
 
 
 @singleton(DATA_REGISTRY)
@@ -532,7 +544,9 @@ async def async_get_registry(hass: HomeAssistantType) -> DeviceRegistry:
 @callback
 def async_entries_for_area(registry: DeviceRegistry, area_id: str) -> List[DeviceEntry]:
     """Return entries that match an area."""
-    return [device for device in registry.devices.values() if device.area_id == area_id]
+    # pylint: disable=protected-access
+    device_ids = registry._devices_index[REGISTERED_DEVICE][IDX_AREA].get(area_id, ())
+    return [registry.devices[device_id] for device_id in device_ids]
 
 
 @callback
@@ -540,11 +554,11 @@ def async_entries_for_config_entry(
     registry: DeviceRegistry, config_entry_id: str
 ) -> List[DeviceEntry]:
     """Return entries that match a config entry."""
-    return [
-        device
-        for device in registry.devices.values()
-        if config_entry_id in device.config_entries
-    ]
+    # pylint: disable=protected-access
+    device_ids = registry._devices_index[REGISTERED_DEVICE][IDX_CONFIG_ENTRIES].get(
+        config_entry_id, ()
+    )
+    return [registry.devices[device_id] for device_id in device_ids]
 
 
 @callback
@@ -637,6 +651,15 @@ def _add_device_to_index(
         devices_index[IDX_IDENTIFIERS][identifier] = device.id
     for connection in device.connections:
         devices_index[IDX_CONNECTIONS][connection] = device.id
+    if isinstance(device, DeletedDeviceEntry):
+        return
+    # Devices by area and config entry, dicts are used as ordered sets
+    if device.area_id is not None:
+        devices_index[IDX_AREA].setdefault(device.area_id, {})[device.id] = None
+    for config_entry_id in device.config_entries:
+        devices_index[IDX_CONFIG_ENTRIES].setdefault(config_entry_id, {})[
+            device.id
+        ] = None
 
 
 def _remove_device_from_index(
@@ -649,3 +672,23 @@ def _remove_device_from_index(
     for connection in device.connections:
         if connection in devices_index[IDX_CONNECTIONS]:
             del devices_index[IDX_CONNECTIONS][connection]
+    if isinstance(device, DeletedDeviceEntry):
+        return
+    if device.area_id is not None:
+        _discard_from_bucket(devices_index[IDX_AREA], device.area_id, device.id)
+    for config_entry_id in device.config_entries:
+        _discard_from_bucket(
+            devices_index[IDX_CONFIG_ENTRIES], config_entry_id, device.id
+        )
+
+
+def _discard_from_bucket(
+    index: Dict[str, Dict[str, None]], key: str, item: str
+) -> None:
+    """Remove an item from the bucket of key, dropping the bucket when empty."""
+    bucket = index.get(key)
+    if bucket is None:
+        return
+    bucket.pop(item, None)
+    if not bucket:
+        del index[key]
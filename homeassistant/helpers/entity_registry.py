@@ -125,6 +125,9 @@ class EntityRegistry:
         self.hass = hass
         self.entities: Dict[str, RegistryEntry]
         self._index: Dict[Tuple[str, str, str], str] = {}
+        # Entity ids by device and config entry, dicts are used as ordered sets
+        self._device_index: Dict[str, Dict[str, None]] = {}
+        self._config_entry_index: Dict[str, Dict[str, None]] = {}
         self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
         self.hass.bus.async_listen(
             EVENT_DEVICE_REGISTRY_UPDATED, self.async_device_removed
@@ -477,11 +480,7 @@ class EntityRegistry:
     @callback
     def async_clear_config_entry(self, config_entry: str) -> None:
         """Clear config entry from registry entries."""
-        for entity_id in [
-            entity_id
-            for entity_id, entry in self.entities.items()
-            if config_entry == entry.config_entry_id
-        ]:
+        for entity_id in list(self._config_entry_index.get(config_entry, ())):
             self.async_remove(entity_id)
 
     def _register_entry(self, entry: RegistryEntry) -> None:
@@ -490,6 +489,12 @@ class EntityRegistry:
 
     def _add_index(self, entry: RegistryEntry) -> None:
         self._index[(entry.domain, entry.platform, entry.unique_id)] = entry.entity_id
+        if entry.device_id is not None:
+            self._device_index.setdefault(entry.device_id, {})[entry.entity_id] = None
+        if entry.config_entry_id is not None:
+            self._config_entry_index.setdefault(entry.config_entry_id, {})[
+                entry.entity_id
+            ] = None
 
     def _unregister_entry(self, entry: RegistryEntry) -> None:
         self._remove_index(entry)
@@ -497,9 +502,21 @@ class EntityRegistry:
 
     def _remove_index(self, entry: RegistryEntry) -> None:
         del self._index[(entry.domain, entry.platform, entry.unique_id)]
+        for index, key in (
+            (self._device_index, entry.device_id),
+            (self._config_entry_index, entry.config_entry_id),
+        ):
+            if key is None:
+                continue
+            bucket = index[key]
+            del bucket[entry.entity_id]
+            if not bucket:
+                del index[key]
 
     def _rebuild_index(self) -> None:
         self._index = {}
+        self._device_index = {}
+        self._config_entry_index = {}
         for entry in self.entities.values():
             self._add_index(entry)
 
@@ -517,9 +534,9 @@ def async_entries_for_device(
     registry: EntityRegistry, device_id: str
 ) -> List[RegistryEntry]:
     """Return entries that match a device."""
-    return [
-        entry for entry in registry.entities.values() if entry.device_id == device_id
-    ]
+    # pylint: disable=protected-access
+    entity_ids = registry._device_index.get(device_id, ())
+    return [registry.entities[entity_id] for entity_id in entity_ids]
 
 
 @callback
@@ -527,11 +544,9 @@ def async_entries_for_config_entry(
     registry: EntityRegistry, config_entry_id: str
 ) -> List[RegistryEntry]:
     """Return entries that match a config entry."""
-    return [
-        entry
-        for entry in registry.entities.values()
-        if entry.config_entry_id == config_entry_id
-    ]
+    # pylint: disable=protected-access
+    entity_ids = registry._config_entry_index.get(config_entry_id, ())
+    return [registry.entities[entity_id] for entity_id in entity_ids]
 
 
 async def _async_migrate(entities: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
@@ -1,5 +1,6 @@
 """Helper class to implement include/exclude of entities and domains."""
 import fnmatch
+from functools import lru_cache
 import re
 from typing import Callable, Dict, List, Pattern
 
@@ -18,6 +19,9 @@ CONF_EXCLUDE_ENTITIES = "exclude_entities"
 
 CONF_ENTITY_GLOBS = "entity_globs"
 
+# Number of entity ids a filter remembers its result for
+ENTITY_FILTER_CACHE_SIZE = 16384
+
 
 def convert_filter(config: Dict[str, List[str]]) -> Callable[[str], bool]:
     """Convert the filter schema into a filter."""
@@ -125,6 +129,32 @@ def generate_filter(
     exclude_entities: List[str],
     include_entity_globs: List[str] = [],
     exclude_entity_globs: List[str] = [],
+) -> Callable[[str], bool]:
+    """Return a function that will filter entities based on the args.
+
+    The result for an entity_id never changes, so it is remembered for the
+    most recently tested entity ids.
+    """
+    entity_filter = _generate_filter(
+        include_domains,
+        include_entities,
+        exclude_domains,
+        exclude_entities,
+        include_entity_globs,
+        exclude_entity_globs,
+    )
+    if getattr(entity_filter, "pass_all", False):
+        return entity_filter
+    return lru_cache(maxsize=ENTITY_FILTER_CACHE_SIZE)(entity_filter)
+
+
+def _generate_filter(
+    include_domains: List[str],
+    include_entities: List[str],
+    exclude_domains: List[str],
+    exclude_entities: List[str],
+    include_entity_globs: List[str],
+    exclude_entity_globs: List[str],
 ) -> Callable[[str], bool]:
     """Return a function that will filter entities based on the args."""
     include_d = set(include_domains)
@@ -157,7 +187,13 @@ def generate_filter(
 
     # Case 1 - no includes or excludes - pass all entities
     if not have_include and not have_exclude:
-        return lambda entity_id: True
+
+        def entity_filter_1(entity_id: str) -> bool:
+            """Return filter function for case 1."""
+            return True
+
+        setattr(entity_filter_1, "pass_all", True)
+        return entity_filter_1
 
     # Case 2 - includes, no excludes - only include specified entities
     if have_include and not have_exclude:
@@ -9,6 +9,7 @@ from typing import Any, Awaitable, Callable, Iterable, Optional, Union
 import attr
 
 from homeassistant.const import (
+    ATTR_ENTITY_ID,
     ATTR_NOW,
     EVENT_CORE_CONFIG_UPDATE,
     EVENT_STATE_CHANGED,
@@ -20,6 +21,7 @@ from homeassistant.const import (
 from homeassistant.core import (
     CALLBACK_TYPE,
     Event,
+    HassJob,
     HomeAssistant,
     State,
     callback,
@@ -39,6 +41,9 @@ MAX_TIME_TRACKING_ERROR = 0.001
 TRACK_STATE_CHANGE_CALLBACKS = "track_state_change_callbacks"
 TRACK_STATE_CHANGE_LISTENER = "track_state_change_listener"
 
+TRACK_FILTERED_STATE_CHANGE_CALLBACKS = "track_filtered_state_change_callbacks"
+TRACK_FILTERED_STATE_CHANGE_LISTENER = "track_filtered_state_change_listener"
+
 TRACK_STATE_ADDED_DOMAIN_CALLBACKS = "track_state_added_domain_callbacks"
 TRACK_STATE_ADDED_DOMAIN_LISTENER = "track_state_added_domain_listener"
 
@@ -235,6 +240,61 @@ def _async_remove_indexed_listeners(
         del hass.data[listener_key]
 
 
+@callback
+@bind_hass
+def async_track_filtered_state_change_event(
+    hass: HomeAssistant,
+    entity_filter: Callable[[str], bool],
+    action: Callable[[Event], Any],
+) -> Callable[[], None]:
+    """Track state change events of the entities that pass entity_filter.
+
+    All filtered trackers share a single state changed listener, which only
+    creates a job for the trackers whose filter includes the entity. Filters
+    from the entityfilter helper remember their result per entity_id, so
+    the filter is evaluated once for each entity.
+    """
+    filtered_callbacks = hass.data.setdefault(TRACK_FILTERED_STATE_CHANGE_CALLBACKS, [])
+
+    if TRACK_FILTERED_STATE_CHANGE_LISTENER not in hass.data:
+
+        @callback
+        def _async_filtered_state_change_dispatcher(event: Event) -> None:
+            """Dispatch state changes to the trackers including the entity."""
+            entity_id = event.data["entity_id"]
+
+            for tracked_filter, job in filtered_callbacks[:]:
+                if not tracked_filter(entity_id):
+                    continue
+                try:
+                    hass.async_run_hass_job(job, event)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception(
+                        "Error while processing state changed for %s", entity_id
+                    )
+
+        hass.data[TRACK_FILTERED_STATE_CHANGE_LISTENER] = hass.bus.async_listen(
+            EVENT_STATE_CHANGED, _async_filtered_state_change_dispatcher
+        )
+
+    tracker = (entity_filter, HassJob(action))
+    filtered_callbacks.append(tracker)
+
+    @callback
+    def remove_listener() -> None:
+        """Remove filtered state change listener."""
+        filtered_callbacks.remove(tracker)
+        if not filtered_callbacks:
+            hass.data.pop(TRACK_FILTERED_STATE_CHANGE_LISTENER)()
+
+    return remove_listener
+
+
+track_filtered_state_change_event = threaded_listener_factory(
+    async_track_filtered_state_change_event
+)
+
+
 @bind_hass
 def async_track_entity_registry_updated_event(
     hass: HomeAssistant,
@@ -443,6 +503,8 @@ class _TrackTemplateResultInfo:
         template: Template,
         action: Callable,
         variables: Optional[TemplateVarsType],
+        memoize: bool = False,
+        rate_limit: Optional[timedelta] = None,
     ):
         """Handle removal / refresh of tracker init."""
         self.hass = hass
@@ -450,6 +512,11 @@ class _TrackTemplateResultInfo:
         self._template.hass = hass
         self._action = action
         self._variables = variables
+        self._memoize = memoize
+        self._rate_limit = rate_limit
+        self._last_render: Optional[float] = None
+        self._deferred_event: Optional[Event] = None
+        self._cancel_deferred_refresh: Optional[CALLBACK_TYPE] = None
         self._last_result: Optional[Union[str, TemplateError]] = None
         self._all_listener: Optional[Callable] = None
         self._domains_listener: Optional[Callable] = None
@@ -459,7 +526,8 @@ class _TrackTemplateResultInfo:
 
     def async_setup(self) -> None:
         """Activation of template tracking."""
-        self._info = self._template.async_render_to_info(self._variables)
+        self._info = self._async_render_to_info()
+        self._last_render = self.hass.loop.time()
         if self._info.exception:
             _LOGGER.error(
                 "Error while processing template: %s",
@@ -469,6 +537,12 @@ class _TrackTemplateResultInfo:
         self._create_listeners()
         self._last_info = self._info
 
+    @callback
+    def _async_render_to_info(self) -> RenderInfo:
+        if self._memoize:
+            return self._template.async_render_to_info_memoized(self._variables)
+        return self._template.async_render_to_info(self._variables)
+
     @property
     def _needs_all_listener(self) -> bool:
         assert self._info
@@ -594,6 +668,15 @@ class _TrackTemplateResultInfo:
         self._cancel_all_listener()
         self._cancel_domains_listener()
         self._cancel_entities_listener()
+        self._cancel_deferred()
+
+    @callback
+    def _cancel_deferred(self) -> None:
+        self._deferred_event = None
+        if self._cancel_deferred_refresh is None:
+            return
+        self._cancel_deferred_refresh()
+        self._cancel_deferred_refresh = None
 
     @callback
     def async_refresh(self, variables: Any = _UNCHANGED) -> None:
@@ -603,8 +686,59 @@ class _TrackTemplateResultInfo:
         self._refresh(None)
 
     @callback
-    def _refresh(self, event: Optional[Event]) -> None:
-        self._info = self._template.async_render_to_info(self._variables)
+    def _rate_limit_for_event(self, event: Event) -> Optional[timedelta]:
+        assert self._info
+
+        if self._rate_limit is None:
+            return None
+
+        # Entities referenced by entity id always render right away
+        if event.data.get(ATTR_ENTITY_ID) in self._info.entities:
+            return None
+
+        if not (self._info.all_states or self._info.domains):
+            return None
+
+        return self._rate_limit
+
+    @callback
+    def _defer_refresh(self, event: Event) -> bool:
+        """Defer the refresh when the template rendered too recently.
+
+        Events that arrive while a refresh is deferred are coalesced into it.
+        """
+        rate_limit = self._rate_limit_for_event(event)
+        if rate_limit is None or self._last_render is None:
+            return False
+
+        if self._cancel_deferred_refresh is not None:
+            self._deferred_event = event
+            return True
+
+        delay = self._last_render + rate_limit.total_seconds() - self.hass.loop.time()
+        if delay <= 0:
+            return False
+
+        self._deferred_event = event
+        self._cancel_deferred_refresh = async_call_later(
+            self.hass, delay, self._refresh_deferred
+        )
+        return True
+
+    @callback
+    def _refresh_deferred(self, _now: datetime) -> None:
+        event = self._deferred_event
+        self._cancel_deferred_refresh = None
+        self._refresh(event, rate_limited=False)
+
+    @callback
+    def _refresh(self, event: Optional[Event], rate_limited: bool = True) -> None:
+        if rate_limited and event is not None and self._defer_refresh(event):
+            return
+
+        self._cancel_deferred()
+        self._info = self._async_render_to_info()
+        self._last_render = self.hass.loop.time()
         self._update_listeners()
         self._last_info = self._info
 
@@ -656,6 +790,8 @@ def async_track_template_result(
     template: Template,
     action: TrackTemplateResultListener,
     variables: Optional[TemplateVarsType] = None,
+    memoize: bool = False,
+    rate_limit: Optional[timedelta] = None,
 ) -> _TrackTemplateResultInfo:
     """Add a listener that fires when a the result of a template changes.
 
@@ -666,6 +802,10 @@ def async_track_template_result(
     evaluation is different from the previous run, the listener is passed
     the result.
 
+    Changes of entities the template only saw by iterating all states or a
+    domain can be rate limited, changes that happen while a render is
+    deferred are handled by that single render.
+
     If the template results in an TemplateError, this will be returned to
     the listener the first time this happens but not for subsequent errors.
     Once the template returns to a non-error condition the result is sent
@@ -681,13 +821,23 @@ def async_track_template_result(
         Callable to call with results.
     variables
         Variables to pass to the template.
+    memoize
+        Skip renders while none of the states the last render depended on
+        changed. Renders that use all states, the time or random values are
+        never skipped.
+    rate_limit
+        Shortest time between renders for changes of entities that the
+        template did not reference by entity id. None renders on every
+        change.
 
     Returns
     -------
     Info object used to unregister the listener, and refresh the template.
 
     """
-    tracker = _TrackTemplateResultInfo(hass, template, action, variables)
+    tracker = _TrackTemplateResultInfo(
+        hass, template, action, variables, memoize, rate_limit
+    )
     tracker.async_setup()
     return tracker
 
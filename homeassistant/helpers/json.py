@@ -2,11 +2,27 @@
 from datetime import datetime
 import json
 import logging
-from typing import Any
+from typing import Any, Optional, Type
+
+from homeassistant.util import json as util_json
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def json_encoder_default(obj: Any) -> Any:
+    """Convert Home Assistant objects.
+
+    Raise TypeError for other objects.
+    """
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, set):
+        return list(obj)
+    if hasattr(obj, "as_dict"):
+        return obj.as_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
 class JSONEncoder(json.JSONEncoder):
     """JSONEncoder that supports Home Assistant objects."""
 
@@ -15,11 +31,28 @@ class JSONEncoder(json.JSONEncoder):
 
         Hand other objects to the original method.
         """
-        if isinstance(o, datetime):
-            return o.isoformat()
-        if isinstance(o, set):
-            return list(o)
-        if hasattr(o, "as_dict"):
-            return o.as_dict()
-
-        return json.JSONEncoder.default(self, o)
+        try:
+            return json_encoder_default(o)
+        except TypeError:
+            return json.JSONEncoder.default(self, o)
+
+
+def json_dumps(
+    data: Any,
+    *,
+    encoder: Optional[Type[json.JSONEncoder]] = JSONEncoder,
+    pretty: bool = False,
+    allow_nan: bool = True,
+) -> str:
+    """Serialize data to a JSON string, converting Home Assistant objects.
+
+    The Home Assistant encoder is handed to the dumper as json_encoder_default
+    so orjson can be used for it.
+    """
+    if encoder is JSONEncoder:
+        return util_json.json_dumps(
+            data, default=json_encoder_default, pretty=pretty, allow_nan=allow_nan
+        )
+    return util_json.json_dumps(
+        data, encoder=encoder, pretty=pretty, allow_nan=allow_nan
+    )
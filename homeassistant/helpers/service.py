@@ -380,13 +380,7 @@ async def entity_service_call(hass, platforms, func, call, required_features=Non
             if target_all_entities:
                 entity_candidates.extend(platform.entities.values())
             else:
-                entity_candidates.extend(
-                    [
-                        entity
-                        for entity in platform.entities.values()
-                        if entity.entity_id in entity_ids
-                    ]
-                )
+                entity_candidates.extend(_platform_entities(platform, entity_ids))
 
     elif target_all_entities:
         # If we target all entities, we will select all entities the user
@@ -403,10 +397,7 @@ async def entity_service_call(hass, platforms, func, call, required_features=Non
     else:
         for platform in platforms:
             platform_entities = []
-            for entity in platform.entities.values():
-
-                if entity.entity_id not in entity_ids:
-                    continue
+            for entity in _platform_entities(platform, entity_ids):
 
                 if not entity_perms(entity.entity_id, POLICY_CONTROL):
                     raise Unauthorized(
@@ -476,6 +467,20 @@ async def entity_service_call(hass, platforms, func, call, required_features=Non
             future.result()  # pop exception if have
 
 
+def _platform_entities(platform, entity_ids):
+    """Return the entities of a platform with an entity ID in entity_ids.
+
+    Platforms map entity IDs to their entities, so targeting a few entities
+    does not have to look at every entity of the platform.
+    """
+    entities = platform.entities
+    if len(entity_ids) > len(entities):
+        return [
+            entity for entity_id, entity in entities.items() if entity_id in entity_ids
+        ]
+    return [entities[entity_id] for entity_id in entity_ids if entity_id in entities]
+
+
 async def _handle_entity_call(hass, entity, func, data, context):
     """Handle calling service method."""
     entity.async_set_context(context)
@@ -1,9 +1,13 @@
 """Helper to help store data."""
 import asyncio
+import hashlib
 from json import JSONEncoder
 import logging
 import os
-from typing import Any, Callable, Dict, List, Optional, Type, Union
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+
+import attr
 
 from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
 from homeassistant.core import CALLBACK_TYPE, CoreState, HomeAssistant, callback
@@ -15,9 +19,114 @@ from homeassistant.util import json as json_util
 # mypy: no-check-untyped-defs
 
 STORAGE_DIR = ".storage"
+DATA_STORAGE_WRITER = "storage_writer"
 _LOGGER = logging.getLogger(__name__)
 
 
+@attr.s(slots=True)
+class StoreWriteStats:
+    """Statistics about the writes of a store."""
+
+    writes: int = attr.ib(default=0)
+    skipped: int = attr.ib(default=0)
+    bytes_written: int = attr.ib(default=0)
+    duration: float = attr.ib(default=0.0)
+
+
+class _StorageWriter:
+    """Write the pending data of all stores in one executor job.
+
+    Writes requested while a batch is being written are collected and
+    written together in the next batch.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the storage writer."""
+        self.hass = hass
+        self.stats: Dict[str, StoreWriteStats] = {}
+        self._pending: List[Tuple["Store", Dict, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    @callback
+    def async_write(self, store: "Store", data: Dict) -> asyncio.Future:
+        """Queue data of a store to be written by the next batch."""
+        future = self.hass.loop.create_future()
+        self._pending.append((store, data, future))
+        if self._flush_task is None:
+            self._flush_task = self.hass.async_create_task(self._async_flush())
+        return future
+
+    async def _async_flush(self) -> None:
+        """Write batches until no writes are pending."""
+        # Let the stores saving in this iteration of the loop join the batch
+        await asyncio.sleep(0)
+        try:
+            while self._pending:
+                batch, self._pending = self._pending, []
+                results = await self.hass.async_add_executor_job(
+                    self._write_batch, batch
+                )
+                for (store, _, future), (written, duration, err) in zip(batch, results):
+                    if future.cancelled():
+                        continue
+                    if err is not None:
+                        future.set_exception(err)
+                        continue
+                    self._async_record_write(store.key, written, duration)
+                    future.set_result(None)
+        finally:
+            self._flush_task = None
+
+    @staticmethod
+    def _write_batch(
+        batch: List[Tuple["Store", Dict, asyncio.Future]]
+    ) -> List[Tuple[Optional[int], float, Optional[Exception]]]:
+        """Write the data of a batch of stores."""
+        results: List[Tuple[Optional[int], float, Optional[Exception]]] = []
+        for store, data, _ in batch:
+            start = time.monotonic()
+            try:
+                # pylint: disable=protected-access
+                written = store._write_data(store.path, data)
+            except Exception as err:  # pylint: disable=broad-except
+                results.append((None, 0.0, err))
+            else:
+                results.append((written, time.monotonic() - start, None))
+        return results
+
+    @callback
+    def _async_record_write(
+        self, key: str, written: Optional[int], duration: float
+    ) -> None:
+        """Record and report a write of a store."""
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = StoreWriteStats()
+        stats.duration += duration
+        if written is None:
+            stats.skipped += 1
+            _LOGGER.debug("Skipped writing unchanged data for %s", key)
+            return
+        stats.writes += 1
+        stats.bytes_written += written
+        _LOGGER.debug("Wrote %s bytes for %s in %.3fs", written, key, duration)
+
+
+@callback
+def _async_get_writer(hass: HomeAssistant) -> _StorageWriter:
+    """Return the storage writer."""
+    writer = hass.data.get(DATA_STORAGE_WRITER)
+    if writer is None:
+        writer = hass.data[DATA_STORAGE_WRITER] = _StorageWriter(hass)
+    return writer
+
+
+@callback
+def async_get_write_stats(hass: HomeAssistant) -> Dict[str, StoreWriteStats]:
+    """Return the write statistics of the stores by key."""
+    return dict(_async_get_writer(hass).stats)
+
+
 @bind_hass
 async def async_migrator(
     hass,
@@ -84,6 +193,7 @@ class Store:
         self._write_lock = asyncio.Lock()
         self._load_task: Optional[asyncio.Future] = None
         self._encoder = encoder
+        self._written_hash: Optional[bytes] = None
 
     @property
     def path(self):
@@ -218,19 +328,29 @@ class Store:
             self._data = None
 
             try:
-                await self.hass.async_add_executor_job(
-                    self._write_data, self.path, data
-                )
+                await _async_get_writer(self.hass).async_write(self, data)
             except (json_util.SerializationError, json_util.WriteError) as err:
                 _LOGGER.error("Error writing config for %s: %s", self.key, err)
 
-    def _write_data(self, path: str, data: Dict) -> None:
-        """Write the data."""
+    def _write_data(self, path: str, data: Dict) -> Optional[int]:
+        """Write the data.
+
+        Returns the number of bytes written or None if the file already
+        holds the same data.
+        """
+        json_data = json_util.serialize_json(path, data, encoder=self._encoder)
+        content = json_data.encode("utf-8")
+        content_hash = hashlib.sha256(content).digest()
+        if content_hash == self._written_hash and os.path.exists(path):
+            return None
+
         if not os.path.isdir(os.path.dirname(path)):
             os.makedirs(os.path.dirname(path))
 
         _LOGGER.debug("Writing data for %s", self.key)
-        json_util.save_json(path, data, self._private, encoder=self._encoder)
+        json_util.write_json(path, json_data, self._private)
+        self._written_hash = content_hash
+        return len(content)
 
     async def _async_migrate_func(self, old_version, old_data):
         """Migrate to the new version."""
@@ -238,6 +358,7 @@ class Store:
 
     async def async_remove(self):
         """Remove all data."""
+        self._written_hash = None
         try:
             await self.hass.async_add_executor_job(os.unlink, self.path)
         except FileNotFoundError:
@@ -8,7 +8,7 @@ import logging
 import math
 import random
 import re
-from typing import Any, Iterable, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Union
 from urllib.parse import urlencode as urllib_urlencode
 import weakref
 
@@ -73,6 +73,16 @@ def attach(hass: HomeAssistantType, obj: Any) -> None:
         obj.hass = hass
 
 
+@callback
+@bind_hass
+def async_get_cache_stats(hass: HomeAssistantType) -> Dict[str, int]:
+    """Return the hits and misses of the template caches of hass."""
+    env = hass.data.get(_ENVIRONMENT)
+    if env is None:
+        env = hass.data[_ENVIRONMENT] = TemplateEnvironment(hass)
+    return env.cache_stats()
+
+
 def render_complex(value: Any, variables: TemplateVarsType = None) -> Any:
     """Recursive template creator helper function."""
     if isinstance(value, list):
@@ -162,6 +172,7 @@ class RenderInfo:
         self.is_static = False
         self.exception = None
         self.all_states = False
+        self.is_volatile = False
         self.domains = set()
         self.entities = set()
 
@@ -182,6 +193,11 @@ class RenderInfo:
             raise self.exception
         return self._result
 
+    @property
+    def can_memoize(self) -> bool:
+        """Return if the result only depends on the tracked states."""
+        return not (self.all_states or self.is_volatile or self.exception)
+
     def _freeze_static(self) -> None:
         self.is_static = True
         self.entities = frozenset(self.entities)
@@ -212,6 +228,7 @@ class Template:
         self.template: str = template
         self._compiled_code = None
         self._compiled = None
+        self._memo = None
         self.hass = hass
         self.is_static = not is_template_string(template)
 
@@ -230,6 +247,7 @@ class Template:
             return
 
         try:
+            # Shared by all templates with the same source while in use
             self._compiled_code = self._env.compile(self.template)
         except jinja2.exceptions.TemplateSyntaxError as err:
             raise TemplateError(err) from err
@@ -299,6 +317,47 @@ class Template:
         render_info._freeze()
         return render_info
 
+    @callback
+    def async_render_to_info_memoized(
+        self, variables: TemplateVarsType = None
+    ) -> RenderInfo:
+        """Render the template and collect an entity filter.
+
+        Returns the previous render info as is when it was rendered with
+        equal variables and none of the states it tracked changed since.
+        """
+        env = self._env
+        if self._memo is not None:
+            last_variables, last_info, last_states = self._memo
+            states = self._async_tracked_states(last_info)
+            if (
+                last_variables == variables
+                and len(states) == len(last_states)
+                and all(new is old for new, old in zip(states, last_states))
+            ):
+                env.render_hits += 1
+                return last_info
+
+        env.render_misses += 1
+        render_info = self.async_render_to_info(variables)
+        if render_info.can_memoize:
+            self._memo = (
+                None if variables is None else dict(variables),
+                render_info,
+                self._async_tracked_states(render_info),
+            )
+        else:
+            self._memo = None
+        return render_info
+
+    @callback
+    def _async_tracked_states(self, render_info: RenderInfo) -> List[Optional[State]]:
+        """Return the current states a render depends on."""
+        states = self.hass.states
+        return [
+            states.get(entity_id) for entity_id in render_info.entities
+        ] + states.async_all(render_info.domains)
+
     def render_with_possible_json_value(self, value, error_value=_SENTINEL):
         """Render template with value exposed.
 
@@ -357,11 +416,11 @@ class Template:
         assert self.hass is not None, "hass variable not set on template"
 
         env = self._env
+        if self._compiled_code not in env.compiled_cache:
+            # Validated before hass was set, compile for the environment of hass
+            self._compiled_code = env.compile(self.template)
 
-        self._compiled = jinja2.Template.from_code(
-            env, self._compiled_code, env.globals, None
-        )
-
+        self._compiled = env.compiled_template(self._compiled_code)
         return self._compiled
 
     def __eq__(self, other):
@@ -421,7 +480,7 @@ class AllStates:
     def __len__(self) -> int:
         """Return number of states."""
         self._collect_all()
-        return len(self._hass.states.async_entity_ids())
+        return self._hass.states.async_entity_ids_count()
 
     def __call__(self, entity_id):
         """Return the states."""
@@ -457,20 +516,14 @@ class DomainStates:
         """Return the iteration over all the states."""
         self._collect_domain()
         return iter(
-            sorted(
-                (
-                    _wrap_state(self._hass, state)
-                    for state in self._hass.states.async_all()
-                    if state.domain == self._domain
-                ),
-                key=lambda state: state.entity_id,
-            )
+            _wrap_state(self._hass, state)
+            for state in self._hass.states.async_all(self._domain)
         )
 
     def __len__(self) -> int:
         """Return number of states."""
         self._collect_domain()
-        return len(self._hass.states.async_entity_ids(self._domain))
+        return self._hass.states.async_entity_ids_count(self._domain)
 
     def __repr__(self) -> str:
         """Representation of Domain States."""
@@ -996,14 +1049,23 @@ def to_json(value):
     return json.dumps(value)
 
 
-@contextfilter
-def random_every_time(context, values):
-    """Choose a random value.
+def volatilefunction(func):
+    """Wrap function that can return a new result without state changes.
 
-    Unlike Jinja's random filter,
-    this is context-dependent to avoid caching the chosen value.
+    Renders using it are marked volatile so their result is not reused.
+    It is context-dependent to avoid caching the result at compile time.
     """
-    return random.choice(values)
+
+    @wraps(func)
+    def wrapper(context, *args, **kwargs):
+        hass = context.environment.hass
+        if hass is not None:
+            render_info = hass.data.get(_RENDER_INFO)
+            if render_info is not None:
+                render_info.is_volatile = True
+        return func(*args, **kwargs)
+
+    return contextfunction(wrapper)
 
 
 def relative_time(value):
@@ -1040,6 +1102,12 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         super().__init__()
         self.hass = hass
         self.template_cache = weakref.WeakValueDictionary()
+        # Templates bound to this environment, kept while their code is used
+        self.compiled_cache = weakref.WeakKeyDictionary()
+        self.compiled_hits = 0
+        self.compiled_misses = 0
+        self.render_hits = 0
+        self.render_misses = 0
         self.filters["round"] = forgiving_round
         self.filters["multiply"] = multiply
         self.filters["log"] = logarithm
@@ -1060,7 +1128,7 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         self.filters["is_defined"] = fail_when_undefined
         self.filters["max"] = max
         self.filters["min"] = min
-        self.filters["random"] = random_every_time
+        self.filters["random"] = contextfilter(volatilefunction(random.choice))
         self.filters["base64_encode"] = base64_encode
         self.filters["base64_decode"] = base64_decode
         self.filters["ordinal"] = ordinal
@@ -1084,10 +1152,10 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         self.globals["atan"] = arc_tangent
         self.globals["atan2"] = arc_tangent2
         self.globals["float"] = forgiving_float
-        self.globals["now"] = dt_util.now
-        self.globals["utcnow"] = dt_util.utcnow
+        self.globals["now"] = volatilefunction(dt_util.now)
+        self.globals["utcnow"] = volatilefunction(dt_util.utcnow)
         self.globals["as_timestamp"] = forgiving_as_timestamp
-        self.globals["relative_time"] = relative_time
+        self.globals["relative_time"] = volatilefunction(relative_time)
         self.globals["strptime"] = strptime
         self.globals["urlencode"] = urlencode
         if hass is None:
@@ -1144,5 +1212,31 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
 
         return cached
 
+    def compiled_template(self, code):
+        """Return the compiled code bound to this environment.
+
+        Templates with the same source share the code, so they are bound once.
+        """
+        compiled = self.compiled_cache.get(code)
+        if compiled is not None:
+            self.compiled_hits += 1
+            return compiled
+
+        self.compiled_misses += 1
+        compiled = self.compiled_cache[code] = jinja2.Template.from_code(
+            self, code, self.globals, None
+        )
+        return compiled
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Return the hits and misses of the template caches."""
+        return {
+            "compiled_hits": self.compiled_hits,
+            "compiled_misses": self.compiled_misses,
+            "compiled_size": len(self.compiled_cache),
+            "render_hits": self.render_hits,
+            "render_misses": self.render_misses,
+        }
+
 
 _NO_HASS_ENV = TemplateEnvironment(None)
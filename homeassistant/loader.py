@@ -11,12 +11,14 @@ import json
 import logging
 import pathlib
 import sys
+from timeit import default_timer as timer
 from types import ModuleType
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
     Dict,
+    Iterable,
     List,
     Optional,
     Set,
@@ -25,6 +27,7 @@ from typing import (
     cast,
 )
 
+from homeassistant.const import __version__
 from homeassistant.generated.ssdp import SSDP
 from homeassistant.generated.zeroconf import HOMEKIT, ZEROCONF
 
@@ -39,6 +42,12 @@ _LOGGER = logging.getLogger(__name__)
 DATA_COMPONENTS = "components"
 DATA_INTEGRATIONS = "integrations"
 DATA_CUSTOM_COMPONENTS = "custom_components"
+DATA_IMPORT_TIMES = "integration_import_times"
+DATA_PRELOAD = "integration_preload"
+DATA_MANIFEST_CACHE = "integration_manifest_cache"
+MANIFEST_CACHE_STORAGE_KEY = "core.integration_manifests"
+MANIFEST_CACHE_STORAGE_VERSION = 1
+MANIFEST_CACHE_SAVE_DELAY = 10
 PACKAGE_CUSTOM_COMPONENTS = "custom_components"
 PACKAGE_BUILTIN = "homeassistant.components"
 CUSTOM_WARNING = (
@@ -62,6 +71,89 @@ def manifest_from_legacy_module(domain: str, module: ModuleType) -> Dict:
     }
 
 
+class ManifestCache:
+    """Parsed manifest.json files that are stored to skip parsing them."""
+
+    def __init__(self, store: Any, manifests: Dict[str, Dict[str, Any]]) -> None:
+        """Initialize the manifest cache."""
+        self._store = store
+        self._manifests = manifests
+        self._changed = False
+
+    def load(self, manifest_path: pathlib.Path) -> Dict[str, Any]:
+        """Return the manifest, parsing the file only when it changed.
+
+        Raises like reading and parsing the file. Safe to call from threads.
+        """
+        stat = manifest_path.stat()
+        key = str(manifest_path)
+        entry = self._manifests.get(key)
+        if (
+            entry is None
+            or entry["mtime"] != stat.st_mtime_ns
+            or entry["size"] != stat.st_size
+        ):
+            entry = {
+                "mtime": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "manifest": json.loads(manifest_path.read_text()),
+            }
+            self._manifests[key] = entry
+            self._changed = True
+        # Integrations add keys to their manifest
+        return dict(entry["manifest"])
+
+    def async_schedule_save(self) -> None:
+        """Store the manifests if any was parsed.
+
+        This method must be run in the event loop.
+        """
+        if not self._changed:
+            return
+        self._changed = False
+        self._store.async_delay_save(self._data_to_save, MANIFEST_CACHE_SAVE_DELAY)
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return the data to store."""
+        return {"ha_version": __version__, "manifests": dict(self._manifests)}
+
+
+async def _async_get_manifest_cache(
+    hass: "HomeAssistant",
+) -> Optional[ManifestCache]:
+    """Return the manifest cache, loading it from storage on first use."""
+    cache_or_evt = hass.data.get(DATA_MANIFEST_CACHE)
+
+    if isinstance(cache_or_evt, asyncio.Event):
+        await cache_or_evt.wait()
+        return cast(Optional[ManifestCache], hass.data.get(DATA_MANIFEST_CACHE))
+
+    if cache_or_evt is not None or hass.config.config_dir is None:
+        return cast(Optional[ManifestCache], cache_or_evt)
+
+    evt = hass.data[DATA_MANIFEST_CACHE] = asyncio.Event()
+
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.exceptions import HomeAssistantError
+    from homeassistant.helpers.storage import Store
+
+    store = Store(hass, MANIFEST_CACHE_STORAGE_VERSION, MANIFEST_CACHE_STORAGE_KEY)
+    try:
+        data = await store.async_load()
+    except HomeAssistantError as err:
+        _LOGGER.warning("Unable to load the integration manifest cache: %s", err)
+        data = None
+
+    # Built-in manifests only change with the version of Home Assistant
+    manifests = {}
+    if isinstance(data, dict) and data.get("ha_version") == __version__:
+        manifests = data["manifests"]
+
+    cache = hass.data[DATA_MANIFEST_CACHE] = ManifestCache(store, manifests)
+    evt.set()
+    return cache
+
+
 async def _async_get_custom_components(
     hass: "HomeAssistant",
 ) -> Dict[str, "Integration"]:
@@ -86,15 +178,22 @@ async def _async_get_custom_components(
     dirs = await hass.async_add_executor_job(
         get_sub_directories, custom_components.__path__
     )
+    manifest_cache = await _async_get_manifest_cache(hass)
 
     integrations = await asyncio.gather(
         *(
             hass.async_add_executor_job(
-                Integration.resolve_from_root, hass, custom_components, comp.name
+                Integration.resolve_from_root,
+                hass,
+                custom_components,
+                comp.name,
+                manifest_cache,
             )
             for comp in dirs
         )
     )
+    if manifest_cache is not None:
+        manifest_cache.async_schedule_save()
 
     return {
         integration.domain: integration
@@ -200,7 +299,11 @@ class Integration:
 
     @classmethod
     def resolve_from_root(
-        cls, hass: "HomeAssistant", root_module: ModuleType, domain: str
+        cls,
+        hass: "HomeAssistant",
+        root_module: ModuleType,
+        domain: str,
+        manifest_cache: Optional[ManifestCache] = None,
     ) -> "Optional[Integration]":
         """Resolve an integration from a root module."""
         for base in root_module.__path__:  # type: ignore
@@ -210,7 +313,10 @@ class Integration:
                 continue
 
             try:
-                manifest = json.loads(manifest_path.read_text())
+                if manifest_cache is None:
+                    manifest = json.loads(manifest_path.read_text())
+                else:
+                    manifest = manifest_cache.load(manifest_path)
             except ValueError as err:
                 _LOGGER.error(
                     "Error parsing manifest.json file at %s: %s", manifest_path, err
@@ -383,7 +489,7 @@ class Integration:
         """Return the component."""
         cache = self.hass.data.setdefault(DATA_COMPONENTS, {})
         if self.domain not in cache:
-            cache[self.domain] = importlib.import_module(self.pkg_path)
+            cache[self.domain] = self._import(self.domain, self.pkg_path)
         return cache[self.domain]  # type: ignore
 
     def get_platform(self, platform_name: str) -> ModuleType:
@@ -391,11 +497,65 @@ class Integration:
         cache = self.hass.data.setdefault(DATA_COMPONENTS, {})
         full_name = f"{self.domain}.{platform_name}"
         if full_name not in cache:
-            cache[full_name] = importlib.import_module(
-                f"{self.pkg_path}.{platform_name}"
+            cache[full_name] = self._import(
+                full_name, f"{self.pkg_path}.{platform_name}"
             )
         return cache[full_name]  # type: ignore
 
+    def _import(self, name: str, module_path: str) -> ModuleType:
+        """Import a module and record how long the import took."""
+        start = timer()
+        module = importlib.import_module(module_path)
+        self.hass.data.setdefault(DATA_IMPORT_TIMES, {})[name] = timer() - start
+        return module
+
+    def async_preload(self, platform_names: Iterable[str] = ()) -> None:
+        """Import the component and platforms in the executor ahead of use.
+
+        Python serializes the imports of a module between threads, so
+        get_component and get_platform stay safe while a preload runs.
+
+        This method must be run in the event loop.
+        """
+        preloads = self.hass.data.setdefault(DATA_PRELOAD, {})
+        preload = preloads.get(self.domain)
+        platform_names = list(platform_names)
+        if preload is not None and not platform_names:
+            return
+
+        # Not a tracked executor job, a preload must not delay startup
+        future = self.hass.loop.run_in_executor(None, self._preload, platform_names)
+        preloads[self.domain] = (
+            future if preload is None else asyncio.gather(preload, future)
+        )
+
+    async def async_wait_preload(self) -> None:
+        """Wait for a preload of the integration to finish."""
+        preload = self.hass.data.get(DATA_PRELOAD, {}).get(self.domain)
+        if preload is not None:
+            await preload
+
+    def _preload(self, platform_names: List[str]) -> None:
+        """Import the component and platforms.
+
+        Errors are ignored, the import is retried when the integration is
+        set up and reports them there. This covers requirements that are
+        not installed yet and deadlocks between circular imports.
+        """
+        try:
+            self.get_component()
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug("Unable to preload %s: %s", self.domain, err)
+            return
+
+        for platform_name in platform_names:
+            try:
+                self.get_platform(platform_name)
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.debug(
+                    "Unable to preload %s.%s: %s", self.domain, platform_name, err
+                )
+
     def __repr__(self) -> str:
         """Text representation of class."""
         return f"<Integration {self.domain}: {self.pkg_path}>"
@@ -437,9 +597,12 @@ async def async_get_integration(hass: "HomeAssistant", domain: str) -> Integrati
 
     from homeassistant import components  # pylint: disable=import-outside-toplevel
 
+    manifest_cache = await _async_get_manifest_cache(hass)
     integration = await hass.async_add_executor_job(
-        Integration.resolve_from_root, hass, components, domain
+        Integration.resolve_from_root, hass, components, domain, manifest_cache
     )
+    if manifest_cache is not None:
+        manifest_cache.async_schedule_save()
 
     if integration is not None:
         cache[domain] = integration
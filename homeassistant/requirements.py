@@ -118,19 +118,34 @@ async def async_process_requirements(
     kwargs = pip_kwargs(hass.config.config_dir)
 
     async with pip_lock:
+        # Look up the installed distributions once instead of per requirement
+        installed_versions = hass.data.get(DATA_PKG_CACHE)
+        if installed_versions is None:
+            installed_versions = await hass.async_add_executor_job(
+                pkg_util.get_installed_versions
+            )
+            hass.data[DATA_PKG_CACHE] = installed_versions
+
         for req in requirements:
-            if pkg_util.is_installed(req):
+            if pkg_util.is_installed(req, installed_versions):
                 continue
 
             def _install(req: str, kwargs: Dict) -> bool:
                 """Install requirement."""
                 return pkg_util.install_package(req, **kwargs)
 
+            # Installing can upgrade or add other distributions as well
+            hass.data.pop(DATA_PKG_CACHE, None)
             ret = await hass.async_add_executor_job(_install, req, kwargs)
 
             if not ret:
                 raise RequirementsNotFound(name, [req])
 
+            installed_versions = await hass.async_add_executor_job(
+                pkg_util.get_installed_versions
+            )
+            hass.data[DATA_PKG_CACHE] = installed_versions
+
 
 def pip_kwargs(config_dir: Optional[str]) -> Dict[str, Any]:
     """Return keyword arguments for PIP install."""
@@ -6,14 +6,22 @@ from contextlib import suppress
 from datetime import datetime
 import json
 import logging
+from tempfile import TemporaryDirectory
 from timeit import default_timer as timer
+from types import SimpleNamespace
 from typing import Callable, Dict, TypeVar
 
 from homeassistant import core
 from homeassistant.components.websocket_api.const import JSON_DUMP
-from homeassistant.const import ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED
+from homeassistant.const import (
+    ATTR_NOW,
+    EVENT_HOMEASSISTANT_START,
+    EVENT_STATE_CHANGED,
+    EVENT_TIME_CHANGED,
+)
+from homeassistant.helpers import entity_registry, restore_state
 from homeassistant.helpers.entityfilter import convert_include_exclude_filter
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import JSONEncoder, json_dumps
 from homeassistant.util import dt as dt_util
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
@@ -85,6 +93,40 @@ async def fire_events(hass):
     return timer() - start
 
 
+@benchmark
+async def fire_state_changed_1k_listeners(hass):
+    """Fire a thousand state changed events to a thousand listeners."""
+    count = 0
+    event = asyncio.Event()
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+        if count == 10 ** 6:
+            event.set()
+
+    for _ in range(1000):
+        hass.bus.async_listen(EVENT_STATE_CHANGED, listener)
+
+    event_data = {
+        "entity_id": "light.kitchen",
+        "old_state": core.State("light.kitchen", "off"),
+        "new_state": core.State("light.kitchen", "on"),
+    }
+
+    start = timer()
+
+    for _ in range(1000):
+        hass.bus.async_fire(EVENT_STATE_CHANGED, event_data)
+
+    await event.wait()
+
+    return timer() - start
+
+
 @benchmark
 async def time_changed_helper(hass):
     """Run a million events through time changed helper."""
@@ -301,6 +343,138 @@ async def filtering_entity_id(hass):
     return timer() - start
 
 
+@benchmark
+async def filtered_state_changed_helper(hass):
+    """Run 100k state changes of 10k entities through three glob filters."""
+    count = 0
+    domains = ["binary_sensor", "sensor", "light", "switch", "media_player"]
+    suffixes = ["contact", "occupancy", "power", "temperature", "lock"]
+    entity_ids = [
+        f"{domains[idx % 5]}.device_{idx}_{suffixes[idx // 5 % 5]}"
+        for idx in range(10 ** 4)
+    ]
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+    for idx in range(3):
+        entities_filter = convert_include_exclude_filter(
+            {
+                "include": {
+                    "domains": [domains[idx]],
+                    "entity_globs": [
+                        f"*_{idx}{digit}*_{suffix}"
+                        for digit in range(10)
+                        for suffix in suffixes
+                    ],
+                    "entities": [],
+                },
+                "exclude": {
+                    "domains": [],
+                    "entity_globs": [f"*.device_{digit}*" for digit in range(10)],
+                    "entities": [],
+                },
+            }
+        )
+        hass.helpers.event.async_track_filtered_state_change_event(
+            entities_filter, listener
+        )
+
+    events_data = [{"entity_id": entity_id} for entity_id in entity_ids]
+
+    start = timer()
+
+    for idx in range(10 ** 5):
+        hass.bus.async_fire(EVENT_STATE_CHANGED, events_data[idx % 10 ** 4])
+
+    await hass.async_block_till_done()
+
+    return timer() - start
+
+
+@benchmark
+async def mqtt_subscription_trie(hass):
+    """Match 100k MQTT messages against 3000 subscriptions."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.mqtt import Subscription, SubscriptionTrie
+
+    trie = SubscriptionTrie()
+    for idx in range(1000):
+        trie.add(Subscription(f"zigbee2mqtt/device_{idx}", None))
+        trie.add(Subscription(f"zigbee2mqtt/device_{idx}/availability", None))
+        trie.add(Subscription(f"homeassistant/sensor/device_{idx}/+/config", None))
+    trie.add(Subscription("homeassistant/#", None))
+    trie.add(Subscription("zigbee2mqtt/bridge/#", None))
+
+    topics = [
+        f"zigbee2mqtt/device_{idx % 1000}"
+        if idx % 3
+        else f"homeassistant/sensor/device_{idx % 1000}/temperature/config"
+        for idx in range(10 ** 3)
+    ]
+
+    start = timer()
+
+    for idx in range(10 ** 5):
+        trie.match(topics[idx % 1000])
+
+    return timer() - start
+
+
+@benchmark
+async def recorder_state_changes(hass):
+    """Record 10k state changes flushing every row."""
+    return await _recorder_state_changes(hass, bulk_insert=False)
+
+
+@benchmark
+async def recorder_state_changes_bulk_insert(hass):
+    """Record 10k state changes with bulk inserts."""
+    return await _recorder_state_changes(hass, bulk_insert=True)
+
+
+async def _recorder_state_changes(hass, bulk_insert):
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components import recorder
+
+    with TemporaryDirectory() as tmpdir:
+        instance = hass.data[recorder.DATA_INSTANCE] = recorder.Recorder(
+            hass,
+            auto_purge=False,
+            keep_days=1,
+            commit_interval=1,
+            uri=f"sqlite:///{tmpdir}/benchmark.db",
+            db_max_retries=1,
+            db_retry_wait=1,
+            entity_filter=lambda entity_id: True,
+            exclude_t=[],
+            bulk_insert=bulk_insert,
+        )
+        instance.async_initialize()
+        instance.start()
+        await instance.async_db_ready
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+
+        attributes = {"unit_of_measurement": "°C", "friendly_name": "Benchmark"}
+
+        start = timer()
+
+        for idx in range(10 ** 4):
+            hass.states.async_set(f"sensor.benchmark_{idx % 100}", idx, attributes)
+            if idx % 100 == 0:
+                hass.bus.async_fire(EVENT_TIME_CHANGED)
+
+        await hass.async_block_till_done()
+        # Stopping the recorder commits the remaining events
+        instance.queue.put(None)
+        await hass.async_add_executor_job(instance.join)
+
+        return timer() - start
+
+
 @benchmark
 async def valid_entity_id(hass):
     """Run valid entity ID a million times."""
@@ -323,6 +497,146 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+@benchmark
+async def json_serialize_states_stdlib(hass):
+    """Serialize million states with the standard library encoder."""
+    states = [
+        core.State("light.kitchen", "on", {"friendly_name": "Kitchen Lights"})
+        for _ in range(10 ** 6)
+    ]
+
+    start = timer()
+    json.dumps(states, cls=JSONEncoder, allow_nan=False)
+    return timer() - start
+
+
+def _storage_data(hass):
+    """Return entity registry and restore state data of 10000 sensors."""
+    registry = entity_registry.EntityRegistry(hass)
+    registry.entities = {}
+    stored_states = []
+    now = dt_util.utcnow()
+    for idx in range(10 ** 4):
+        entity_id = f"sensor.temperature_{idx}"
+        registry.entities[entity_id] = entity_registry.RegistryEntry(
+            entity_id=entity_id,
+            unique_id=f"temperature-{idx}",
+            platform="benchmark",
+            config_entry_id="c3b1e1a8f1c84c5ba51b6a1b2f4d7e10",
+            device_id=f"{idx:032x}",
+            device_class="temperature",
+            unit_of_measurement="°C",
+            original_name=f"Temperature {idx}",
+        )
+        state = core.State(
+            entity_id,
+            "21.5",
+            {
+                "unit_of_measurement": "°C",
+                "friendly_name": f"Temperature {idx}",
+                "device_class": "temperature",
+            },
+        )
+        stored_states.append(restore_state.StoredState(state, now))
+    # pylint: disable=protected-access
+    return [registry._data_to_save(), stored_states]
+
+
+@benchmark
+async def json_save_storage(hass):
+    """Serialize registry and restore state data 10 times for storage."""
+    data = _storage_data(hass)
+
+    start = timer()
+    for _ in range(10):
+        json_dumps(data, pretty=True)
+    return timer() - start
+
+
+@benchmark
+async def json_save_storage_stdlib(hass):
+    """Serialize registry and restore state data 10 times with stdlib."""
+    data = _storage_data(hass)
+
+    start = timer()
+    for _ in range(10):
+        json.dumps(data, cls=JSONEncoder, indent=4)
+    return timer() - start
+
+
+@benchmark
+async def entity_service_call_100(hass):
+    """Call a service 10k times for one of 100 entities of a domain."""
+    return await _entity_service_call(hass, 100)
+
+
+@benchmark
+async def entity_service_call_10k(hass):
+    """Call a service 10k times for one of 10k entities of a domain."""
+    return await _entity_service_call(hass, 10 ** 4)
+
+
+async def _entity_service_call(hass, count):
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers.entity import Entity
+    from homeassistant.helpers.service import entity_service_call
+
+    platform = SimpleNamespace(entities={})
+    for idx in range(count):
+        entity = Entity()
+        entity.hass = hass
+        entity.entity_id = f"light.benchmark_{idx}"
+        platform.entities[entity.entity_id] = entity
+
+    @core.callback
+    def turn_on(entity, call):
+        """Handle the service for an entity."""
+
+    calls = [
+        core.ServiceCall("light", "turn_on", {"entity_id": f"light.benchmark_{idx}"})
+        for idx in range(0, count, max(1, count // 100))
+    ]
+
+    with TemporaryDirectory() as tmpdir:
+        # Loading the group integration to expand targets needs a config dir
+        hass.config.config_dir = tmpdir
+
+        start = timer()
+        for idx in range(10 ** 4):
+            await entity_service_call(
+                hass, [platform], turn_on, calls[idx % len(calls)]
+            )
+        return timer() - start
+
+
+@benchmark
+async def group_expand_entity_ids(hass):
+    """Expand a group of 6 groups with 100 lights each 10k times."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.group import expand_entity_ids
+
+    for group_idx in range(6):
+        hass.states.async_set(
+            f"group.lights_{group_idx}",
+            "on",
+            {
+                "entity_id": tuple(
+                    f"light.benchmark_{group_idx}_{idx}" for idx in range(100)
+                )
+            },
+        )
+    hass.states.async_set(
+        "group.all_lights",
+        "on",
+        {"entity_id": tuple(f"group.lights_{idx}" for idx in range(6))},
+    )
+
+    start = timer()
+    for _ in range(10 ** 4):
+        expand_entity_ids(hass, ["group.all_lights"])
+    return timer() - start
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
@@ -353,6 +667,7 @@ def _create_state_changed_event_from_old_new(
     row.event_type = EVENT_STATE_CHANGED
     row.event_data = "{}"
     row.attributes = attributes_json
+    row.shared_attrs = attributes_json
     row.time_fired = event_time_fired
     row.state = new_state and new_state.get("state")
     row.entity_id = entity_id
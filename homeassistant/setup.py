@@ -18,6 +18,7 @@ ATTR_COMPONENT = "component"
 
 DATA_SETUP_DONE = "setup_done"
 DATA_SETUP_STARTED = "setup_started"
+DATA_SETUP_TIME = "setup_time"
 DATA_SETUP = "setup_tasks"
 DATA_DEPS_REQS = "deps_reqs_processed"
 
@@ -142,6 +143,7 @@ async def _async_setup_component(
 
     # Some integrations fail on import because they call functions incorrectly.
     # So we do it before validating config to catch these errors.
+    await integration.async_wait_preload()
     try:
         component = integration.get_component()
     except ImportError as err:
@@ -210,6 +212,7 @@ async def _async_setup_component(
         if warn_task:
             warn_task.cancel()
     _LOGGER.info("Setup of domain %s took %.1f seconds", domain, end - start)
+    hass.data.setdefault(DATA_SETUP_TIME, {})[domain] = end - start
 
     if result is False:
         log_error("Integration failed to initialize.")
@@ -274,6 +277,7 @@ async def async_prepare_setup_platform(
         log_error(str(err))
         return None
 
+    await integration.async_wait_preload()
     try:
         platform = integration.get_platform(domain)
     except ImportError as exc:
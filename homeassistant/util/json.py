@@ -9,6 +9,11 @@ from typing import Any, Callable, Dict, List, Optional, Type, Union
 from homeassistant.core import Event, State
 from homeassistant.exceptions import HomeAssistantError
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -20,6 +25,44 @@ class WriteError(HomeAssistantError):
     """Error writing the data."""
 
 
+def json_dumps(
+    data: Any,
+    *,
+    encoder: Optional[Type[json.JSONEncoder]] = None,
+    default: Optional[Callable[[Any], Any]] = None,
+    pretty: bool = False,
+    allow_nan: bool = True,
+) -> str:
+    """Serialize data to a JSON string.
+
+    default converts objects that are not serializable, like the default
+    method of an encoder. When orjson is installed it is used unless an
+    encoder is given. orjson writes non-finite floats as null, so it is not
+    used when allow_nan is False. Data orjson rejects, like integers over 64
+    bits, falls back to the standard library, which writes the same format.
+    """
+    if orjson is not None and encoder is None and allow_nan:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(  # type: ignore
+                data, default=default, option=option
+            ).decode()
+        except TypeError:
+            pass
+
+    return json.dumps(
+        data,
+        cls=encoder,
+        default=default,
+        allow_nan=allow_nan,
+        ensure_ascii=False,
+        indent=2 if pretty else None,
+        separators=None if pretty else (",", ":"),
+    )
+
+
 def load_json(
     filename: str, default: Union[List, Dict, None] = None
 ) -> Union[List, Dict]:
@@ -53,13 +96,26 @@ def save_json(
 
     Returns True on success.
     """
+    write_json(filename, serialize_json(filename, data, encoder=encoder), private)
+
+
+def serialize_json(
+    filename: str,
+    data: Union[List, Dict],
+    *,
+    encoder: Optional[Type[json.JSONEncoder]] = None,
+) -> str:
+    """Serialize JSON data to be saved to filename."""
     try:
-        json_data = json.dumps(data, indent=4, cls=encoder)
+        return json_dumps(data, encoder=encoder, pretty=True)
     except TypeError as error:
         msg = f"Failed to serialize to JSON: {filename}. Bad data at {format_unserializable_data(find_paths_unserializable_data(data))}"
         _LOGGER.error(msg)
         raise SerializationError(msg) from error
 
+
+def write_json(filename: str, json_data: str, private: bool = False) -> None:
+    """Atomically write serialized JSON data to a file."""
     tmp_filename = ""
     tmp_path = os.path.split(filename)[0]
     try:
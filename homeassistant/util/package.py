@@ -3,9 +3,10 @@ import asyncio
 import logging
 import os
 from pathlib import Path
+import re
 from subprocess import PIPE, Popen
 import sys
-from typing import Optional
+from typing import Dict, Optional
 from urllib.parse import urlparse
 
 import pkg_resources
@@ -13,16 +14,20 @@ import pkg_resources
 if sys.version_info[:2] >= (3, 8):
     from importlib.metadata import (  # pylint: disable=no-name-in-module,import-error
         PackageNotFoundError,
+        distributions,
         version,
     )
 else:
     from importlib_metadata import (  # pylint: disable=import-error
         PackageNotFoundError,
+        distributions,
         version,
     )
 
 _LOGGER = logging.getLogger(__name__)
 
+_RE_NAME_SEPARATORS = re.compile(r"[-_.]+")
+
 
 def is_virtual_env() -> bool:
     """Return if we run in a virtual environment."""
@@ -37,9 +42,33 @@ def is_docker_env() -> bool:
     return Path("/.dockerenv").exists()
 
 
-def is_installed(package: str) -> bool:
+def _canonical_name(name: str) -> str:
+    """Return the name of a distribution as pip compares it."""
+    return _RE_NAME_SEPARATORS.sub("-", name).lower()
+
+
+def get_installed_versions() -> Dict[str, str]:
+    """Return the versions of all installed distributions by canonical name.
+
+    When a distribution is installed more than once, the version found first
+    on sys.path is returned as that one is loaded when importing it.
+    """
+    installed: Dict[str, str] = {}
+    for dist in distributions():
+        name = dist.metadata["Name"]
+        if name:
+            installed.setdefault(_canonical_name(name), dist.version)
+    return installed
+
+
+def is_installed(
+    package: str, installed_versions: Optional[Dict[str, str]] = None
+) -> bool:
     """Check if a package is installed and will be loaded when we import it.
 
+    Pass the result of get_installed_versions to check many packages without
+    looking up every distribution on disk.
+
     Returns True when the requirement is met.
     Returns False when the package is not installed or doesn't meet req.
     """
@@ -50,6 +79,10 @@ def is_installed(package: str) -> bool:
         # leaving it in for custom components.
         req = pkg_resources.Requirement.parse(urlparse(package).fragment)
 
+    if installed_versions is not None:
+        installed_version = installed_versions.get(_canonical_name(req.project_name))
+        return installed_version is not None and installed_version in req
+
     try:
         return version(req.project_name) in req
     except PackageNotFoundError:
@@ -0,0 +1,55 @@
+"""Read only dictionary."""
+import sys
+from typing import Any, Mapping, Optional
+
+
+def _readonly(*args: Any, **kwargs: Any) -> Any:
+    """Raise an exception when a read only dict is modified."""
+    raise TypeError("Cannot modify ReadOnlyDict")
+
+
+class ReadOnlyDict(dict):
+    """Read only version of dict that is compatible with dict types.
+
+    Unlike a MappingProxyType it does not wrap a dict that someone else may
+    still modify, so it can be shared between states as is.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    __ior__ = _readonly
+    pop = _readonly
+    popitem = _readonly
+    clear = _readonly
+    update = _readonly
+    setdefault = _readonly
+
+    def __reduce__(self) -> Any:
+        """Rebuild from a dict when copied or pickled."""
+        return (self.__class__, (dict(self),))
+
+    def __copy__(self) -> "ReadOnlyDict":
+        """Return self, a shallow copy would be equal and read only as well."""
+        return self
+
+
+EMPTY_READ_ONLY_DICT = ReadOnlyDict()
+
+
+def freeze(mapping: Optional[Mapping]) -> ReadOnlyDict:
+    """Return a read only copy of mapping with interned string keys.
+
+    Read only dicts are returned as is.
+    """
+    if isinstance(mapping, ReadOnlyDict):
+        return mapping
+    if not mapping:
+        return EMPTY_READ_ONLY_DICT
+    return ReadOnlyDict(
+        {
+            sys.intern(key) if type(key) is str else key: value
+            for key, value in mapping.items()
+        }
+    )
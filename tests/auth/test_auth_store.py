@@ -242,3 +242,40 @@ async def test_loading_race_condition(hass):
         mock_dev_registry.assert_called_once_with(hass)
         mock_load.assert_called_once_with()
         assert results[0] == results[1]
+
+
+async def test_refresh_token_lookups(hass, hass_storage):
+    """Test refresh tokens are looked up by id and token."""
+    store = auth_store.AuthStore(hass)
+    user = await store.async_create_user("Paulus")
+    user2 = await store.async_create_user("Other")
+    token = await store.async_create_refresh_token(user, "http://localhost/")
+    token2 = await store.async_create_refresh_token(user2, "http://localhost/")
+
+    assert await store.async_get_refresh_token(token.id) is token
+    assert await store.async_get_refresh_token_by_token(token.token) is token
+    assert await store.async_get_refresh_token_by_token(token2.token) is token2
+    assert await store.async_get_refresh_token_by_token(token.token[:-1]) is None
+
+    await store.async_remove_refresh_token(token)
+    assert token.id not in user.refresh_tokens
+    assert await store.async_get_refresh_token(token.id) is None
+    assert await store.async_get_refresh_token_by_token(token.token) is None
+
+    await store.async_remove_user(user2)
+    assert await store.async_get_refresh_token(token2.id) is None
+    assert await store.async_get_refresh_token_by_token(token2.token) is None
+
+    # Tokens are indexed when loaded
+    hass_storage[auth_store.STORAGE_KEY] = {
+        "version": 1,
+        "data": store._data_to_save(),
+    }
+    user = await store.async_create_user("Paulus")
+    token = await store.async_create_refresh_token(user, "http://localhost/")
+    hass_storage[auth_store.STORAGE_KEY]["data"] = store._data_to_save()
+
+    store = auth_store.AuthStore(hass)
+    loaded = await store.async_get_refresh_token(token.id)
+    assert loaded.token == token.token
+    assert await store.async_get_refresh_token_by_token(token.token) is loaded
@@ -1,5 +1,6 @@
 """Tests for the Home Assistant auth module."""
 from datetime import timedelta
+import time
 
 import jwt
 import pytest
@@ -474,6 +475,36 @@ async def test_remove_refresh_token(mock_hass):
     assert await manager.async_validate_access_token(access_token) is None
 
 
+async def test_validate_access_token_cached(mock_hass):
+    """Test validated access tokens are cached until invalidated."""
+    manager = await auth.auth_manager_from_config(mock_hass, [], [])
+    user = MockUser().add_to_auth_manager(manager)
+    refresh_token = await manager.async_create_refresh_token(user, CLIENT_ID)
+    access_token = manager.async_create_access_token(refresh_token)
+
+    assert await manager.async_validate_access_token(access_token) is refresh_token
+
+    with patch("homeassistant.auth.jwt.decode") as mock_decode:
+        assert await manager.async_validate_access_token(access_token) is refresh_token
+    assert not mock_decode.called
+
+    with patch(
+        "homeassistant.auth.time.time",
+        return_value=time.time() + auth.ACCESS_TOKEN_CACHE_TIME,
+    ), patch("homeassistant.auth.jwt.decode", return_value={}) as mock_decode:
+        await manager.async_validate_access_token(access_token)
+    assert mock_decode.called
+
+    await manager.async_validate_access_token(access_token)
+    await manager.async_deactivate_user(user)
+    assert await manager.async_validate_access_token(access_token) is None
+
+    await manager.async_activate_user(user)
+    await manager.async_validate_access_token(access_token)
+    await manager.async_remove_refresh_token(refresh_token)
+    assert await manager.async_validate_access_token(access_token) is None
+
+
 async def test_create_access_token(mock_hass):
     """Test normal refresh_token's jwt_key keep same after used."""
     manager = await auth.auth_manager_from_config(mock_hass, [], [])
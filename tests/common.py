@@ -211,6 +211,9 @@ async def async_test_home_assistant(loop):
     hass.config_entries._entries = []
     hass.config_entries._store._async_ensure_stop_listener = lambda: None
 
+    # Parse manifests without storing them in the test config dir
+    hass.data[loader.DATA_MANIFEST_CACHE] = loader.ManifestCache(Mock(), {})
+
     hass.state = ha.CoreState.running
 
     # Mock async_start
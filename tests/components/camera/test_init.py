@@ -361,3 +361,33 @@ async def test_record_service(hass, mock_camera, mock_stream):
         # So long as we call stream.record, the rest should be covered
         # by those tests.
         assert mock_record_service.called
+
+
+async def test_frame_broker_shares_images(hass, mock_camera):
+    """Test concurrent image requests share one fetch."""
+    entity = hass.data[DOMAIN].get_entity("camera.demo_camera")
+    fetched = asyncio.Event()
+
+    async def mock_camera_image():
+        await fetched.wait()
+        return b"Shared"
+
+    with patch.object(entity, "async_camera_image", side_effect=mock_camera_image):
+        tasks = [
+            hass.async_create_task(camera.async_get_image(hass, entity.entity_id))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        fetched.set()
+        images = await asyncio.gather(*tasks)
+        assert [image.content for image in images] == [b"Shared"] * 3
+
+        # Image requests fetch a new image, streams accept recent ones
+        image = await camera.async_get_image(hass, entity.entity_id)
+        assert image.content == b"Shared"
+        assert await entity.frame_broker.async_get_frame(10) == b"Shared"
+
+    assert camera.async_get_frame_stats(hass)[entity.entity_id] == {
+        "fetches": 2,
+        "requests": 5,
+    }
@@ -6,6 +6,7 @@ import unittest
 import homeassistant.components.group as group
 from homeassistant.const import (
     ATTR_ASSUMED_STATE,
+    ATTR_ENTITY_ID,
     ATTR_FRIENDLY_NAME,
     ATTR_ICON,
     STATE_HOME,
@@ -332,6 +333,49 @@ class TestComponentsGroup(unittest.TestCase):
             "switch.test_2",
         ] == sorted(group.expand_entity_ids(self.hass, ["group.group_of_groups"]))
 
+    def test_expand_entity_ids_follows_nested_changes(self):
+        """Test cached expansions change with the members of nested groups."""
+        group.Group.create_group(self.hass, "light", ["light.test_1"])
+        group.Group.create_group(self.hass, "switch", ["switch.test_1"])
+        group.Group.create_group(
+            self.hass, "group_of_groups", ["group.light", "group.switch"]
+        )
+
+        assert ["light.test_1", "switch.test_1"] == group.expand_entity_ids(
+            self.hass, ["group.group_of_groups"]
+        )
+
+        self.hass.states.set(
+            "group.light", STATE_ON, {ATTR_ENTITY_ID: ["light.test_1", "light.test_2"]}
+        )
+
+        assert [
+            "light.test_1",
+            "light.test_2",
+            "switch.test_1",
+        ] == group.expand_entity_ids(self.hass, ["group.group_of_groups"])
+
+        self.hass.states.remove("group.switch")
+
+        assert ["light.test_1", "light.test_2"] == group.expand_entity_ids(
+            self.hass, ["group.group_of_groups"]
+        )
+
+        assert [] == group.expand_entity_ids(self.hass, ["group.not_existing"])
+        assert "group.not_existing" not in self.hass.data[group.GROUP_EXPAND_CACHE]
+
+    def test_expand_entity_ids_nested_loop(self):
+        """Test expanding groups that contain each other."""
+        group.Group.create_group(self.hass, "one", ["light.test_1", "group.two"])
+        group.Group.create_group(self.hass, "two", ["light.test_2", "group.one"])
+
+        assert ["light.test_1", "light.test_2"] == group.expand_entity_ids(
+            self.hass, ["group.one"]
+        )
+        assert ["light.test_2", "light.test_1"] == group.expand_entity_ids(
+            self.hass, ["group.two"]
+        )
+
     def test_set_assumed_state_based_on_tracked(self):
         """Test assumed state."""
         self.hass.states.set("light.Bowl", STATE_ON)
@@ -397,6 +441,10 @@ class TestComponentsGroup(unittest.TestCase):
         assert len(self.hass.data[TRACK_STATE_CHANGE_CALLBACKS]["light.bowl"]) == 1
         assert len(self.hass.data[TRACK_STATE_CHANGE_CALLBACKS]["test.one"]) == 1
         assert len(self.hass.data[TRACK_STATE_CHANGE_CALLBACKS]["test.two"]) == 1
+        assert ["light.bowl"] == group.expand_entity_ids(
+            self.hass, ["group.second_group"]
+        )
+        assert "group.second_group" in self.hass.data[group.GROUP_EXPAND_CACHE]
 
         with patch(
             "homeassistant.config.load_yaml_config_file",
@@ -411,6 +459,7 @@ class TestComponentsGroup(unittest.TestCase):
             "group.all_tests",
             "group.hello",
         ]
+        assert "group.second_group" not in self.hass.data[group.GROUP_EXPAND_CACHE]
         assert self.hass.bus.listeners["state_changed"] == 1
         assert len(self.hass.data[TRACK_STATE_CHANGE_CALLBACKS]["light.bowl"]) == 1
         assert len(self.hass.data[TRACK_STATE_CHANGE_CALLBACKS]["test.one"]) == 1
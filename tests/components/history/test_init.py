@@ -7,6 +7,7 @@ import unittest
 
 from homeassistant.components import history, recorder
 from homeassistant.components.recorder.models import process_timestamp
+from homeassistant.components.recorder.util import session_scope
 import homeassistant.core as ha
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.setup import async_setup_component, setup_component
@@ -268,6 +269,35 @@ class TestComponentHistory(unittest.TestCase):
 
         assert states == hist
 
+    def test_stream_significant_states(self):
+        """Test streaming yields the significant states sorted by entity."""
+        # pylint: disable=protected-access
+        zero, four, _ = self.record_states()
+        one = zero + timedelta(seconds=1)
+
+        for kwargs in (
+            {},
+            {"minimal_response": True},
+            {"include_start_time_state": False},
+        ):
+            hist = history.get_significant_states(
+                self.hass, one, four, filters=history.Filters(), **kwargs
+            )
+            with session_scope(hass=self.hass) as session:
+                streamed = list(
+                    history._stream_significant_states(
+                        self.hass,
+                        session,
+                        one,
+                        four,
+                        filters=history.Filters(),
+                        **kwargs,
+                    )
+                )
+
+            assert [states[0].entity_id for states in streamed] == sorted(hist)
+            assert streamed == [hist[entity_id] for entity_id in sorted(hist)]
+
     def test_get_significant_states_with_initial(self):
         """Test that only significant states are returned.
 
@@ -663,6 +693,86 @@ class TestComponentHistory(unittest.TestCase):
         assert len(hist[entity_id]) == 3
         assert states == hist[entity_id]
 
+    def test_get_significant_states_from_memory(self):
+        """Test the recent history in memory matches the database."""
+        self.init_recorder()
+        config = history.CONFIG_SCHEMA({history.DOMAIN: {history.CONF_CACHE_HOURS: 1}})
+        assert setup_component(self.hass, history.DOMAIN, config)
+
+        zero = dt_util.utcnow()
+        one = zero + timedelta(seconds=1)
+        two = one + timedelta(seconds=1)
+        three = two + timedelta(seconds=1)
+        four = three + timedelta(seconds=1)
+
+        for point, changes in (
+            (
+                zero,
+                [
+                    ("media_player.test", "idle", {"media_title": "one"}),
+                    ("media_player.excluded", "idle", {}),
+                    ("thermostat.test", "20", {"current_temperature": 19.5}),
+                ],
+            ),
+            (
+                two,
+                [
+                    ("media_player.test", "idle", {"media_title": "two"}),
+                    ("thermostat.test", "20", {"current_temperature": 19.8}),
+                    ("zone.home", "zoning", {}),
+                    ("script.test", "off", {}),
+                ],
+            ),
+            (
+                three,
+                [
+                    ("media_player.test", "playing", {"media_title": "two"}),
+                    ("media_player.test", "paused", {"media_title": "two"}),
+                    ("media_player.excluded", "playing", {}),
+                ],
+            ),
+        ):
+            with patch(
+                "homeassistant.components.recorder.dt_util.utcnow", return_value=point
+            ):
+                for entity_id, state, attributes in changes:
+                    self.hass.states.set(entity_id, state, attributes)
+                wait_recording_done(self.hass)
+
+        def get_significant_states(**kwargs):
+            """Get the significant states as JSON without context."""
+            hist = history.get_significant_states(
+                self.hass, one, four, filters=history.Filters(), **kwargs
+            )
+            result = {}
+            for entity_id, states in hist.items():
+                result[entity_id] = json.loads(json.dumps(states, cls=JSONEncoder))
+                for state in result[entity_id]:
+                    state.pop("context", None)
+            return result
+
+        queries = [
+            {},
+            {"significant_changes_only": False},
+            {"minimal_response": True},
+            {"include_start_time_state": False},
+            {"entity_ids": ["thermostat.test", "media_player.test"]},
+        ]
+        from_memory = [get_significant_states(**query) for query in queries]
+        recent_history = self.hass.data.pop(history.DATA_RECENT_HISTORY)
+        from_database = [get_significant_states(**query) for query in queries]
+
+        assert from_memory == from_database
+        assert sorted(from_memory[0]) == [
+            "media_player.excluded",
+            "media_player.test",
+            "script.test",
+            "thermostat.test",
+        ]
+        assert list(from_memory[4]) == ["thermostat.test", "media_player.test"]
+        assert len(from_memory[2]["media_player.test"]) == 3
+        assert not recent_history.covers(zero - timedelta(hours=1))
+
     def check_significant_states(self, zero, four, states, config):
         """Check if significant states are retrieved."""
         filters = history.Filters()
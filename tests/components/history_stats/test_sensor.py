@@ -9,7 +9,10 @@ import pytz
 
 from homeassistant import config as hass_config
 from homeassistant.components.history_stats import DOMAIN
-from homeassistant.components.history_stats.sensor import HistoryStatsSensor
+from homeassistant.components.history_stats.sensor import (
+    HistoryStatsSensor,
+    HistoryStatsWindow,
+)
 from homeassistant.const import SERVICE_RELOAD, STATE_UNKNOWN
 import homeassistant.core as ha
 from homeassistant.helpers.template import Template
@@ -152,6 +155,87 @@ class TestHistoryStatsSensor(unittest.TestCase):
         assert sensor3.state == 2
         assert sensor4.state == 50
 
+    def test_measure_incremental(self):
+        """Test the measure follows changes and the period without queries."""
+        base = dt_util.utcnow() - timedelta(minutes=30)
+        t0 = base - timedelta(minutes=40)
+        t1 = base - timedelta(minutes=20)
+        t2 = base + timedelta(minutes=5)
+
+        # On from t0 to t1 and from t2, measured over the hour before base,
+        # base + 10min and base + 25min. The last period starts after t0.
+
+        fake_states = {
+            "binary_sensor.test_id": [
+                ha.State("binary_sensor.test_id", "on", last_changed=t0),
+                ha.State("binary_sensor.test_id", "off", last_changed=t1),
+            ]
+        }
+
+        start = Template("{{ as_timestamp(now()) - 3600 }}", self.hass)
+        end = Template("{{ now() }}", self.hass)
+
+        sensor = HistoryStatsSensor(
+            self.hass, "binary_sensor.test_id", "on", start, end, None, "time", "Test"
+        )
+
+        with patch(
+            "homeassistant.components.history.state_changes_during_period",
+            return_value=fake_states,
+        ) as state_changes, patch(
+            "homeassistant.components.history.get_state", return_value=None
+        ), patch(
+            "homeassistant.util.dt.now", return_value=base
+        ) as now:
+            sensor.update()
+            assert sensor.state == 0.33
+            assert sensor.count == 1
+
+            sensor._pending_changes.append((t1.timestamp(), False))
+            sensor._pending_changes.append((t2.timestamp(), True))
+            now.return_value = base + timedelta(minutes=10)
+            sensor.update()
+            assert sensor.state == 0.42
+            assert sensor.count == 2
+
+            now.return_value = base + timedelta(minutes=25)
+            sensor.update()
+            assert sensor.state == 0.58
+            assert sensor.count == 1
+
+        assert state_changes.call_count == 1
+
+    def test_window_totals(self):
+        """Test the window totals match a count over the changes."""
+        changes = [(10, True), (20, False), (30, False), (40, True), (50, False)]
+
+        def count(start, start_state, end):
+            """Count the totals from scratch."""
+            last_time, last_state = start, start_state
+            elapsed = count = 0
+            for timestamp, state in changes:
+                if timestamp <= start or timestamp >= end:
+                    continue
+                if last_state:
+                    elapsed += timestamp - last_time
+                if state and not last_state:
+                    count += 1
+                last_time, last_state = timestamp, state
+            if last_state:
+                elapsed += end - last_time
+            return elapsed, count
+
+        window = HistoryStatsWindow(0, False)
+        for change in changes:
+            window.add(*change)
+        window.add(45, True)
+
+        for start, start_state in ((0, False), (15, True), (20, False), (45, True)):
+            window.move_start(start)
+            for end in (start + 1, 42, 50, 60):
+                if end > start:
+                    assert window.totals(end) == count(start, start_state, end)
+
     def test_wrong_date(self):
         """Test when start or end value is not a timestamp or a date."""
         good = Template("{{ now() }}", self.hass)
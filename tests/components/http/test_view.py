@@ -1,4 +1,8 @@
 """Tests for Home Assistant View."""
+import itertools
+import threading
+
+from aiohttp import ClientPayloadError, web
 from aiohttp.web_exceptions import (
     HTTPBadRequest,
     HTTPInternalServerError,
@@ -7,13 +11,14 @@ from aiohttp.web_exceptions import (
 import pytest
 import voluptuous as vol
 
+from homeassistant.components.http import view as http_view
 from homeassistant.components.http.view import (
     HomeAssistantView,
     request_handler_factory,
 )
 from homeassistant.exceptions import ServiceNotFound, Unauthorized
 
-from tests.async_mock import AsyncMock, Mock
+from tests.async_mock import AsyncMock, Mock, patch
 
 
 @pytest.fixture
@@ -69,3 +74,95 @@ async def test_not_running(mock_request_with_stopping):
         Mock(requires_auth=False), AsyncMock(side_effect=Unauthorized)
     )(mock_request_with_stopping)
     assert response.status == 503
+
+
+async def _stream_client(hass, aiohttp_client, items_factory):
+    """Return a client for an app streaming the items of items_factory."""
+
+    async def handler(request):
+        """Stream the items."""
+        return await HomeAssistantView.json_stream(request, items_factory)
+
+    app = web.Application()
+    app["hass"] = hass
+    app.router.add_get("/", handler)
+    return await aiohttp_client(app)
+
+
+async def test_json_stream(hass, aiohttp_client):
+    """Test streaming items as a JSON array in several chunks."""
+    items = [{"entity_id": f"light.kitchen_{idx}", "state": "on"} for idx in range(50)]
+    client = await _stream_client(hass, aiohttp_client, lambda: iter(items))
+
+    with patch.object(http_view, "JSON_STREAM_CHUNK_SIZE", 100):
+        response = await client.get("/")
+
+    assert response.status == 200
+    assert response.content_type == "application/json"
+    assert await response.json() == items
+
+
+async def test_json_stream_empty(hass, aiohttp_client):
+    """Test streaming no items."""
+    client = await _stream_client(hass, aiohttp_client, list)
+
+    response = await client.get("/")
+
+    assert response.status == 200
+    assert await response.json() == []
+
+
+async def test_json_stream_invalid_json(hass, aiohttp_client, caplog):
+    """Test an item that can not be encoded before anything is sent."""
+    client = await _stream_client(hass, aiohttp_client, lambda: [float("NaN")])
+
+    response = await client.get("/")
+
+    assert response.status == 500
+    assert "Unable to stream JSON" in caplog.text
+
+
+class MockCursor:
+    """Mock database cursor that yields items until it is closed."""
+
+    def __init__(self, items):
+        """Initialize the cursor."""
+        self.items = iter(items)
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        """Return the cursor."""
+        return self
+
+    def __next__(self):
+        """Return the next item."""
+        return next(self.items)
+
+    def close(self):
+        """Close the cursor."""
+        self.closed.set()
+
+
+async def test_json_stream_closes_items(hass, aiohttp_client):
+    """Test the items are closed when an item can not be encoded."""
+    cursor = MockCursor([{"state": "on"}, float("NaN"), {"state": "off"}])
+    client = await _stream_client(hass, aiohttp_client, lambda: cursor)
+
+    response = await client.get("/")
+    with pytest.raises(ClientPayloadError):
+        await response.read()
+
+    assert cursor.closed.is_set()
+
+
+async def test_json_stream_client_disconnects(hass, aiohttp_client):
+    """Test the producer stops and closes the items when the client leaves."""
+    cursor = MockCursor(itertools.repeat({"state": "on" * 100}))
+    client = await _stream_client(hass, aiohttp_client, lambda: cursor)
+
+    with patch.object(http_view, "JSON_STREAM_CHUNK_SIZE", 100):
+        response = await client.get("/")
+        await response.content.readany()
+        response.close()
+
+        assert await hass.async_add_executor_job(cursor.closed.wait, 5)
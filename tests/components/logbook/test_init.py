@@ -1342,6 +1342,7 @@ class TestComponentLogbook(unittest.TestCase):
         row.event_type = EVENT_STATE_CHANGED
         row.event_data = "{}"
         row.attributes = attributes_json
+        row.shared_attrs = attributes_json
         row.time_fired = event_time_fired
         row.state = new_state and new_state.get("state")
         row.entity_id = entity_id
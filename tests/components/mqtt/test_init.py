@@ -3,6 +3,7 @@ import asyncio
 from datetime import datetime, timedelta
 import json
 import ssl
+import threading
 
 import pytest
 import voluptuous as vol
@@ -575,6 +576,144 @@ async def test_subscribe_special_characters(hass, mqtt_mock, calls, record_calls
     assert calls[0][0].payload == payload
 
 
+def test_subscription_trie_matches_like_paho():
+    """Test the subscription trie matches the same filters as paho."""
+    # pylint: disable=import-outside-toplevel
+    from paho.mqtt.matcher import MQTTMatcher
+
+    filters = [
+        "#",
+        "+",
+        "a",
+        "a/#",
+        "a/+",
+        "a/b",
+        "a/+/c",
+        "a/b/#",
+        "+/b/c",
+        "$SYS/#",
+        "$SYS/+/load",
+        "/a",
+        "+/a",
+    ]
+    topics = ["a", "a/b", "a/b/c", "a/x/c", "x/b/c", "$SYS/cpu/load", "/a", "a/b/c/d"]
+
+    trie = mqtt.SubscriptionTrie()
+    subscriptions = [mqtt.Subscription(topic, None) for topic in filters]
+    for subscription in subscriptions:
+        trie.add(subscription)
+
+    for topic in topics:
+        expected = set()
+        for subscription in subscriptions:
+            matcher = MQTTMatcher()
+            matcher[subscription.topic] = True
+            if any(matcher.iter_match(topic)):
+                expected.add(subscription.topic)
+        matched = [sub.topic for sub in trie.match(topic)]
+        assert len(matched) == len(expected)
+        assert set(matched) == expected
+
+
+def test_subscription_trie_match_order():
+    """Test matches are returned in the order subscriptions were added."""
+    trie = mqtt.SubscriptionTrie()
+    subscriptions = [
+        mqtt.Subscription(topic, None)
+        for topic in ("a/b/c", "#", "a/+/c", "a/b/#", "+/b/c", "a/b/c")
+    ]
+    for subscription in subscriptions:
+        trie.add(subscription)
+
+    assert trie.match("a/b/c") == subscriptions
+
+
+def test_subscription_trie_remove():
+    """Test removing subscriptions from the trie."""
+    trie = mqtt.SubscriptionTrie()
+    sub_a = mqtt.Subscription("a/+/c", None)
+    sub_b = mqtt.Subscription("a/b/c", None)
+    trie.add(sub_a)
+    trie.add(sub_b)
+    trie.add(sub_b)
+    assert trie.match("a/b/c") == [sub_a, sub_b, sub_b]
+
+    assert trie.remove(sub_b)
+    assert trie.match("a/b/c") == [sub_a, sub_b]
+    assert not trie.remove(sub_b)
+    assert trie.match("a/b/c") == [sub_a]
+
+    with pytest.raises(ValueError):
+        trie.remove(sub_b)
+
+    assert not trie.remove(sub_a)
+    assert trie.match("a/b/c") == []
+    # pylint: disable=protected-access
+    assert trie._root.children == {}
+
+
+async def test_messages_handled_in_batches(hass, mqtt_mock, calls, record_calls):
+    """Test messages received on the paho thread are drained in one batch."""
+    await mqtt.async_subscribe(hass, "test-topic", record_calls)
+
+    for payload in (b"1", b"2", b"3"):
+        mqtt_mock._mqtt_on_message(
+            None, None, mqtt.Message("test-topic", payload, 0, True)
+        )
+    await hass.async_block_till_done()
+
+    assert [call[0].payload for call in calls] == ["1", "2", "3"]
+    assert mqtt_mock().ingest_stats.batches == 1
+    assert mqtt_mock().ingest_stats.messages == 3
+    assert mqtt_mock().ingest_stats.max_batch_size == 3
+    assert mqtt_mock().ingest_stats.coalesced == 0
+
+
+async def test_messages_from_paho_thread_handled_in_order(
+    hass, mqtt_mock, calls, record_calls
+):
+    """Test messages queued by another thread are drained once and in order."""
+    await mqtt.async_subscribe(hass, "test-topic", record_calls)
+
+    def _receive_messages():
+        for idx in range(20):
+            mqtt_mock._mqtt_on_message(
+                None, None, mqtt.Message("test-topic", str(idx).encode(), 0, False)
+            )
+
+    # Joining blocks the event loop, so the drain can only run once all are queued
+    thread = threading.Thread(target=_receive_messages)
+    thread.start()
+    thread.join()
+    await hass.async_block_till_done()
+
+    assert [call[0].payload for call in calls] == [str(idx) for idx in range(20)]
+    assert mqtt_mock().ingest_stats.batches == 1
+    assert mqtt_mock().ingest_stats.messages == 20
+
+
+@pytest.mark.parametrize(
+    "mqtt_config",
+    [{mqtt.CONF_BROKER: "mock-broker", mqtt.CONF_COALESCE_RETAINED: True}],
+)
+async def test_retained_messages_coalesced(hass, mqtt_mock, calls, record_calls):
+    """Test retained messages on the same topic are coalesced within a batch."""
+    await mqtt.async_subscribe(hass, "test-topic/#", record_calls)
+
+    for topic, payload, retain in (
+        ("test-topic/a", b"1", True),
+        ("test-topic/b", b"2", True),
+        ("test-topic/a", b"3", True),
+        ("test-topic/b", b"4", False),
+    ):
+        mqtt_mock._mqtt_on_message(None, None, mqtt.Message(topic, payload, 0, retain))
+    await hass.async_block_till_done()
+
+    assert [call[0].payload for call in calls] == ["2", "3", "4"]
+    assert mqtt_mock().ingest_stats.messages == 4
+    assert mqtt_mock().ingest_stats.coalesced == 1
+
+
 async def test_subscribe_same_topic(hass, mqtt_client_mock, mqtt_mock):
     """
     Test subscring to same topic twice and simulate retained messages.
@@ -1096,6 +1235,21 @@ async def test_mqtt_ws_get_device_debug_info(
     assert response["result"] == expected_result
 
 
+async def test_mqtt_ws_get_ingest_stats(hass, hass_ws_client, mqtt_mock):
+    """Test MQTT websocket message ingest statistics."""
+    mqtt_mock._mqtt_on_message(
+        None, None, mqtt.Message("test-topic", b"test-payload", 0, False)
+    )
+    await hass.async_block_till_done()
+
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 5, "type": "mqtt/ingest_stats"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] == mqtt_mock().ingest_stats.as_dict()
+    assert response["result"]["messages"] == 1
+
+
 async def test_debug_info_multiple_devices(hass, mqtt_mock):
     """Test we get correct debug_info when multiple devices are present."""
     devices = [
@@ -14,7 +14,12 @@ from homeassistant.components.recorder import (
     run_information_with_session,
 )
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import MATCH_ALL, STATE_LOCKED, STATE_UNLOCKED
 from homeassistant.core import Context, callback
@@ -286,6 +291,128 @@ def test_saving_state_and_removing_entity(hass, hass_recorder):
         assert states[2].state is None
 
 
+def test_saving_state_bulk_insert(hass_recorder):
+    """Test saving states with bulk insert links events and old states."""
+    hass = hass_recorder({"bulk_insert": True})
+    entity_id = "lock.mine"
+    hass.states.set(entity_id, STATE_LOCKED)
+    hass.states.set(entity_id, STATE_UNLOCKED)
+    hass.states.set("lock.other", STATE_LOCKED)
+    hass.states.async_remove(entity_id)
+    hass.bus.fire("test_event", {"test_attr": 5})
+
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States).order_by(States.state_id))
+        assert [(state.entity_id, state.state) for state in states] == [
+            (entity_id, STATE_LOCKED),
+            (entity_id, STATE_UNLOCKED),
+            ("lock.other", STATE_LOCKED),
+            (entity_id, None),
+        ]
+        assert states[0].old_state_id is None
+        assert states[1].old_state_id == states[0].state_id
+        assert states[2].old_state_id is None
+        assert states[3].old_state_id == states[1].state_id
+        last_state_id = states[3].state_id
+
+        for state in states:
+            event = session.query(Events).get(state.event_id)
+            assert event.event_type == "state_changed"
+            assert event.event_data == "{}"
+
+        events = list(session.query(Events).filter_by(event_type="test_event"))
+        assert len(events) == 1
+        assert events[0].to_native().data == {"test_attr": 5}
+
+    hass.states.set(entity_id, STATE_LOCKED)
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        last_state = session.query(States).order_by(States.state_id.desc()).first()
+        assert last_state.state_id == last_state_id + 1
+        assert last_state.old_state_id is None
+
+
+def test_bulk_insert_failure_restores_old_state_ids(hass_recorder):
+    """Test a dropped batch does not leave references to unwritten states."""
+    hass = hass_recorder({"bulk_insert": True})
+    instance = hass.data[DATA_INSTANCE]
+    entity_id = "lock.mine"
+    hass.states.set(entity_id, STATE_LOCKED)
+    wait_recording_done(hass)
+
+    with patch.object(instance, "_write_pending_rows", side_effect=ValueError("fail")):
+        hass.states.set(entity_id, STATE_UNLOCKED)
+        hass.states.set("lock.other", STATE_LOCKED)
+        wait_recording_done(hass)
+
+    hass.states.set(entity_id, STATE_LOCKED)
+    hass.states.set("lock.other", STATE_UNLOCKED)
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States).order_by(States.state_id))
+        assert [(state.entity_id, state.state) for state in states] == [
+            (entity_id, STATE_LOCKED),
+            (entity_id, STATE_LOCKED),
+            ("lock.other", STATE_UNLOCKED),
+        ]
+        assert states[1].old_state_id == states[0].state_id
+        assert states[2].old_state_id is None
+
+
+@pytest.mark.parametrize("bulk_insert", [False, True])
+def test_saving_state_shares_attributes(hass_recorder, bulk_insert):
+    """Test states with the same attributes share one attributes row."""
+    hass = hass_recorder({"bulk_insert": bulk_insert})
+    attributes = {"friendly_name": "Mine", "icon": "mdi:lock"}
+    hass.states.set("lock.mine", STATE_LOCKED, attributes)
+    hass.states.set("lock.mine", STATE_UNLOCKED, attributes)
+    hass.states.set("lock.other", STATE_LOCKED, {"friendly_name": "Other"})
+    wait_recording_done(hass)
+
+    hass.states.set("lock.mine", STATE_LOCKED, attributes)
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert session.query(StateAttributes).count() == 2
+        states = list(session.query(States).order_by(States.state_id))
+        assert len({state.attributes_id for state in states}) == 2
+        assert states[0].attributes_id == states[1].attributes_id
+        assert states[0].attributes_id == states[3].attributes_id
+        assert states[0].attributes is None
+        assert states[0].to_native().attributes == attributes
+        assert states[2].to_native().attributes == {"friendly_name": "Other"}
+
+
+@pytest.mark.parametrize("bulk_insert", [False, True])
+def test_saving_state_logbook_columns(hass_recorder, bulk_insert):
+    """Test the columns the logbook filters on are computed on insert."""
+    hass = hass_recorder({"bulk_insert": bulk_insert})
+    hass.states.set("sensor.temperature", "20", {"unit_of_measurement": "°C"})
+    hass.states.set("sensor.temperature", "21", {"unit_of_measurement": "°C"})
+    hass.states.set("lock.mine", STATE_LOCKED)
+    hass.states.set("lock.mine", STATE_LOCKED, {"friendly_name": "Mine"})
+    hass.states.set("lock.mine", STATE_UNLOCKED)
+    hass.states.async_remove("lock.mine")
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States).order_by(States.state_id))
+        assert [
+            (state.state_changed, state.has_unit_of_measurement) for state in states
+        ] == [
+            (False, True),
+            (True, True),
+            (False, False),
+            (False, False),
+            (True, False),
+            (False, False),
+        ]
+
+
 def test_recorder_setup_failure():
     """Test some exceptions."""
     hass = get_test_home_assistant()
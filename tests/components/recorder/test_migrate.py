@@ -78,3 +78,49 @@ def test_forgiving_add_index():
     engine = create_engine("sqlite://", poolclass=StaticPool)
     models.Base.metadata.create_all(engine)
     migration._create_index(engine, "states", "ix_states_context_id")
+
+
+def test_backfill_logbook_columns():
+    """Test the logbook columns of existing states are computed."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    models.Base.metadata.create_all(engine)
+    engine.execute(
+        models.StateAttributes.__table__.insert(),
+        [
+            {"attributes_id": 1, "shared_attrs": '{"unit_of_measurement": "W"}'},
+            {"attributes_id": 2, "shared_attrs": "{}"},
+        ],
+    )
+    unit_attrs = '{"unit_of_measurement": "W"}'
+    for state_id, state, old_state_id, attributes, attributes_id in (
+        (1, "on", None, "{}", None),
+        (2, "off", 1, None, 2),
+        (3, "off", 2, None, 2),
+        (4, None, 3, None, 2),
+        (5, "5", None, None, 1),
+        (6, "6", 5, unit_attrs, None),
+    ):
+        engine.execute(
+            models.States.__table__.insert().values(
+                state_id=state_id,
+                state=state,
+                old_state_id=old_state_id,
+                attributes=attributes,
+                attributes_id=attributes_id,
+            )
+        )
+
+    with patch.object(migration, "BACKFILL_BATCH_SIZE", 4):
+        migration._backfill_logbook_columns(engine)
+
+    rows = engine.execute(
+        "SELECT state_changed, has_unit_of_measurement FROM states " "ORDER BY state_id"
+    ).fetchall()
+    assert [(bool(changed), bool(unit)) for changed, unit in rows] == [
+        (False, False),
+        (True, False),
+        (False, False),
+        (False, False),
+        (False, True),
+        (True, True),
+    ]
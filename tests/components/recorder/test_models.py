@@ -11,6 +11,7 @@ from homeassistant.components.recorder.models import (
     Base,
     Events,
     RecorderRuns,
+    StateAttributes,
     States,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
@@ -71,7 +72,9 @@ class TestStates(unittest.TestCase):
         # We don't restore context unless we need it by joining the
         # events table on the event_id for state_changed events
         state.context = ha.Context(id=None)
-        assert state == States.from_event(event).to_native()
+        db_state = States.from_event(event)
+        db_state.state_attributes = StateAttributes.from_event(event)
+        assert state == db_state.to_native()
 
     def test_from_event_to_delete_state(self):
         """Test converting deleting state event to db state."""
@@ -5,14 +5,19 @@ import unittest
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
-from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
+from homeassistant.components.recorder.purge import PurgeStats, purge_old_data
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.util import dt as dt_util
 
 from .common import wait_recording_done
 
-from tests.async_mock import patch
+from tests.async_mock import call, patch
 from tests.common import get_test_home_assistant, init_recorder_component
 
 
@@ -22,7 +27,7 @@ class TestRecorderPurge(unittest.TestCase):
     def setUp(self):  # pylint: disable=invalid-name
         """Set up things to be run when tests are started."""
         self.hass = get_test_home_assistant()
-        init_recorder_component(self.hass)
+        init_recorder_component(self.hass, {recorder.CONF_PURGE_BATCH_SIZE: 2})
         self.hass.start()
         self.addCleanup(self.tear_down_cleanup)
 
@@ -147,6 +152,56 @@ class TestRecorderPurge(unittest.TestCase):
             assert finished
             assert states.count() == 2
 
+    def test_purge_old_state_attributes(self):
+        """Test deleting attributes no longer used by any state."""
+        now = datetime.now()
+        eleven_days_ago = now - timedelta(days=11)
+        wait_recording_done(self.hass)
+
+        with recorder.session_scope(hass=self.hass) as session:
+            old_attributes = StateAttributes(shared_attrs='{"old": 1}')
+            shared_attributes = StateAttributes(shared_attrs='{"shared": 1}')
+            session.add_all([old_attributes, shared_attributes])
+            session.flush()
+            old_id = old_attributes.attributes_id
+            shared_id = shared_attributes.attributes_id
+            for timestamp, attributes in (
+                (eleven_days_ago, old_attributes),
+                (eleven_days_ago, shared_attributes),
+                (now, shared_attributes),
+            ):
+                session.add(
+                    States(
+                        entity_id="test.recorder2",
+                        domain="sensor",
+                        state="on",
+                        attributes_id=attributes.attributes_id,
+                        last_changed=timestamp,
+                        last_updated=timestamp,
+                        created=timestamp,
+                    )
+                )
+
+        instance = self.hass.data[DATA_INSTANCE]
+        instance._attributes_ids.update(
+            {
+                '{"old": 1}': old_id,
+                '{"shared": 1}': shared_id,
+            }
+        )
+
+        with session_scope(hass=self.hass) as session:
+            finished = purge_old_data(instance, 4, repack=False)
+            assert not finished
+            assert session.query(States).count() == 1
+            assert [
+                attributes.shared_attrs for attributes in session.query(StateAttributes)
+            ] == ['{"shared": 1}']
+
+        # Only the deleted attributes are evicted from the cache
+        assert '{"old": 1}' not in instance._attributes_ids
+        assert instance._attributes_ids['{"shared": 1}'] == shared_id
+
     def test_purge_old_events(self):
         """Test deleting old events."""
         self._add_test_events()
@@ -169,6 +224,36 @@ class TestRecorderPurge(unittest.TestCase):
             assert finished
             assert events.count() == 2
 
+    def test_purge_in_batches_reports_stats(self):
+        """Test purging in batches and reporting the totals when done."""
+        self._add_test_states()
+        self._add_test_events()
+        instance = self.hass.data[DATA_INSTANCE]
+
+        with patch("homeassistant.components.recorder.purge._LOGGER") as mock_logger:
+            passes = 1
+            while not purge_old_data(instance, 4, repack=False):
+                passes += 1
+
+        # Two passes for each table plus a final pass finding no rows
+        assert passes == 5
+        assert mock_logger.info.mock_calls[-1][1][1:5] == (4, 0, 4, 5)
+        assert instance.purge_stats == PurgeStats()
+
+        # A purge that deletes nothing is not reported
+        with patch("homeassistant.components.recorder.purge._LOGGER") as mock_logger:
+            assert purge_old_data(instance, 4, repack=False)
+        assert not mock_logger.info.mock_calls
+
+        with session_scope(hass=self.hass) as session:
+            assert session.query(States).count() == 2
+            assert (
+                session.query(Events)
+                .filter(Events.event_type.like("EVENT_TEST%"))
+                .count()
+                == 2
+            )
+
     def test_purge_method(self):
         """Test purge method."""
         service_data = {"keep_days": 4}
@@ -233,6 +318,6 @@ class TestRecorderPurge(unittest.TestCase):
                 self.hass.data[DATA_INSTANCE].block_till_done()
                 wait_recording_done(self.hass)
                 assert (
-                    mock_logger.debug.mock_calls[5][1][0]
-                    == "Vacuuming SQL DB to free space"
+                    call("Vacuuming SQL DB to free space")
+                    in mock_logger.debug.mock_calls
                 )
@@ -330,6 +330,48 @@ async def test_removing_config_entry_id(hass, registry, update_events):
     assert update_events[1]["entity_id"] == entry.entity_id
 
 
+def test_entries_for_device_and_config_entry(registry):
+    """Test looking up entries by device and config entry follows changes."""
+    config_1 = MockConfigEntry(domain="light", entry_id="mock-id-1")
+    config_2 = MockConfigEntry(domain="light", entry_id="mock-id-2")
+    entry = registry.async_get_or_create(
+        "light", "hue", "1234", config_entry=config_1, device_id="device-1"
+    )
+    entry2 = registry.async_get_or_create(
+        "light", "hue", "5678", config_entry=config_1, device_id="device-1"
+    )
+    registry.async_get_or_create("light", "hue", "9012")
+
+    assert entity_registry.async_entries_for_device(registry, "device-1") == [
+        entry,
+        entry2,
+    ]
+    assert entity_registry.async_entries_for_config_entry(registry, "mock-id-1") == [
+        entry,
+        entry2,
+    ]
+
+    entry = registry.async_get_or_create(
+        "light", "hue", "1234", config_entry=config_2, device_id="device-2"
+    )
+    entry2 = registry.async_update_entity(
+        entry2.entity_id, new_entity_id="light.renamed"
+    )
+
+    assert entity_registry.async_entries_for_device(registry, "device-1") == [entry2]
+    assert entity_registry.async_entries_for_device(registry, "device-2") == [entry]
+    assert entity_registry.async_entries_for_config_entry(registry, "mock-id-1") == [
+        entry2
+    ]
+    assert entity_registry.async_entries_for_config_entry(registry, "mock-id-2") == [
+        entry
+    ]
+
+    registry.async_remove(entry2.entity_id)
+    assert entity_registry.async_entries_for_device(registry, "device-1") == []
+    assert entity_registry.async_entries_for_config_entry(registry, "mock-id-1") == []
+
+
 async def test_migration(hass):
     """Test migration from old data to new."""
     mock_config = MockConfigEntry(domain="test-platform", entry_id="test-config-id")
@@ -248,3 +248,15 @@ def test_filter_schema_include_exclude():
     }
     filt = INCLUDE_EXCLUDE_FILTER_SCHEMA(conf)
     assert filt.config == conf
+
+
+def test_filter_remembers_results():
+    """Test the filter only tests an entity id once."""
+    testfilter = generate_filter([], [], [], [], ["binary_sensor.*_door"], [])
+
+    assert testfilter("binary_sensor.front_door")
+    assert not testfilter("binary_sensor.front_window")
+    assert testfilter("binary_sensor.front_door")
+    assert not testfilter("binary_sensor.front_window")
+    assert testfilter.cache_info().hits == 2
+    assert testfilter.cache_info().misses == 2
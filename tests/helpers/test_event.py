@@ -13,8 +13,10 @@ import homeassistant.core as ha
 from homeassistant.core import callback
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
+from homeassistant.helpers.entityfilter import generate_filter
 from homeassistant.helpers.event import (
     async_call_later,
+    async_track_filtered_state_change_event,
     async_track_point_in_time,
     async_track_point_in_utc_time,
     async_track_same_state,
@@ -345,6 +347,61 @@ async def test_async_track_state_change_event(hass):
     unsub_throws()
 
 
+async def test_async_track_filtered_state_change_event(hass):
+    """Test async_track_filtered_state_change_event."""
+    light_tracker = []
+    not_kitchen_tracker = []
+
+    @ha.callback
+    def light_callback(event):
+        light_tracker.append(event.data["entity_id"])
+
+    async def not_kitchen_callback(event):
+        not_kitchen_tracker.append(event.data["entity_id"])
+
+    @ha.callback
+    def callback_that_throws(event):
+        raise ValueError
+
+    light_filter = generate_filter(["light"], [], [], [])
+    not_kitchen_filter = generate_filter([], [], [], [], [], ["*.kitchen"])
+
+    unsub_light = async_track_filtered_state_change_event(
+        hass, light_filter, light_callback
+    )
+    unsub_not_kitchen = async_track_filtered_state_change_event(
+        hass, not_kitchen_filter, not_kitchen_callback
+    )
+    unsub_throws = async_track_filtered_state_change_event(
+        hass, light_filter, callback_that_throws
+    )
+
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("switch.kitchen", "on")
+    hass.states.async_set("switch.bowl", "on")
+    hass.states.async_remove("light.bowl")
+    await hass.async_block_till_done()
+
+    assert light_tracker == ["light.bowl", "light.kitchen", "light.bowl"]
+    assert not_kitchen_tracker == ["light.bowl", "switch.bowl", "light.bowl"]
+
+    unsub_light()
+    unsub_throws()
+    hass.states.async_set("light.bowl", "off")
+    await hass.async_block_till_done()
+
+    assert light_tracker == ["light.bowl", "light.kitchen", "light.bowl"]
+    assert len(not_kitchen_tracker) == 4
+
+    unsub_not_kitchen()
+    assert "track_filtered_state_change_listener" not in hass.data
+    hass.states.async_set("light.bowl", "on")
+    await hass.async_block_till_done()
+
+    assert len(not_kitchen_tracker) == 4
+
+
 async def test_async_track_state_added_domain(hass):
     """Test async_track_state_added_domain."""
     single_entity_id_tracker = []
@@ -1037,6 +1094,118 @@ async def test_track_template_result_refresh_cancel(hass):
     assert refresh_runs == ["duck", "dog"]
 
 
+async def test_track_template_result_memoize(hass):
+    """Test forced refreshes reuse the render while the states are unchanged."""
+    hass.states.async_set("switch.test", "on")
+    template_memo = Template("{{ is_state('switch.test', 'on') }}", hass)
+
+    refresh_runs = []
+
+    def refresh_listener(event, template, last_result, result):
+        refresh_runs.append(result)
+
+    info = async_track_template_result(
+        hass, template_memo, refresh_listener, memoize=True
+    )
+    with patch.object(
+        template_memo,
+        "async_render_to_info",
+        wraps=template_memo.async_render_to_info,
+    ) as mock_render:
+        info.async_refresh()
+        info.async_refresh()
+        await hass.async_block_till_done()
+        assert refresh_runs == ["True"]
+        assert mock_render.call_count == 0
+
+        hass.states.async_set("switch.test", "off")
+        await hass.async_block_till_done()
+        assert refresh_runs == ["True", "False"]
+        assert mock_render.call_count == 1
+
+        info.async_refresh()
+        await hass.async_block_till_done()
+        assert mock_render.call_count == 1
+
+
+async def test_track_template_result_rate_limit(hass):
+    """Test changes of entities not referenced by id are rate limited."""
+    hass.states.async_set("sensor.one", "on")
+    template_all = Template("{{ states.sensor.one.state }} {{ states | count }}", hass)
+    template_domain = Template("{{ states.light | count }}", hass)
+    all_runs = []
+    domain_runs = []
+
+    async_track_template_result(
+        hass,
+        template_all,
+        lambda *args: all_runs.append(args[3]),
+        rate_limit=timedelta(minutes=1),
+    )
+    async_track_template_result(
+        hass,
+        template_domain,
+        lambda *args: domain_runs.append(args[3]),
+        rate_limit=timedelta(seconds=10),
+    )
+    await hass.async_block_till_done()
+
+    hass.states.async_set("light.one", "on")
+    hass.states.async_set("light.two", "on")
+    hass.states.async_set("light.three", "on")
+    await hass.async_block_till_done()
+    assert all_runs == []
+    assert domain_runs == []
+
+    # Entities referenced by id render right away
+    hass.states.async_set("sensor.one", "off")
+    await hass.async_block_till_done()
+    assert all_runs == ["off 4"]
+
+    # The deferred changes are handled by a single render
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    assert all_runs == ["off 4"]
+    assert domain_runs == ["3"]
+
+    hass.states.async_set("light.four", "on")
+    await hass.async_block_till_done()
+    assert domain_runs == ["3"]
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=1))
+    await hass.async_block_till_done()
+    assert all_runs == ["off 4", "off 5"]
+    assert domain_runs == ["3", "4"]
+
+
+async def test_track_template_result_no_rate_limit(hass):
+    """Test all states and domain templates render right away by default."""
+    template_all = Template("{{ states | count }}", hass)
+    template_domain = Template("{{ states.light | count }}", hass)
+    all_runs = []
+    domain_runs = []
+
+    async_track_template_result(
+        hass, template_all, lambda *args: all_runs.append(args[3])
+    )
+    async_track_template_result(
+        hass, template_domain, lambda *args: domain_runs.append(args[3])
+    )
+    await hass.async_block_till_done()
+
+    hass.states.async_set("light.one", "on")
+    await hass.async_block_till_done()
+    assert all_runs == ["1"]
+    assert domain_runs == ["1"]
+
+    hass.states.async_set("light.two", "on")
+    await hass.async_block_till_done()
+    hass.states.async_set("sensor.one", "on")
+    await hass.async_block_till_done()
+    assert all_runs == ["1", "2", "3"]
+    assert domain_runs == ["1", "2"]
+
+
 async def test_track_same_state_simple_no_trigger(hass):
     """Test track_same_change with no trigger."""
     callback_runs = []
@@ -1,9 +1,13 @@
 """Test Home Assistant remote methods and classes."""
+import json
+
 import pytest
 
 from homeassistant import core
-from homeassistant.helpers.json import JSONEncoder
-from homeassistant.util import dt as dt_util
+from homeassistant.helpers.json import JSONEncoder, json_dumps
+from homeassistant.util import dt as dt_util, json as util_json
+
+from tests.async_mock import patch
 
 
 def test_json_encoder(hass):
@@ -19,3 +23,36 @@ def test_json_encoder(hass):
 
     now = dt_util.utcnow()
     assert ha_json_enc.default(now) == now.isoformat()
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_dumps(use_orjson):
+    """Test both backends serialize Home Assistant objects the same way."""
+    if use_orjson and util_json.orjson is None:
+        pytest.skip("orjson is not installed")
+    now = dt_util.utcnow()
+    state = core.State("test.test", "hello", {"when": now, "ids": {1}})
+    data = {"state": state, 1: now, "big": 2 ** 70}
+    expected = json.loads(json.dumps(data, cls=JSONEncoder))
+
+    with patch.object(util_json, "orjson", util_json.orjson if use_orjson else None):
+        assert json.loads(json_dumps(data)) == expected
+        assert json.loads(json_dumps(data, pretty=True)) == expected
+
+        with pytest.raises(TypeError):
+            json_dumps({"hello": {1}}, encoder=None)
+        with pytest.raises(TypeError):
+            json_dumps({"hello": object()})
+
+
+def test_json_dumps_custom_encoder():
+    """Test custom encoders are used as is."""
+
+    class MockJSONEncoder(json.JSONEncoder):
+        """Mock JSON encoder."""
+
+        def default(self, o):
+            """Mock JSON encode method."""
+            return "9"
+
+    assert json_dumps(dt_util.utcnow(), encoder=MockJSONEncoder) == '"9"'
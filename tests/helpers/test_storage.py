@@ -2,6 +2,7 @@
 import asyncio
 from datetime import timedelta
 import json
+import os
 
 import pytest
 
@@ -21,6 +22,9 @@ MOCK_KEY = "storage-test"
 MOCK_DATA = {"hello": "world"}
 MOCK_DATA2 = {"goodbye": "cruel world"}
 
+# Stores write through the hass_storage fixture mock during the tests
+ORIG_WRITE_DATA = storage.Store._write_data
+
 
 @pytest.fixture
 def store(hass):
@@ -106,6 +110,61 @@ async def test_saving_on_final_write(hass, hass_storage):
     }
 
 
+async def test_saving_batches_stores(hass, hass_storage):
+    """Test stores saving at the same time are written in one batch."""
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY)
+    store2 = storage.Store(hass, MOCK_VERSION, "storage-test-2")
+    store.async_delay_save(lambda: MOCK_DATA, 1)
+    store2.async_delay_save(lambda: MOCK_DATA2, 1)
+
+    with patch.object(
+        storage._StorageWriter,
+        "_write_batch",
+        side_effect=storage._StorageWriter._write_batch,
+    ) as mock_write_batch:
+        async_fire_time_changed(hass, dt.utcnow() + timedelta(seconds=1))
+        await hass.async_block_till_done()
+
+    assert len(mock_write_batch.mock_calls) == 1
+    assert len(mock_write_batch.mock_calls[0][1][0]) == 2
+    assert hass_storage[store.key]["data"] == MOCK_DATA
+    assert hass_storage[store2.key]["data"] == MOCK_DATA2
+
+
+async def test_saving_skips_unchanged_data(hass, tmp_path):
+    """Test data equal to the written data is not written again."""
+    hass.config.config_dir = str(tmp_path)
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY)
+
+    with patch.object(storage.Store, "_write_data", ORIG_WRITE_DATA), patch(
+        "homeassistant.helpers.storage.json_util.write_json",
+        wraps=storage.json_util.write_json,
+    ) as mock_write_json:
+        await store.async_save(MOCK_DATA)
+        await store.async_save(dict(MOCK_DATA))
+        assert len(mock_write_json.mock_calls) == 1
+
+        await store.async_save(MOCK_DATA2)
+        assert len(mock_write_json.mock_calls) == 2
+
+        await hass.async_add_executor_job(os.remove, store.path)
+        await store.async_save(MOCK_DATA2)
+        assert len(mock_write_json.mock_calls) == 3
+
+    assert storage.json_util.load_json(store.path)["data"] == MOCK_DATA2
+    stats = storage.async_get_write_stats(hass)[MOCK_KEY]
+    assert stats.writes == 3
+    assert stats.skipped == 1
+    assert stats.bytes_written == sum(
+        len(
+            storage.json_util.serialize_json(
+                store.path, {"version": MOCK_VERSION, "key": MOCK_KEY, "data": data}
+            ).encode("utf-8")
+        )
+        for data in (MOCK_DATA, MOCK_DATA2, MOCK_DATA2)
+    )
+
+
 async def test_not_delayed_saving_while_stopping(hass, hass_storage):
     """Test delayed saves don't write after the stop event has fired."""
     store = storage.Store(hass, MOCK_VERSION, MOCK_KEY)
@@ -3,6 +3,7 @@ from datetime import datetime
 import math
 import random
 
+import jinja2
 import pytest
 import pytz
 
@@ -2279,3 +2280,79 @@ async def test_cache_garbage_collection():
     assert not template._NO_HASS_ENV.template_cache.get(
         template_string
     )  # pylint: disable=protected-access
+
+
+async def test_compiled_templates_are_shared(hass):
+    """Test templates with the same source share the compiled template."""
+    stats = template.async_get_cache_stats(hass)
+    tpl = template.Template("{{ 1 + 1 }}", hass)
+    tpl2 = template.Template("{{ 1 + 1 }}", hass)
+
+    assert tpl.async_render() == "2"
+    assert tpl2.async_render() == "2"
+    # pylint: disable=protected-access
+    assert tpl._compiled is tpl2._compiled
+
+    new_stats = template.async_get_cache_stats(hass)
+    assert new_stats["compiled_misses"] == stats["compiled_misses"] + 1
+    assert new_stats["compiled_hits"] == stats["compiled_hits"] + 1
+
+
+async def test_templates_compile_once(hass):
+    """Test validating and rendering templates compiles their source once."""
+    compile_code = jinja2.Environment.compile
+    with patch.object(
+        jinja2.Environment, "compile", autospec=True, side_effect=compile_code
+    ) as compile_mock:
+        tpl = template.Template("{{ 2 + 3 }}", hass)
+        tpl2 = template.Template("{{ 2 + 3 }}", hass)
+        tpl.ensure_valid()
+        tpl2.ensure_valid()
+        assert tpl.async_render() == "5"
+        assert tpl2.async_render() == "5"
+
+    assert compile_mock.call_count == 1
+
+
+async def test_async_render_to_info_memoized(hass):
+    """Test renders are reused while the tracked states do not change."""
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("sensor.temperature", "20")
+    tpl = template.Template(
+        "{{ states.light | count }} {{ states('sensor.temperature') }}", hass
+    )
+
+    info = tpl.async_render_to_info_memoized()
+    assert info.result == "1 20"
+    assert tpl.async_render_to_info_memoized() is info
+    assert template.async_get_cache_stats(hass)["render_hits"] == 1
+
+    hass.states.async_set("sensor.temperature", "21")
+    info = tpl.async_render_to_info_memoized()
+    assert info.result == "1 21"
+    assert tpl.async_render_to_info_memoized() is info
+
+    hass.states.async_set("light.bowl", "off")
+    info = tpl.async_render_to_info_memoized()
+    assert info.result == "2 21"
+    assert tpl.async_render_to_info_memoized({"var": 1}) is not info
+
+    stats = template.async_get_cache_stats(hass)
+    assert stats["render_hits"] == 2
+    assert stats["render_misses"] == 4
+
+
+async def test_async_render_to_info_memoized_volatile(hass):
+    """Test renders using the time, random values or all states are not reused."""
+    for source in (
+        "{{ now() }}",
+        "{{ utcnow() }}",
+        "{{ [1, 2] | random }}",
+        "{{ relative_time(utcnow()) }}",
+        "{{ states | count }}",
+    ):
+        tpl = template.Template(source, hass)
+        info = tpl.async_render_to_info_memoized()
+        assert tpl.async_render_to_info_memoized() is not info
+
+    assert template.async_get_cache_stats(hass)["render_hits"] == 0
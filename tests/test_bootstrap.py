@@ -7,7 +7,7 @@ from unittest.mock import Mock
 
 import pytest
 
-from homeassistant import bootstrap, core, runner
+from homeassistant import bootstrap, core, loader, runner
 import homeassistant.config as config_util
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.util.dt as dt_util
@@ -104,6 +104,24 @@ async def test_setting_up_config(hass):
     assert "group" in hass.config.components
 
 
+async def test_setting_up_config_preloads_integrations(hass, caplog):
+    """Test the integrations and platforms are imported ahead of setup."""
+    with patch.object(
+        loader.Integration, "async_preload", autospec=True
+    ) as mock_preload:
+        await bootstrap._async_set_up_integrations(
+            hass, {"group": {}, "light": [{"platform": "group"}]}
+        )
+
+    preloaded = [
+        (call[1][0].domain, set(*call[1][1:])) for call in mock_preload.mock_calls
+    ]
+    assert ("light", set()) in preloaded
+    assert ("group", set()) in preloaded
+    assert ("group", {"light"}) in preloaded
+    assert "Integration startup times (import, setup): " in caplog.text
+
+
 async def test_setup_after_deps_all_present(hass):
     """Test after_dependencies when all present."""
     order = []
@@ -151,6 +151,75 @@ def test_async_run_job_delegates_non_async():
     assert len(hass.async_add_job.mock_calls) == 1
 
 
+def test_async_add_hass_job_schedule_partial_callback():
+    """Test that we schedule partial callbacks of a HassJob."""
+    hass = MagicMock()
+    job = ha.HassJob(functools.partial(ha.callback(MagicMock())))
+
+    assert job.job_type == ha.HassJobType.Callback
+    assert ha.HomeAssistant.async_add_hass_job(hass, job) is None
+    assert len(hass.loop.call_soon.mock_calls) == 1
+    assert len(hass.loop.create_task.mock_calls) == 0
+    assert len(hass.loop.run_in_executor.mock_calls) == 0
+
+
+def test_async_add_hass_job_schedule_coroutinefunction(loop):
+    """Test that we schedule coroutine functions of a HassJob."""
+    hass = MagicMock(loop=MagicMock(wraps=loop))
+
+    async def job():
+        pass
+
+    hassjob = ha.HassJob(job)
+
+    assert hassjob.job_type == ha.HassJobType.Coroutinefunction
+    ha.HomeAssistant.async_add_hass_job(hass, hassjob)
+    assert len(hass.loop.call_soon.mock_calls) == 0
+    assert len(hass.loop.create_task.mock_calls) == 1
+    assert len(hass.loop.run_in_executor.mock_calls) == 0
+
+
+def test_async_add_hass_job_add_threaded_job_to_pool():
+    """Test that we add executor jobs of a HassJob to the pool."""
+    hass = MagicMock()
+
+    def job():
+        pass
+
+    hassjob = ha.HassJob(job)
+
+    assert hassjob.job_type == ha.HassJobType.Executor
+    ha.HomeAssistant.async_add_hass_job(hass, hassjob)
+    assert len(hass.loop.call_soon.mock_calls) == 0
+    assert len(hass.loop.create_task.mock_calls) == 0
+    assert len(hass.loop.run_in_executor.mock_calls) == 1
+
+
+def test_async_run_hass_job_calls_callback():
+    """Test that callback jobs are run right away."""
+    hass = MagicMock()
+    calls = []
+
+    def job():
+        calls.append(1)
+
+    ha.HomeAssistant.async_run_hass_job(hass, ha.HassJob(ha.callback(job)))
+    assert len(calls) == 1
+    assert len(hass.async_add_hass_job.mock_calls) == 0
+
+
+def test_hass_job_rejects_coroutine():
+    """Test that a coroutine can not be a HassJob."""
+
+    async def job():
+        pass
+
+    coro = job()
+    with pytest.raises(ValueError):
+        ha.HassJob(coro)
+    coro.close()
+
+
 def test_stage_shutdown():
     """Simulate a shutdown, test calling stuff."""
     hass = get_test_home_assistant()
@@ -456,6 +525,58 @@ class TestEventBus(unittest.TestCase):
         assert len(coroutine_calls) == 1
 
 
+async def test_bus_listeners_change_between_fires(hass):
+    """Test listeners added or removed between fires get the right events."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Record the event."""
+        calls.append(("listener", event.event_type))
+
+    @ha.callback
+    def match_all_listener(event):
+        """Record the event."""
+        calls.append(("match_all", event.event_type))
+
+    hass.bus.async_fire("test_event")
+    unsub = hass.bus.async_listen("test_event", listener)
+    hass.bus.async_fire("test_event")
+    unsub_match_all = hass.bus.async_listen(MATCH_ALL, match_all_listener)
+    hass.bus.async_fire("test_event")
+    hass.bus.async_fire("other_event")
+    unsub()
+    hass.bus.async_fire("test_event")
+    unsub_match_all()
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+
+    assert calls == [
+        ("listener", "test_event"),
+        ("match_all", "test_event"),
+        ("listener", "test_event"),
+        ("match_all", "other_event"),
+        ("match_all", "test_event"),
+    ]
+
+
+async def test_bus_close_event_skips_match_all(hass):
+    """Test only close listeners get the close event."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Record the event."""
+        calls.append(event.event_type)
+
+    hass.bus.async_listen(MATCH_ALL, listener)
+    hass.bus.async_listen(EVENT_HOMEASSISTANT_CLOSE, listener)
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+
+    assert calls == [EVENT_HOMEASSISTANT_CLOSE]
+
+
 def test_state_init():
     """Test state.init."""
     with pytest.raises(InvalidEntityFormatError):
@@ -647,6 +768,64 @@ class TestStateMachine(unittest.TestCase):
         assert len(events) == 1
 
 
+async def test_state_attributes_are_read_only_and_shared(hass):
+    """Test attributes are frozen copies shared while they do not change."""
+    attributes = {"brightness": 100}
+    hass.states.async_set("light.bowl", "on", attributes)
+    state = hass.states.get("light.bowl")
+
+    attributes["brightness"] = 200
+    assert state.attributes == {"brightness": 100}
+    with pytest.raises(TypeError):
+        state.attributes["brightness"] = 200
+
+    hass.states.async_set("light.bowl", "off", {"brightness": 100})
+    assert hass.states.get("light.bowl").attributes is state.attributes
+
+    hass.states.async_set("light.bowl", "on", state.attributes)
+    assert hass.states.get("light.bowl").attributes is state.attributes
+
+    hass.states.async_set("light.bowl", "on", {"brightness": 200})
+    assert hass.states.get("light.bowl").attributes == {"brightness": 200}
+
+
+async def test_state_machine_domain_filter(hass):
+    """Test reading the states of a domain."""
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("switch.ac", "off")
+    hass.states.async_set("light.bowl", "on")
+
+    assert hass.states.async_entity_ids("light") == ["light.bowl", "light.kitchen"]
+    assert hass.states.async_entity_ids("LIGHT") == ["light.bowl", "light.kitchen"]
+    assert hass.states.async_entity_ids(["switch", "light", "switch"]) == [
+        "switch.ac",
+        "light.bowl",
+        "light.kitchen",
+    ]
+    assert hass.states.async_entity_ids("cover") == []
+    assert hass.states.async_entity_ids_count() == 3
+    assert hass.states.async_entity_ids_count("light") == 2
+    assert hass.states.async_entity_ids_count(["light", "switch", "cover"]) == 3
+
+    hass.states.async_set("light.bowl", "off")
+    hass.states.async_set("light.attic", "on")
+    assert hass.states.async_all("light") == [
+        hass.states.get("light.attic"),
+        hass.states.get("light.bowl"),
+        hass.states.get("light.kitchen"),
+    ]
+    assert hass.states.async_all("light")[1].state == "off"
+
+    hass.states.async_remove("switch.ac")
+    hass.states.async_remove("light.bowl")
+    assert hass.states.async_all("switch") == []
+    assert hass.states.async_entity_ids_count("switch") == 0
+    assert hass.states.async_entity_ids("light") == ["light.attic", "light.kitchen"]
+
+    hass.states.async_set("switch.ac", "on")
+    assert hass.states.async_entity_ids("switch") == ["switch.ac"]
+
+
 def test_service_call_repr():
     """Test ServiceCall repr."""
     call = ha.ServiceCall("homeassistant", "start")
@@ -1,12 +1,21 @@
 """Test to verify that we can load components."""
+from datetime import timedelta
+
 import pytest
 
 from homeassistant.components import http, hue
 from homeassistant.components.hue import light as hue_light
+from homeassistant.const import __version__
 import homeassistant.loader as loader
+import homeassistant.util.dt as dt_util
 
 from tests.async_mock import ANY, patch
-from tests.common import MockModule, async_mock_service, mock_integration
+from tests.common import (
+    MockModule,
+    async_fire_time_changed,
+    async_mock_service,
+    mock_integration,
+)
 
 
 async def test_component_dependencies(hass):
@@ -219,6 +228,23 @@ def test_integration_properties(hass):
     assert integration.ssdp is None
 
 
+async def test_preload(hass):
+    """Test importing an integration in the executor ahead of use."""
+    integration = await loader.async_get_integration(hass, "hue")
+    integration.async_preload(["light", "non_existing"])
+    await integration.async_wait_preload()
+
+    components = hass.data[loader.DATA_COMPONENTS]
+    assert components["hue"] is hue
+    assert components["hue.light"] is hue_light
+    assert "hue.non_existing" not in components
+    assert set(hass.data[loader.DATA_IMPORT_TIMES]) == {"hue", "hue.light"}
+    assert integration.get_platform("light") is hue_light
+
+    with pytest.raises(ImportError):
+        integration.get_platform("non_existing")
+
+
 async def test_integrations_only_once(hass):
     """Test that we load integrations only once."""
     int_1 = hass.async_create_task(loader.async_get_integration(hass, "hue"))
@@ -227,6 +253,50 @@ async def test_integrations_only_once(hass):
     assert await int_1 is await int_2
 
 
+async def test_manifest_cache(hass, hass_storage):
+    """Test manifests are stored and reused while the file is unchanged."""
+    integration = await loader.async_get_integration(hass, "hue")
+    await hass.async_block_till_done()
+    manifest_path = str(integration.file_path / "manifest.json")
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=loader.MANIFEST_CACHE_SAVE_DELAY)
+    )
+    await hass.async_block_till_done()
+    stored = hass_storage[loader.MANIFEST_CACHE_STORAGE_KEY]["data"]
+    assert stored["ha_version"] == __version__
+    assert stored["manifests"][manifest_path]["manifest"]["domain"] == "hue"
+
+    # A fresh start reads the manifest from the stored cache
+    hass.data.pop(loader.DATA_INTEGRATIONS)
+    hass.data.pop(loader.DATA_MANIFEST_CACHE)
+    stored["manifests"][manifest_path]["manifest"]["name"] = "Cached Hue"
+    integration = await loader.async_get_integration(hass, "hue")
+    assert integration.name == "Cached Hue"
+
+    # A cache of another version is discarded
+    hass.data.pop(loader.DATA_INTEGRATIONS)
+    hass.data.pop(loader.DATA_MANIFEST_CACHE)
+    stored["ha_version"] = "0.1"
+    integration = await loader.async_get_integration(hass, "hue")
+    assert integration.name == "Philips Hue"
+
+
+async def test_manifest_cache_detects_changes(hass, tmp_path):
+    """Test a manifest is parsed again when the file changes."""
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text('{"domain": "test", "name": "Test"}')
+    cache = loader.ManifestCache(None, {})
+
+    assert cache.load(manifest_path)["name"] == "Test"
+    with patch("homeassistant.loader.json.loads") as mock_loads:
+        assert cache.load(manifest_path)["name"] == "Test"
+    assert not mock_loads.called
+
+    manifest_path.write_text('{"domain": "test", "name": "Changed test"}')
+    assert cache.load(manifest_path)["name"] == "Changed test"
+
+
 async def test_get_custom_components_internal(hass):
     """Test that we can a list of custom components."""
     # pylint: disable=protected-access
@@ -80,6 +80,42 @@ async def test_install_existing_package(hass):
     assert len(mock_inst.mock_calls) == 0
 
 
+async def test_installed_versions_looked_up_once(hass):
+    """Test the installed distributions are looked up once until installing."""
+    with patch(
+        "homeassistant.util.package.get_installed_versions",
+        return_value={"hello": "1.0.0"},
+    ) as mock_versions, patch(
+        "homeassistant.util.package.install_package", return_value=True
+    ) as mock_inst:
+        await async_process_requirements(hass, "test_component", ["hello==1.0.0"])
+        await async_process_requirements(hass, "test_other", ["Hello>=1.0"])
+        assert len(mock_versions.mock_calls) == 1
+        assert len(mock_inst.mock_calls) == 0
+
+        await async_process_requirements(hass, "test_upgrade", ["hello==2.0.0"])
+        assert len(mock_inst.mock_calls) == 1
+        assert len(mock_versions.mock_calls) == 2
+
+        await async_process_requirements(hass, "test_component", ["hello==1.0.0"])
+        assert len(mock_versions.mock_calls) == 2
+
+
+async def test_installed_versions_updated_after_install(hass):
+    """Test requirements installed along with an earlier one are skipped."""
+    with patch(
+        "homeassistant.util.package.get_installed_versions",
+        side_effect=[{}, {"hello": "1.0.0", "world": "1.0.0"}],
+    ), patch(
+        "homeassistant.util.package.install_package", return_value=True
+    ) as mock_inst:
+        await async_process_requirements(
+            hass, "test_component", ["hello==1.0.0", "world==1.0.0"]
+        )
+
+    assert len(mock_inst.mock_calls) == 1
+
+
 async def test_install_missing_package(hass):
     """Test an install attempt on an existing package."""
     with patch(
@@ -12,14 +12,16 @@ import pytest
 
 from homeassistant.core import Event, State
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import json as util_json
 from homeassistant.util.json import (
     SerializationError,
     find_paths_unserializable_data,
+    json_dumps,
     load_json,
     save_json,
 )
 
-from tests.async_mock import Mock
+from tests.async_mock import Mock, patch
 
 # Test data that can be saved as JSON
 TEST_JSON_A = {"a": 1, "B": "two"}
@@ -113,6 +115,28 @@ def test_custom_encoder():
     assert data == "9"
 
 
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_dumps(use_orjson):
+    """Test both backends write the same format."""
+    if use_orjson and util_json.orjson is None:
+        pytest.skip("orjson is not installed")
+    data = {"a": [1, 1.5, None, {}, []], "b": "twö", 1: True}
+
+    with patch.object(util_json, "orjson", util_json.orjson if use_orjson else None):
+        assert json_dumps(data) == '{"a":[1,1.5,null,{},[]],"b":"twö","1":true}'
+        assert json_dumps(data, pretty=True) == dumps(
+            {"a": [1, 1.5, None, {}, []], "b": "twö", "1": True},
+            indent=2,
+            ensure_ascii=False,
+        )
+        assert json_dumps({"a": {1}}, default=list) == '{"a":[1]}'
+
+        with pytest.raises(ValueError):
+            json_dumps({"a": float("NaN")}, allow_nan=False)
+        with pytest.raises(ValueError):
+            json_dumps([float("inf")], pretty=True, allow_nan=False)
+
+
 def test_find_unserializable_data():
     """Find unserializeable data."""
     assert find_paths_unserializable_data(1) == {}
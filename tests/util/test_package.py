@@ -244,6 +244,22 @@ def test_check_package_global():
     assert package.is_installed(installed_package)
 
 
+def test_check_package_installed_versions():
+    """Test checking packages against the installed versions."""
+    installed_versions = package.get_installed_versions()
+    installed_package = list(pkg_resources.working_set)[0]
+    name = installed_package.project_name
+
+    assert installed_package.version in installed_versions.values()
+    assert package.is_installed(name, installed_versions)
+    assert package.is_installed(
+        f"{name.upper()}=={installed_package.version}", installed_versions
+    )
+    assert not package.is_installed(f"{name}<0.0.1", installed_versions)
+    assert not package.is_installed("not-a-package", installed_versions)
+    assert not package.is_installed(TEST_ZIP_REQ, installed_versions)
+
+
 def test_check_package_zip():
     """Test for an installed zip package."""
     assert not package.is_installed(TEST_ZIP_REQ)
@@ -0,0 +1,77 @@
+"""Test read only dictionary."""
+import copy
+import json
+import pickle
+import sys
+
+import pytest
+
+from homeassistant.util.read_only_dict import EMPTY_READ_ONLY_DICT, ReadOnlyDict, freeze
+
+
+def test_read_only_dict():
+    """Test read only dictionary."""
+    data = ReadOnlyDict({"hello": "world"})
+
+    with pytest.raises(TypeError):
+        data["hello"] = "universe"
+
+    with pytest.raises(TypeError):
+        data["other_field"] = "universe"
+
+    with pytest.raises(TypeError):
+        data.pop("hello")
+
+    with pytest.raises(TypeError):
+        data.popitem()
+
+    with pytest.raises(TypeError):
+        data.clear()
+
+    with pytest.raises(TypeError):
+        data.update({"yo": "yo"})
+
+    with pytest.raises(TypeError):
+        data.setdefault("yo", "yo")
+
+    with pytest.raises(TypeError):
+        del data["hello"]
+
+    with pytest.raises(TypeError):
+        data |= {"yo": "yo"}
+
+    assert isinstance(data, dict)
+    assert dict(data) == {"hello": "world"}
+    assert json.dumps(data) == json.dumps({"hello": "world"})
+
+
+def test_read_only_dict_copy():
+    """Test copies of a read only dictionary."""
+    data = ReadOnlyDict({"hello": ["world"]})
+
+    assert copy.copy(data) is data
+
+    deep = copy.deepcopy(data)
+    assert isinstance(deep, ReadOnlyDict)
+    assert deep == data
+    assert deep["hello"] is not data["hello"]
+
+    unpickled = pickle.loads(pickle.dumps(data))
+    assert isinstance(unpickled, ReadOnlyDict)
+    assert unpickled == data
+
+    plain = data.copy()
+    plain["hello"] = "universe"
+    assert data == {"hello": ["world"]}
+
+
+def test_freeze():
+    """Test freezing a mapping."""
+    data = freeze({"".join(["friendly", "_name"]): "Kitchen"})
+
+    assert isinstance(data, ReadOnlyDict)
+    assert data == {"friendly_name": "Kitchen"}
+    assert next(iter(data)) is sys.intern("friendly_name")
+    assert freeze(data) is data
+    assert freeze(None) is EMPTY_READ_ONLY_DICT
+    assert freeze({}) is EMPTY_READ_ONLY_DICT